@@ -11,7 +11,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.database import Base
 from app.config import settings
-from app.models import User, Transaction, Budget, Payment, Card, Wallet, Vendor
+from app.models import (
+    User, Transaction, Budget, Payment, Card, Wallet, Vendor, IdempotencyKey,
+    TransactionArchive, PaymentArchive, ArchiveState, RefreshToken,
+    PasswordResetToken, VendorSalesCounter, VendorHeatmap, BudgetAlert,
+    TransactionWatermark, BudgetWatermark,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,31 @@
+"""backfill_missing_wallets
+
+Revision ID: 0a8e5d3c7b42
+Revises: f7a3c2d9b1e6
+Create Date: 2026-10-19 15:02:17.554310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a8e5d3c7b42'
+down_revision = 'f7a3c2d9b1e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Wallets are now created at registration; give existing users one so
+    # balance reads never have to write
+    op.execute("""
+        INSERT INTO wallets (user_id, balance, created_at, updated_at)
+        SELECT id, 0.0, now(), now() FROM users
+        ON CONFLICT (user_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    # Empty wallets are indistinguishable from lazily created ones; leave them
+    pass
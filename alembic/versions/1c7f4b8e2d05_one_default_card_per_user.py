@@ -0,0 +1,39 @@
+"""one_default_card_per_user
+
+Revision ID: 1c7f4b8e2d05
+Revises: 0a8e5d3c7b42
+Create Date: 2026-10-19 15:41:52.903176
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c7f4b8e2d05'
+down_revision = '0a8e5d3c7b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the most recently updated default card per user
+    op.execute("""
+        UPDATE cards SET is_default = false
+        WHERE is_default AND id NOT IN (
+            SELECT DISTINCT ON (user_id) id FROM cards
+            WHERE is_default
+            ORDER BY user_id, updated_at DESC, id DESC
+        )
+    """)
+    # Partial (WHERE is_default) uniqueness on user_id, deferrable to the end
+    # of each statement so the default can be switched with one UPDATE
+    op.execute("""
+        ALTER TABLE cards ADD CONSTRAINT uq_cards_one_default_per_user
+        EXCLUDE USING btree (user_id WITH =) WHERE (is_default)
+        DEFERRABLE INITIALLY IMMEDIATE
+    """)
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_cards_one_default_per_user', 'cards')
@@ -0,0 +1,47 @@
+"""add_vendor_sales_counters
+
+Revision ID: 5e9b2a7c4f18
+Revises: 1c7f4b8e2d05
+Create Date: 2026-10-19 16:20:33.471902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b2a7c4f18'
+down_revision = '1c7f4b8e2d05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-vendor hourly/daily/weekly payment totals, maintained by each payment
+    op.create_table(
+        'vendor_sales_counters',
+        sa.Column('vendor_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=8), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('payment_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('vendor_id', 'granularity', 'bucket_start'),
+    )
+
+    # Backfill from existing vendor payments (UTC buckets, ISO weeks start Monday)
+    for granularity in ('hour', 'day', 'week'):
+        op.execute(f"""
+            INSERT INTO vendor_sales_counters
+                (vendor_id, granularity, bucket_start, revenue, payment_count)
+            SELECT vendor_id, '{granularity}',
+                   date_trunc('{granularity}', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                   sum(amount), count(*)
+            FROM payments
+            WHERE vendor_id IS NOT NULL
+            GROUP BY 1, 2, 3
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table('vendor_sales_counters')
@@ -0,0 +1,34 @@
+"""add_vendor_heatmaps
+
+Revision ID: 7d2e9f4a6b31
+Revises: 5e9b2a7c4f18
+Create Date: 2026-10-19 16:58:06.118430
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e9f4a6b31'
+down_revision = '5e9b2a7c4f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Day-of-week x hour payment counts per vendor, filled by build_heatmaps.py
+    op.create_table(
+        'vendor_heatmaps',
+        sa.Column('vendor_id', sa.Integer(), nullable=False),
+        sa.Column('counts', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column('through_payment_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('vendor_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('vendor_heatmaps')
@@ -0,0 +1,91 @@
+"""partition_transactions_by_month
+
+Revision ID: 8c4d1e6f2a9b
+Revises: 3b7e2f9a1c4d
+Create Date: 2026-10-19 10:02:17.284630
+
+Rebuilds `transactions` as a table range-partitioned by month on `date`:
+- Primary key becomes (id, date), since the partition key must be part of it
+- One partition per UTC month (transactions_YYYY_MM) from the oldest row up to
+  three months ahead, plus transactions_default for anything outside them
+- (user_id, date) index replaces the separate user_id and date indexes
+
+Old months can later be detached with
+`ALTER TABLE transactions DETACH PARTITION transactions_YYYY_MM` instead of a
+bulk DELETE. New months are created by app.partitions at startup and on insert.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4d1e6f2a9b'
+down_revision = '3b7e2f9a1c4d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_legacy")
+
+    # Same columns, defaults (including the id sequence) and NOT NULLs
+    op.execute("""
+        CREATE TABLE transactions (LIKE transactions_legacy INCLUDING DEFAULTS)
+        PARTITION BY RANGE (date)
+    """)
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    # Monthly partitions covering existing rows and the next three months
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start timestamp;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(
+                        (SELECT min(date) FROM transactions_legacy), now()
+                    ) AT TIME ZONE 'UTC'),
+                    date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+                    'transactions_' || to_char(month_start, 'YYYY_MM'),
+                    month_start AT TIME ZONE 'UTC',
+                    (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_legacy")
+    op.execute("DROP TABLE transactions_legacy")
+
+    op.create_primary_key('transactions_pkey', 'transactions', ['id', 'date'])
+    op.create_foreign_key(
+        'transactions_user_id_fkey', 'transactions', 'users', ['user_id'], ['id']
+    )
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+    op.create_index('ix_transactions_user_id_date', 'transactions', ['user_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("""
+        CREATE TABLE transactions (LIKE transactions_partitioned INCLUDING DEFAULTS)
+    """)
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_partitioned")
+    # Dropping the parent drops every partition with it
+    op.execute("DROP TABLE transactions_partitioned")
+
+    op.create_primary_key('transactions_pkey', 'transactions', ['id'])
+    op.create_foreign_key(
+        'transactions_user_id_fkey', 'transactions', 'users', ['user_id'], ['id']
+    )
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+    op.create_index(op.f('ix_transactions_user_id'), 'transactions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_transactions_date'), 'transactions', ['date'], unique=False)
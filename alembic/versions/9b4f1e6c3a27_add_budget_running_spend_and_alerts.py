@@ -0,0 +1,72 @@
+"""add_budget_running_spend_and_alerts
+
+Revision ID: 9b4f1e6c3a27
+Revises: 7d2e9f4a6b31
+Create Date: 2026-10-19 18:12:40.527311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4f1e6c3a27'
+down_revision = '7d2e9f4a6b31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('budgets', sa.Column('spent_amount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('budgets', sa.Column('alerted_percent', sa.Integer(), server_default='0', nullable=False))
+
+    # Outbox of threshold events, delivered by the in-process consumer
+    op.create_table(
+        'budget_alerts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('budget_id', sa.Integer(), nullable=False),
+        sa.Column('threshold_percent', sa.Integer(), nullable=False),
+        sa.Column('spent_amount', sa.Float(), nullable=False),
+        sa.Column('limit_amount', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_budget_alerts_user_id_id', 'budget_alerts', ['user_id', 'id'])
+    op.create_index(
+        'ix_budget_alerts_undelivered', 'budget_alerts', ['id'],
+        postgresql_where=sa.text('delivered_at IS NULL'),
+    )
+
+    # Backfill running spend the way budget tracking computed it: transactions
+    # in the budget's category (all categories if it matches none) and dates
+    op.execute("""
+        UPDATE budgets b SET spent_amount = coalesce((
+            SELECT sum(t.amount) FROM transactions t
+            WHERE t.user_id = b.user_id
+              AND t.date >= b.start_date
+              AND t.date < b.end_date + 1
+              AND (lower(t.category::text) = lower(b.category)
+                   OR lower(b.category) NOT IN (SELECT lower(unnest(enum_range(NULL::transactioncategory))::text)))
+        ), 0)
+    """)
+    # Thresholds already passed count as alerted, so existing budgets don't
+    # produce a burst of alerts
+    op.execute(sa.text("""
+        UPDATE budgets b SET alerted_percent = coalesce((
+            SELECT max(threshold) FROM unnest(CAST(:thresholds AS integer[])) AS threshold
+            WHERE b.spent_amount * 100 >= b.limit_amount * threshold
+        ), 0)
+    """).bindparams(thresholds=settings.budget_alert_thresholds))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_budget_alerts_undelivered', table_name='budget_alerts')
+    op.drop_index('ix_budget_alerts_user_id_id', table_name='budget_alerts')
+    op.drop_table('budget_alerts')
+    op.drop_column('budgets', 'alerted_percent')
+    op.drop_column('budgets', 'spent_amount')
@@ -0,0 +1,27 @@
+"""commit_idempotency_keys_with_response
+
+Revision ID: a6c1e8f3b952
+Revises: f2b7d4a9c615
+Create Date: 2026-10-20 09:14:52.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c1e8f3b952'
+down_revision = 'f2b7d4a9c615'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keys now commit together with their response; reservations left
+    # pending by the old two-step flow can never complete, so release them
+    op.execute("DELETE FROM idempotency_keys WHERE response IS NULL")
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
@@ -0,0 +1,25 @@
+"""index_refresh_tokens_expires_at
+
+Revision ID: b8e3f1a7d024
+Revises: a6c1e8f3b952
+Create Date: 2026-10-20 09:41:07.663290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3f1a7d024'
+down_revision = 'a6c1e8f3b952'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets the sweeper find expired refresh tokens without scanning the table
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
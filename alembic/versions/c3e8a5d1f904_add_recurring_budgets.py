@@ -0,0 +1,34 @@
+"""add_recurring_budgets
+
+Revision ID: c3e8a5d1f904
+Revises: 9b4f1e6c3a27
+Create Date: 2026-10-19 19:26:03.814522
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a5d1f904'
+down_revision = '9b4f1e6c3a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('budgets', sa.Column('is_recurring', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('budgets', sa.Column('previous_budget_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'budgets_previous_budget_id_fkey', 'budgets', 'budgets',
+        ['previous_budget_id'], ['id'], ondelete='SET NULL',
+    )
+    # Each budget rolls over at most once; also the rollover job's ON CONFLICT target
+    op.create_unique_constraint('budgets_previous_budget_id_key', 'budgets', ['previous_budget_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('budgets_previous_budget_id_key', 'budgets', type_='unique')
+    op.drop_constraint('budgets_previous_budget_id_fkey', 'budgets', type_='foreignkey')
+    op.drop_column('budgets', 'previous_budget_id')
+    op.drop_column('budgets', 'is_recurring')
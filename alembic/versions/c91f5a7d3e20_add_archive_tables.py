@@ -0,0 +1,68 @@
+"""add_archive_tables
+
+Revision ID: c91f5a7d3e20
+Revises: 8c4d1e6f2a9b
+Create Date: 2026-10-19 11:26:05.917342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c91f5a7d3e20'
+down_revision = '8c4d1e6f2a9b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Archive tables reuse the existing enum types and carry no foreign keys,
+    # so cold rows don't hold locks on or depend on live tables
+    op.create_table(
+        'transactions_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('category', postgresql.ENUM(name='transactioncategory', create_type=False), nullable=False),
+        sa.Column('merchant', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('payment_method', postgresql.ENUM(name='paymentmethod', create_type=False), nullable=False),
+        sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_transactions_archive_user_id_date', 'transactions_archive', ['user_id', 'date'], unique=False)
+
+    op.create_table(
+        'payments_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('vendor_id', sa.Integer(), nullable=True),
+        sa.Column('payment_type', postgresql.ENUM(name='paymenttype', create_type=False), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('status', postgresql.ENUM(name='paymentstatus', create_type=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_payments_archive_user_id_created_at', 'payments_archive', ['user_id', 'created_at'], unique=False)
+
+    op.create_table(
+        'archive_state',
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('archived_before', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('archive_state')
+    op.drop_index('ix_payments_archive_user_id_created_at', table_name='payments_archive')
+    op.drop_table('payments_archive')
+    op.drop_index('ix_transactions_archive_user_id_date', table_name='transactions_archive')
+    op.drop_table('transactions_archive')
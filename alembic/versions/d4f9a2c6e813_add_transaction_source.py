@@ -0,0 +1,47 @@
+"""add_transaction_source
+
+Revision ID: d4f9a2c6e813
+Revises: b8e3f1a7d024
+Create Date: 2026-10-19 23:41:08.217530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f9a2c6e813'
+down_revision = 'b8e3f1a7d024'
+branch_labels = None
+depends_on = None
+
+transaction_source = postgresql.ENUM(
+    'USER', 'PAYMENT', 'WALLET_LOAD', 'DISBURSEMENT', name='transactionsource'
+)
+
+
+def upgrade() -> None:
+    transaction_source.create(op.get_bind())
+    for table in ('transactions', 'transactions_archive'):
+        op.add_column(
+            table,
+            sa.Column('source', transaction_source, server_default='USER', nullable=False),
+        )
+        # Existing ledger rows are classified the way statements used to
+        # recognize them
+        op.execute(f"""
+            UPDATE {table} SET source = CASE
+                WHEN payment_method = 'CARD' THEN 'WALLET_LOAD'
+                WHEN merchant = 'Flex Dollars Disbursement' THEN 'DISBURSEMENT'
+                ELSE 'PAYMENT'
+            END::transactionsource
+            WHERE (payment_method = 'CARD' AND merchant = 'Flex Dollars Wallet')
+               OR payment_method = 'CAMPUS_CARD'
+        """)
+
+
+def downgrade() -> None:
+    op.drop_column('transactions_archive', 'source')
+    op.drop_column('transactions', 'source')
+    transaction_source.drop(op.get_bind())
@@ -0,0 +1,25 @@
+"""add_token_version_to_users
+
+Revision ID: d5a0b8e3f7c1
+Revises: c91f5a7d3e20
+Create Date: 2026-10-19 12:40:51.338016
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a0b8e3f7c1'
+down_revision = 'c91f5a7d3e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bumped to revoke all previously issued access tokens for a user
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
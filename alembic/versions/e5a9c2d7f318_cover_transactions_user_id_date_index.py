@@ -0,0 +1,31 @@
+"""cover_transactions_user_id_date_index
+
+Revision ID: e5a9c2d7f318
+Revises: c3e8a5d1f904
+Create Date: 2026-10-19 21:02:41.337106
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c2d7f318'
+down_revision = 'c3e8a5d1f904'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Carry amount and category in the index so per-user aggregates over
+    # long ranges read only the index
+    op.drop_index('ix_transactions_user_id_date', table_name='transactions')
+    op.create_index(
+        'ix_transactions_user_id_date', 'transactions', ['user_id', 'date'],
+        unique=False, postgresql_include=['amount', 'category'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_date', table_name='transactions')
+    op.create_index('ix_transactions_user_id_date', 'transactions', ['user_id', 'date'], unique=False)
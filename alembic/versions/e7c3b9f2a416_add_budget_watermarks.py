@@ -0,0 +1,32 @@
+"""add_budget_watermarks
+
+Revision ID: e7c3b9f2a416
+Revises: d4f9a2c6e813
+Create Date: 2026-10-20 00:12:44.580193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c3b9f2a416'
+down_revision = 'd4f9a2c6e813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-user budget change counter that, with the transaction watermark,
+    # validates cached forecasts; users start without a row (version 0)
+    op.create_table(
+        'budget_watermarks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('budget_watermarks')
@@ -0,0 +1,32 @@
+"""add_transaction_watermarks
+
+Revision ID: f2b7d4a9c615
+Revises: e5a9c2d7f318
+Create Date: 2026-10-19 21:48:15.902634
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b7d4a9c615'
+down_revision = 'e5a9c2d7f318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-user transaction change counter that validates cached analytics;
+    # users start without a row (version 0)
+    op.create_table(
+        'transaction_watermarks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transaction_watermarks')
@@ -0,0 +1,46 @@
+"""move_reset_tokens_to_own_table
+
+Revision ID: f7a3c2d9b1e6
+Revises: e2b6c4a9d8f3
+Create Date: 2026-10-19 14:30:41.208117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a3c2d9b1e6'
+down_revision = 'e2b6c4a9d8f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Password reset tokens, stored as SHA-256 hashes outside the users table.
+    # Outstanding raw tokens on users are dropped; affected users request a new one.
+    op.create_table(
+        'password_reset_tokens',
+        sa.Column('token_hash', sa.CHAR(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_hash'),
+    )
+    op.create_index(op.f('ix_password_reset_tokens_user_id'), 'password_reset_tokens', ['user_id'], unique=False)
+    op.create_index(op.f('ix_password_reset_tokens_expires_at'), 'password_reset_tokens', ['expires_at'], unique=False)
+
+    op.execute("DROP INDEX IF EXISTS ix_users_reset_token")
+    op.drop_column('users', 'reset_token_expires')
+    op.drop_column('users', 'reset_token')
+
+
+def downgrade() -> None:
+    op.add_column('users', sa.Column('reset_token', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('reset_token_expires', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_users_reset_token'), 'users', ['reset_token'], unique=False)
+
+    op.drop_index(op.f('ix_password_reset_tokens_expires_at'), table_name='password_reset_tokens')
+    op.drop_index(op.f('ix_password_reset_tokens_user_id'), table_name='password_reset_tokens')
+    op.drop_table('password_reset_tokens')
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.auth import Token, ForgotPasswordRequest, ResetPasswordRequest
+from app.schemas.auth import Token, ForgotPasswordRequest, ResetPasswordRequest, RefreshRequest
 from app.services.auth_service import AuthService
-from app.exceptions import ValidationError, UnauthorizedError
+from app.rate_limit import get_client_ip
+from app.exceptions import ValidationError, UnauthorizedError, TooManyRequestsError, ServiceUnavailableError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -33,6 +34,7 @@ def register(
         return {
             "user": UserResponse.model_validate(result["user"]).model_dump(),
             "access_token": token,
+            "refresh_token": result["refresh_token"],
             "token_type": "bearer"
         }
     except ValidationError as e:
@@ -52,6 +54,7 @@ def register(
 
 @router.post("/login", response_model=Token)
 def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -61,11 +64,45 @@ def login(
     - **username**: User's email address (OAuth2 uses 'username' field)
     - **password**: User's password
     
-    Returns a JWT access token for authenticated requests.
+    Returns a JWT access token for authenticated requests and a refresh token
+    for renewing it via /auth/refresh.
+    
+    Attempts are rate limited per client IP and per email and IP (429), and shed
+    with a 503 while the server is saturated with password checks.
+    """
+    try:
+        auth_service = AuthService(db)
+        return auth_service.login(form_data.username, form_data.password, get_client_ip(request))
+    except UnauthorizedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=e.message,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except (TooManyRequestsError, ServiceUnavailableError) as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(
+    request: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a new access token using a refresh token.
+    
+    - **refresh_token**: Refresh token from login, registration or a previous refresh
+    
+    Refresh tokens are single-use: the response contains a new refresh token
+    that replaces the one sent. Reusing an old refresh token signs out all sessions.
     """
     try:
         auth_service = AuthService(db)
-        return auth_service.login(form_data.username, form_data.password)
+        return auth_service.refresh(request.refresh_token)
     except UnauthorizedError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -76,7 +113,7 @@ def login(
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """
     Get current authenticated user information.
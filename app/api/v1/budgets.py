@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
 from app.models.user import User
-from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetTracking
+from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetTracking, BudgetForecast, BudgetAlertResponse
 from app.services.budget_service import BudgetService
 from app.exceptions import NotFoundError
 
@@ -15,7 +15,7 @@ def get_budgets(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all budgets for the current user.
@@ -49,7 +49,7 @@ def create_budget(
 @router.get("/tracking", response_model=list[BudgetTracking])
 def get_budgets_tracking(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all active budgets with tracking information.
@@ -64,11 +64,28 @@ def get_budgets_tracking(
     return service.get_all_budgets_tracking(current_user.id)
 
 
+@router.get("/alerts", response_model=list[BudgetAlertResponse])
+def get_budget_alerts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get budget alerts for the current user, newest first.
+    
+    An alert is written when a budget's spending first reaches one of the
+    configured percentages of its limit (80%, 100%, ...).
+    """
+    service = BudgetService(db)
+    return service.get_alerts(current_user.id, skip, limit)
+
+
 @router.get("/{budget_id}", response_model=dict)
 def get_budget(
     budget_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific budget by ID.
@@ -87,7 +104,7 @@ def get_budget(
 def get_budget_tracking(
     budget_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get budget with tracking information.
@@ -108,6 +125,33 @@ def get_budget_tracking(
         )
 
 
+@router.get("/{budget_id}/forecast", response_model=BudgetForecast)
+def get_budget_forecast(
+    budget_id: int,
+    method: str = Query("linear", pattern="^(linear|ewma)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Project a budget's spending at the end of its period.
+    
+    - **method**: linear (average daily spending so far) or ewma
+      (exponentially weighted, so recent days count more)
+    
+    Returns projected spending, projected status (under/over/at_limit) and
+    the day spending passed or is projected to pass the limit. Forecasts are
+    cached until your next transaction or budget change.
+    """
+    service = BudgetService(db)
+    try:
+        return service.get_budget_forecast(budget_id, current_user.id, method)
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message
+        )
+
+
 @router.put("/{budget_id}", response_model=dict)
 def update_budget(
     budget_id: int,
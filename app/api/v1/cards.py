@@ -5,7 +5,7 @@ from app.dependencies import get_current_active_user
 from app.models.user import User
 from app.schemas.card import CardCreate, CardUpdate, CardResponse
 from app.services.card_service import CardService
-from app.exceptions import NotFoundError, ValidationError
+from app.exceptions import NotFoundError, ValidationError, ConflictError
 
 router = APIRouter(prefix="/cards", tags=["Cards"])
 
@@ -51,6 +51,11 @@ def create_card(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.message
         )
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message
+        )
 
 
 @router.get("/{card_id}", response_model=dict)
@@ -101,6 +106,11 @@ def update_card(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.message
         )
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message
+        )
 
 
 @router.delete("/{card_id}", status_code=status.HTTP_204_NO_CONTENT)
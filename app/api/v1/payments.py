@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_active_user
 from app.models.user import User
 from app.models.payment import PaymentStatus, PaymentType
@@ -19,7 +19,7 @@ def get_payments(
     status: Optional[PaymentStatus] = None,
     payment_type: Optional[PaymentType] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all payments for the current user.
@@ -42,6 +42,7 @@ def get_payments(
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_payment(
     payment_data: PaymentCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -51,6 +52,7 @@ def create_payment(
     - **payment_type**: Type of payment (event, club, dining, printing, service, other)
     - **amount**: Payment amount (must be positive)
     - **description**: Payment description
+    - **Idempotency-Key** (header): Optional key; retries with the same key return the original payment
     
     Payments are created with PENDING status by default.
     Once created, payments cannot be updated or deleted.
@@ -58,7 +60,7 @@ def create_payment(
     """
     service = PaymentService(db)
     try:
-        return service.create_payment(current_user.id, payment_data)
+        return service.create_payment(current_user.id, payment_data, idempotency_key)
     except ValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -75,7 +77,7 @@ def create_payment(
 def get_payment(
     payment_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific payment by ID.
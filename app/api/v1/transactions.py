@@ -2,12 +2,12 @@ from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_read_db
 from app.dependencies import get_current_active_user
 from app.models.user import User
 from app.models.transaction import TransactionCategory
 from app.services.transaction_service import TransactionService
-from app.exceptions import NotFoundError
+from app.exceptions import NotFoundError, ValidationError
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
@@ -20,7 +20,7 @@ def get_transactions(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all transactions for the current user.
@@ -49,33 +49,45 @@ def get_transactions(
 def get_analytics(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    granularity: str = Query("day", pattern="^(day|week|month)$", description="Bucket size: day, week or month"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get spending analytics for the current user.
     
     - **start_date**: Start date for analytics (defaults to 30 days ago)
-    - **end_date**: End date for analytics (defaults to today)
+    - **end_date**: End date for analytics (defaults to the end of today)
+    - **granularity**: Spending-over-time bucket size: day, week (starting Monday) or month
     
     Returns:
     - Total spending
     - Spending by category
-    - Spending over time
+    - Spending over time: every bucket in the range, in UTC, as
+      {"period": epoch seconds of the bucket start, "total": amount}
+    
+    Responses are cached until one of the user's transactions changes.
     """
     service = TransactionService(db)
-    return service.get_analytics(
-        user_id=current_user.id,
-        start_date=start_date,
-        end_date=end_date,
-    )
+    try:
+        return service.get_analytics(
+            user_id=current_user.id,
+            start_date=start_date,
+            end_date=end_date,
+            granularity=granularity,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
 
 
 @router.get("/{transaction_id}", response_model=dict)
 def get_transaction(
     transaction_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific transaction by ID.
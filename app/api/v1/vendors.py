@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.database import get_db, get_read_db
+from app.dependencies import get_current_active_user, get_current_admin_user
 from app.models.user import User
-from app.schemas.vendor import VendorCreate, VendorUpdate
+from app.schemas.vendor import VendorCreate, VendorUpdate, VendorStatsResponse, VendorHeatmapResponse
 from app.services.vendor_service import VendorService
+from app.services.heatmap_service import HeatmapService
 from app.exceptions import NotFoundError, ValidationError
 
 router = APIRouter(prefix="/vendors", tags=["Vendors"])
@@ -17,7 +18,7 @@ def get_vendors(
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
     category: Optional[str] = Query(None, description="Filter by category (dining, retail, service, entertainment)"),
     active_only: bool = Query(True, description="Only return active vendors"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all campus vendors.
@@ -41,7 +42,7 @@ def get_vendors(
 @router.get("/{vendor_id}", response_model=dict)
 def get_vendor(
     vendor_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific vendor by ID.
@@ -58,6 +59,58 @@ def get_vendor(
         )
 
 
+@router.get("/{vendor_id}/stats", response_model=VendorStatsResponse)
+def get_vendor_stats(
+    vendor_id: int,
+    granularity: str = Query("day", pattern="^(hour|day|week)$", description="Bucket size: hour, day or week"),
+    periods: int = Query(30, ge=1, le=366, description="Number of most recent buckets to return"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get a vendor's revenue and payment counts per hour, day or week.
+
+    - **granularity**: hour, day or week (UTC; weeks start on Monday)
+    - **periods**: How many buckets to return, ending with the current one
+
+    Served from sales counters maintained with each payment, so the cost
+    doesn't grow with payment volume. Requires an admin account: vendor
+    accounts aren't linked to the vendor they run, so they can't be
+    limited to their own figures.
+    """
+    service = VendorService(db)
+    try:
+        return VendorStatsResponse(**service.get_vendor_stats(vendor_id, granularity, periods))
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message
+        )
+
+
+@router.get("/{vendor_id}/heatmap", response_model=VendorHeatmapResponse)
+def get_vendor_heatmap(
+    vendor_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get a vendor's busy times: payment counts per day of week and hour.
+
+    Counts are in campus local time and are refreshed by the
+    build_heatmaps.py batch job. Requires an admin account, like the
+    vendor's sales stats.
+    """
+    service = HeatmapService(db)
+    try:
+        return VendorHeatmapResponse(**service.get_vendor_heatmap(vendor_id))
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message
+        )
+
+
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_vendor(
     vendor_data: VendorCreate,
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.database import get_db
-from app.dependencies import get_current_active_user
+from app.dependencies import get_current_active_user, get_current_admin_user
 from app.models.user import User
-from app.schemas.wallet import WalletResponse, WalletLoadRequest
+from app.schemas.wallet import (
+    WalletResponse, WalletLoadRequest, WalletBalancesRequest, WalletFloatResponse, BulkCreditResponse
+)
 from app.services.wallet_service import WalletService
 from app.exceptions import NotFoundError, ValidationError
 
@@ -29,6 +34,7 @@ def get_wallet(
 @router.post("/load", response_model=WalletResponse, status_code=status.HTTP_200_OK)
 def load_money(
     load_request: WalletLoadRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -37,12 +43,13 @@ def load_money(
     
     - **amount**: Amount to load (must be greater than 0, max $10,000)
     - **card_id**: ID of the card to load money from
+    - **Idempotency-Key** (header): Optional key; retries with the same key return the original result
     
     The card must belong to the authenticated user.
     """
     try:
         service = WalletService(db)
-        wallet_dict = service.load_money(current_user.id, load_request)
+        wallet_dict = service.load_money(current_user.id, load_request, idempotency_key)
         return WalletResponse(**wallet_dict)
     except NotFoundError as e:
         raise HTTPException(
@@ -55,3 +62,71 @@ def load_money(
             detail=e.message
         )
 
+
+@router.post("/balances")
+def get_wallet_balances(
+    request: WalletBalancesRequest,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Look up wallet balances for many users at once (admin only).
+    
+    - **user_ids**: Up to 10,000 user IDs
+    
+    Streams newline-delimited JSON, one object per distinct user ID in
+    ascending order: `{"user_id", "balance", "updated_at"}`. Users without
+    a wallet have a null balance. Reads from the primary database.
+    
+    Rows are streamed from a server-side cursor as they are read, so memory
+    stays flat however many IDs are requested.
+    """
+    service = WalletService(db)
+    # The session dependency stays open until the response has been streamed
+    balances = service.iter_wallet_balances(request.user_ids)
+    return StreamingResponse(
+        (json.dumps(balance) + "\n" for balance in balances),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/float", response_model=WalletFloatResponse)
+def get_wallet_float(
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the total Flex Dollars held across all wallets (admin only).
+    
+    Computed in a single statement on the primary database, so the total
+    and count are a consistent snapshot as of the returned time.
+    """
+    service = WalletService(db)
+    return WalletFloatResponse(**service.get_float_snapshot())
+
+
+@router.post("/credits", response_model=BulkCreditResponse)
+def bulk_credit(
+    file: UploadFile = File(..., description="CSV with user_id,amount,memo columns"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Credit many wallets from a CSV upload (admin only), e.g. payroll or financial aid.
+    
+    - **file**: CSV with a `user_id,amount,memo` header; memo is optional
+    - **Idempotency-Key** (header): Optional key; re-uploading with the same key returns the original result
+    
+    Each row is credited to the user's wallet and recorded as its own
+    transaction. Invalid rows and users without a wallet are reported in
+    `errors` by CSV line number; all other rows are applied together.
+    """
+    try:
+        service = WalletService(db)
+        return service.bulk_credit_csv(current_user.id, file.file.read(), idempotency_key)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
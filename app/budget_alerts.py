@@ -0,0 +1,95 @@
+import logging
+import threading
+from typing import Callable, List
+from app.config import settings
+from app.database import SessionLocal
+from app.models.budget_alert import BudgetAlert
+from app.repositories.budget_alert_repository import BudgetAlertRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetAlertConsumer:
+    """
+    Background thread that delivers alerts from the budget_alerts outbox to
+    subscribed handlers. Writers call notify() after committing alerts so
+    delivery doesn't wait for the next poll; the poll picks up alerts
+    committed by other processes. Delivery is at-least-once: if a handler
+    fails, the batch stays undelivered and is retried.
+    """
+
+    def __init__(self, poll_seconds: int, batch_size: int):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._handlers: List[Callable[[BudgetAlert], None]] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, handler: Callable[[BudgetAlert], None]) -> None:
+        """Call handler with each delivered alert."""
+        self._handlers.append(handler)
+
+    def notify(self) -> None:
+        """Wake the consumer to deliver newly committed alerts now."""
+        self._wake.set()
+
+    def drain(self) -> int:
+        """Deliver all undelivered alerts. Returns the number delivered."""
+        db = SessionLocal()
+        try:
+            repo = BudgetAlertRepository(db)
+            total = 0
+            while not self._stop.is_set():
+                alerts = repo.claim_undelivered(self.batch_size)
+                for alert in alerts:
+                    for handler in self._handlers:
+                        handler(alert)
+                repo.mark_delivered(alerts)
+                db.commit()
+                total += len(alerts)
+                if len(alerts) < self.batch_size:
+                    break
+            return total
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """Start the background delivery thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="budget-alert-consumer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background delivery thread."""
+        self._stop.set()
+        self._wake.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.drain()
+            except Exception:
+                logger.warning("Budget alert delivery failed", exc_info=True)
+
+
+def log_alert(alert: BudgetAlert) -> None:
+    """Default handler: log the alert (swap in email/push delivery here)."""
+    logger.info(
+        "Budget %d of user %d reached %d%% of its limit (%.2f of %.2f)",
+        alert.budget_id, alert.user_id, alert.threshold_percent, alert.spent_amount, alert.limit_amount,
+    )
+
+
+budget_alert_consumer = BudgetAlertConsumer(settings.BUDGET_ALERT_POLL_SECONDS, settings.BUDGET_ALERT_BATCH_SIZE)
+budget_alert_consumer.subscribe(log_alert)
@@ -1,3 +1,5 @@
+import time
+from fastapi import Request, Response
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -15,9 +17,33 @@ engine = create_engine(
     max_overflow=20,
 )
 
+# Create read replica engine (falls back to the primary when not configured)
+if settings.READ_DATABASE_URL:
+    read_engine = create_engine(
+        settings.READ_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+    )
+else:
+    read_engine = engine
+
+# Cookie carrying the wall-clock deadline until which a client reads from the
+# primary; it travels with the client, so it works whichever worker serves the read
+PRIMARY_PIN_COOKIE = "read_primary_until"
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Session factory for read-only list queries: nothing is ever flushed and
+# loaded state is never expired, so projected rows stay cheap to serialize
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=read_engine,
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -57,3 +83,43 @@ def get_db():
     finally:
         db.close()
 
+
+def pin_to_primary(response: Response) -> None:
+    """Route a client's reads to the primary for a short while after a write."""
+    if read_engine is engine or settings.READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    response.set_cookie(
+        PRIMARY_PIN_COOKIE,
+        f"{time.time() + settings.READ_YOUR_WRITES_SECONDS:.3f}",
+        max_age=settings.READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _is_pinned_to_primary(request: Request) -> bool:
+    """Check whether the client recently wrote and must read its own writes."""
+    try:
+        until = float(request.cookies.get(PRIMARY_PIN_COOKIE, ""))
+    except ValueError:
+        return False
+    # Deadlines further out than a fresh pin would set are not honored
+    now = time.time()
+    return now < until <= now + settings.READ_YOUR_WRITES_SECONDS
+
+
+def get_read_db(request: Request):
+    """
+    Dependency function to get a read-only database session.
+    Used by GET endpoints that only select and serialize rows.
+    Reads go to the replica unless the client is pinned to the primary
+    after a recent write.
+    """
+    if _is_pinned_to_primary(request):
+        db = ReadSessionLocal(bind=engine)
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
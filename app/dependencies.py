@@ -1,27 +1,38 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 from app.database import get_db
 from app.config import settings
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
+from app.services.auth_service import TOKEN_CLAIMS_VERSION
+from app.token_revocation import revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get the current authenticated user from JWT token.
-    """
-    credentials_exception = HTTPException(
+class Principal:
+    """Authenticated identity built from token claims, without a database row."""
+    __slots__ = ("id", "role", "token_version")
+
+    def __init__(self, id: int, role: UserRole, token_version: int):
+        self.id = id
+        self.role = role
+        self.token_version = token_version
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> tuple[dict, int]:
+    """Decode a JWT and return its payload and user id."""
+    credentials_exception = _credentials_exception()
     
     try:
         payload = jwt.decode(
@@ -43,19 +54,90 @@ def get_current_user(
         # Invalid user_id format
         raise credentials_exception
     
+    return payload, user_id
+
+
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    Always loads the user row; use for endpoints that need the full profile.
+    """
+    payload, user_id = _decode_token(token)
+    
     user_repo = UserRepository(db)
     user = user_repo.get_by_id(user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    
+    # Tokens issued before the user's last revocation are no longer valid
+    if payload.get("tv", 0) < user.token_version:
+        raise _credentials_exception()
     
+    # Expose the user to get_read_db and the read-your-writes middleware
+    request.state.user_id = user.id
     return user
 
 
+def get_current_principal(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Dependency to get the current authenticated identity.
+    
+    With AUTH_STATELESS enabled, tokens carrying the current claim set are
+    authorized from their id, role and token_version claims against the
+    in-process revocation cache, without any SQL. Otherwise, or for older
+    tokens, the user is loaded from the database.
+    """
+    if not settings.AUTH_STATELESS:
+        return get_current_user(request, token, db)
+    
+    payload, user_id = _decode_token(token)
+    if payload.get("v") != TOKEN_CLAIMS_VERSION:
+        return get_current_user(request, token, db)
+    
+    try:
+        principal = Principal(
+            id=user_id,
+            role=UserRole(payload["role"]),
+            token_version=int(payload["tv"]),
+        )
+    except (KeyError, ValueError, TypeError):
+        raise _credentials_exception()
+    
+    if revocations.is_revoked(principal.id, principal.token_version):
+        raise _credentials_exception()
+    
+    request.state.user_id = principal.id
+    return principal
+
+
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ) -> User:
     """
     Dependency to ensure the current user is active.
+    Returns a User, or a Principal (id, role) in stateless mode.
     """
     return current_user
 
+
+def get_current_admin_user(
+    current_user: User = Depends(get_current_principal)
+) -> User:
+    """
+    Dependency to ensure the current user is an admin.
+    Returns a User, or a Principal (id, role) in stateless mode.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -33,6 +33,26 @@ class ForbiddenError(AppException):
         super().__init__(message, status_code=status.HTTP_403_FORBIDDEN)
 
 
+class ConflictError(AppException):
+    """Exception for conflicting concurrent requests."""
+    def __init__(self, message: str = "Request conflicts with another request"):
+        super().__init__(message, status_code=status.HTTP_409_CONFLICT)
+
+
+class TooManyRequestsError(AppException):
+    """Exception for rate-limited requests."""
+    def __init__(self, message: str = "Too many requests", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class ServiceUnavailableError(AppException):
+    """Exception for load shedding when the server is saturated."""
+    def __init__(self, message: str = "Service temporarily unavailable", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 class ValidationError(AppException):
     """Exception for validation errors."""
     def __init__(self, message: str = "Validation error"):
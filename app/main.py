@@ -1,8 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, read_engine, Base, pin_to_primary
+from app.partitions import ensure_transactions_partitions
+from app.token_revocation import revocations
+from app.reset_token_sweeper import reset_token_sweeper
+from app.budget_alerts import budget_alert_consumer
+from app.services.transaction_service import analytics_cache_stats
 from app.exceptions import (
     AppException,
     app_exception_handler,
@@ -15,6 +20,7 @@ from app.api.v1 import auth, transactions, budgets, payments, cards, wallet, ven
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+ensure_transactions_partitions(engine)
 
 # Create FastAPI app
 app = FastAPI(
@@ -34,12 +40,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Pin clients to the primary after writes so they read their own writes
+if read_engine is not engine:
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            if getattr(request.state, "user_id", None) is not None:
+                pin_to_primary(response)
+        return response
+
 # Register exception handlers
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 
 
+# Keep the token revocation cache fresh for stateless authorization
+@app.on_event("startup")
+def start_token_revocation_refresh():
+    if settings.AUTH_STATELESS:
+        revocations.start()
+
+
+@app.on_event("shutdown")
+def stop_token_revocation_refresh():
+    revocations.stop()
+
+
+# Delete expired password reset tokens in the background
+@app.on_event("startup")
+def start_reset_token_sweeper():
+    reset_token_sweeper.start()
+
+
+@app.on_event("shutdown")
+def stop_reset_token_sweeper():
+    reset_token_sweeper.stop()
+
+
+# Deliver budget alerts from the outbox in the background
+@app.on_event("startup")
+def start_budget_alert_consumer():
+    budget_alert_consumer.start()
+
+
+@app.on_event("shutdown")
+def stop_budget_alert_consumer():
+    budget_alert_consumer.stop()
+
+
 # Health check endpoint
 @app.get("/health")
 def health_check():
@@ -47,6 +97,13 @@ def health_check():
     return {"status": "healthy", "service": "Smart Campus Wallet API"}
 
 
+# Cache metrics (counted per worker process)
+@app.get("/metrics")
+def cache_metrics():
+    """Hit/miss counts of the analytics cache in this worker."""
+    return {"analytics_cache": analytics_cache_stats.as_dict()}
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(transactions.router, prefix="/api/v1")
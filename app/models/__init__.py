@@ -5,6 +5,20 @@ from app.models.payment import Payment
 from app.models.card import Card
 from app.models.vendor import Vendor
 from app.models.wallet import Wallet
+from app.models.idempotency_key import IdempotencyKey
+from app.models.archive import TransactionArchive, PaymentArchive, ArchiveState
+from app.models.refresh_token import RefreshToken
+from app.models.password_reset_token import PasswordResetToken
+from app.models.vendor_sales import VendorSalesCounter
+from app.models.vendor_heatmap import VendorHeatmap
+from app.models.budget_alert import BudgetAlert
+from app.models.transaction_watermark import TransactionWatermark
+from app.models.budget_watermark import BudgetWatermark
 
-__all__ = ["User", "Transaction", "Budget", "Payment", "Card", "Wallet", "Vendor"]
+__all__ = [
+    "User", "Transaction", "Budget", "Payment", "Card", "Wallet", "Vendor", "IdempotencyKey",
+    "TransactionArchive", "PaymentArchive", "ArchiveState", "RefreshToken",
+    "PasswordResetToken", "VendorSalesCounter", "VendorHeatmap", "BudgetAlert",
+    "TransactionWatermark", "BudgetWatermark",
+]
 
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, Enum, Index
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.transaction import TransactionCategory, PaymentMethod, TransactionSource
+from app.models.payment import PaymentType, PaymentStatus
+
+
+class TransactionArchive(Base):
+    """Cold copy of transactions older than the archive cutoff (see archive_records.py)."""
+    __tablename__ = "transactions_archive"
+    __table_args__ = (
+        Index("ix_transactions_archive_user_id_date", "user_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    amount = Column(Float, nullable=False)
+    category = Column(Enum(TransactionCategory), nullable=False)
+    merchant = Column(String, nullable=False)
+    location = Column(String, nullable=True)
+    payment_method = Column(Enum(PaymentMethod), nullable=False)
+    date = Column(DateTime(timezone=True), nullable=False)
+    description = Column(String, nullable=True)
+    source = Column(Enum(TransactionSource), nullable=False, server_default=TransactionSource.USER.name)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class PaymentArchive(Base):
+    """Cold copy of payments older than the archive cutoff (see archive_records.py)."""
+    __tablename__ = "payments_archive"
+    __table_args__ = (
+        Index("ix_payments_archive_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    vendor_id = Column(Integer, nullable=True)
+    payment_type = Column(Enum(PaymentType), nullable=False)
+    amount = Column(Float, nullable=False)
+    description = Column(String, nullable=False)
+    status = Column(Enum(PaymentStatus), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class ArchiveState(Base):
+    """Per-table watermark: every row older than `archived_before` may live in the archive."""
+    __tablename__ = "archive_state"
+
+    table_name = Column(String(50), primary_key=True)
+    archived_before = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum, Date
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum, Date, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -20,6 +20,15 @@ class Budget(Base):
     period = Column(Enum(BudgetPeriod), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
+    # Recurring budgets get their next period created by roll_budgets.py
+    is_recurring = Column(Boolean, default=False, server_default="false", nullable=False)
+    # The period this budget was rolled over from (unique: each rolls over once)
+    previous_budget_id = Column(Integer, ForeignKey("budgets.id", ondelete="SET NULL"), nullable=True, unique=True)
+    # Running spend in the budget's category and dates, kept current by each
+    # payment and load (see app/services/budget_alert_service.py)
+    spent_amount = Column(Float, default=0.0, server_default="0", nullable=False)
+    # Highest alert threshold (percent of limit) already emitted
+    alerted_percent = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class BudgetAlert(Base):
+    """
+    Outbox of budget threshold events, written in the same transaction as the
+    spend that crossed the threshold and delivered by the background consumer
+    in app/budget_alerts.py.
+    """
+    __tablename__ = "budget_alerts"
+    __table_args__ = (
+        Index("ix_budget_alerts_user_id_id", "user_id", "id"),
+        # Keeps the consumer's poll cheap however many alerts were delivered
+        Index("ix_budget_alerts_undelivered", "id", postgresql_where=text("delivered_at IS NULL")),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    budget_id = Column(Integer, ForeignKey("budgets.id", ondelete="CASCADE"), nullable=False)
+    threshold_percent = Column(Integer, nullable=False)
+    spent_amount = Column(Float, nullable=False)
+    limit_amount = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from app.database import Base
+
+
+class BudgetWatermark(Base):
+    """
+    Per-user counter bumped in the same transaction as every create, update,
+    delete or rollover of the user's budgets (see BudgetWatermarkRepository.bump);
+    together with the transaction watermark it tells whether cached forecasts
+    are still current. Users without a row are at version 0.
+    """
+    __tablename__ = "budget_watermarks"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, default=0, nullable=False)
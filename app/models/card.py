@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Date, Boolean, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -12,6 +13,19 @@ class CardType(str, enum.Enum):
 
 class Card(Base):
     __tablename__ = "cards"
+    # At most one default card per user. A partial unique index would be checked
+    # row by row and reject the single-statement default switch in
+    # CardRepository; this deferrable constraint is checked at statement end.
+    __table_args__ = (
+        ExcludeConstraint(
+            ("user_id", "="),
+            name="uq_cards_one_default_per_user",
+            using="btree",
+            where=text("is_default"),
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
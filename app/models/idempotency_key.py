@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "scope", "key", name="uq_idempotency_keys_user_scope_key"),
+        # Oldest-first scans for the expiry sweep
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    scope = Column(String(50), nullable=False)  # e.g. "payments.create", "wallet.load"
+    key = Column(String(255), nullable=False)  # Client-supplied Idempotency-Key header
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request body
+    response = Column(JSON, nullable=True)  # Set before commit; NULL only inside the first request's transaction
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, CHAR, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class PasswordResetToken(Base):
+    __tablename__ = "password_reset_tokens"
+
+    token_hash = Column(CHAR(64), primary_key=True)  # SHA-256 hex; raw token is never stored
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Drives the expiry sweeper
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
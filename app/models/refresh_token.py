@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 hex; raw token is never stored
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Swept once passed
+    revoked_at = Column(DateTime(timezone=True), nullable=True)  # Set when rotated or revoked
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
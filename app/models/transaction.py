@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -21,18 +21,34 @@ class PaymentMethod(str, enum.Enum):
     CAMPUS_CARD = "campus_card"
 
 
+class TransactionSource(str, enum.Enum):
+    """Who wrote a transaction; set by the server, never by the request body."""
+    USER = "user"
+    PAYMENT = "payment"
+    WALLET_LOAD = "wallet_load"
+    DISBURSEMENT = "disbursement"
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
-
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Range-partitioned by month on `date` (see app/partitions.py); the
+    # partition key has to be part of the primary key
+    __table_args__ = (
+        # Covers the per-user aggregates (analytics, budgets) as index-only scans
+        Index("ix_transactions_user_id_date", "user_id", "date", postgresql_include=["amount", "category"]),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount = Column(Float, nullable=False)
     category = Column(Enum(TransactionCategory), nullable=False)
     merchant = Column(String, nullable=False)
     location = Column(String, nullable=True)
     payment_method = Column(Enum(PaymentMethod), nullable=False)
-    date = Column(DateTime(timezone=True), nullable=False, index=True)
+    date = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     description = Column(String, nullable=True)
+    source = Column(Enum(TransactionSource), nullable=False, server_default=TransactionSource.USER.name)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from app.database import Base
+
+
+class TransactionWatermark(Base):
+    """
+    Per-user counter bumped in the same transaction as every write to the
+    user's transactions (see TransactionWatermarkRepository.bump), so cached
+    analytics can tell whether they are still current. Users without a row
+    have never had a transaction change and are at version 0.
+    """
+    __tablename__ = "transaction_watermarks"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, default=0, nullable=False)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class VendorHeatmap(Base):
+    """
+    Payment counts per (day of week, hour) for a vendor in campus local time,
+    built by build_heatmaps.py (see app/services/heatmap_service.py).
+    """
+    __tablename__ = "vendor_heatmaps"
+
+    vendor_id = Column(Integer, ForeignKey("vendors.id", ondelete="CASCADE"), primary_key=True)
+    counts = Column(ARRAY(Integer), nullable=False)  # 168 cells, Monday 00:00 first, row-major by day
+    through_payment_id = Column(Integer, nullable=False)  # Payments up to this ID are counted
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from app.database import Base
+
+
+class VendorSalesCounter(Base):
+    """
+    Running payment totals per vendor and time bucket, incremented in the same
+    transaction as each vendor payment (see VendorSalesRepository.increment).
+    """
+    __tablename__ = "vendor_sales_counters"
+
+    vendor_id = Column(Integer, ForeignKey("vendors.id", ondelete="CASCADE"), primary_key=True)
+    granularity = Column(String(8), primary_key=True)  # "hour", "day" or "week"
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)  # UTC; weeks start on Monday
+    revenue = Column(Float, default=0.0, nullable=False)
+    payment_count = Column(Integer, default=0, nullable=False)
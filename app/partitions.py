@@ -0,0 +1,82 @@
+import logging
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _month_start(value: datetime) -> date:
+    """First day of the UTC month containing value."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        value = value.date()
+    return value.replace(day=1)
+
+
+def _add_months(month_start: date, months: int) -> date:
+    """Shift a month start by a number of months."""
+    month_index = month_start.month - 1 + months
+    return date(month_start.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def transactions_partition_name(month_start: date) -> str:
+    """Name of the monthly transactions partition, e.g. transactions_2025_11."""
+    return f"transactions_{month_start:%Y_%m}"
+
+
+def ensure_transactions_partition(engine: Engine, value: datetime) -> bool:
+    """
+    Create the monthly partition that will hold a transaction dated value.
+    Returns whether the partition exists afterwards.
+
+    Attaching a partition takes an ACCESS EXCLUSIVE lock on transactions, so
+    this only runs at startup and from create_partitions.py, never while
+    serving a request. The DDL gives up after
+    TRANSACTION_PARTITION_LOCK_TIMEOUT_MS rather than queueing every query
+    on transactions behind a long reader; rows for a missing month land in
+    the default partition until a later run succeeds.
+    """
+    if engine.dialect.name != "postgresql":
+        return True
+
+    month_start = _month_start(value)
+    next_month = _add_months(month_start, 1)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"SET LOCAL lock_timeout = {int(settings.TRANSACTION_PARTITION_LOCK_TIMEOUT_MS)}"
+            ))
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {transactions_partition_name(month_start)} "
+                f"PARTITION OF transactions "
+                f"FOR VALUES FROM ('{month_start.isoformat()} 00:00:00+00') "
+                f"TO ('{next_month.isoformat()} 00:00:00+00')"
+            ))
+    except Exception:
+        # e.g. the lock wait timed out, or the default partition already
+        # holds rows for this month
+        logger.warning("Could not create transactions partition for %s", month_start, exc_info=True)
+        return False
+    return True
+
+
+def ensure_transactions_partitions(engine: Engine, months_ahead: int = None) -> int:
+    """
+    Create the default partition and monthly partitions from this month
+    forward. Returns the number of months whose partition couldn't be created.
+    """
+    if months_ahead is None:
+        months_ahead = settings.TRANSACTION_PARTITION_MONTHS_AHEAD
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT"
+            ))
+    current_month = _month_start(datetime.now(timezone.utc))
+    return sum(
+        not ensure_transactions_partition(engine, _add_months(current_month, offset))
+        for offset in range(months_ahead + 1)
+    )
@@ -0,0 +1,113 @@
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Hashable, Optional, Tuple
+from fastapi import Request
+from app.config import settings
+from app.exceptions import ServiceUnavailableError
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets. Implement take() to share limits between
+    processes (e.g. a Redis-backed bucket); the default keeps them in memory.
+    """
+
+    @abstractmethod
+    def take(self, key: Hashable, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        """Take one token from key's bucket. Returns (allowed, seconds until a token is available)."""
+
+
+class InMemoryTokenBucketBackend(RateLimitBackend):
+    """Token buckets in this process, split across independently locked shards."""
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+
+    def take(self, key: Hashable, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        lock, buckets = self._shards[zlib.crc32(repr(key).encode("utf-8")) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated = buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            buckets[key] = (tokens, now)
+            # Forget the least recently seen keys; they'd start over with a full bucket
+            while len(buckets) > self.max_keys_per_shard:
+                buckets.popitem(last=False)
+        retry_after = 0.0 if allowed else (1 - tokens) / refill_per_second
+        return allowed, retry_after
+
+
+class TokenBucketLimiter:
+    """Allows `burst` requests per key at once, refilled at `per_minute` per minute."""
+
+    def __init__(self, name: str, burst: int, per_minute: float, backend: RateLimitBackend):
+        self.name = name
+        self.burst = burst
+        self.refill_per_second = per_minute / 60
+        self.backend = backend
+
+    def hit(self, key: Hashable) -> Tuple[bool, float]:
+        """Count a request for key. Returns (allowed, retry_after_seconds)."""
+        return self.backend.take((self.name, key), self.burst, self.refill_per_second)
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """
+    The client address login limits are keyed on. Behind a proxy set
+    CLIENT_IP_HEADER (e.g. X-Forwarded-For): the address is read from the
+    entry TRUSTED_PROXY_COUNT places from the right, the one appended by
+    the outermost trusted proxy, so clients can't spoof it by sending the
+    header themselves. With fewer entries than trusted proxies the request
+    didn't come through them all, so the peer address is used.
+    """
+    peer = request.client.host if request.client else None
+    if not settings.CLIENT_IP_HEADER:
+        return peer
+    hops = [hop.strip() for hop in request.headers.get(settings.CLIENT_IP_HEADER, "").split(",") if hop.strip()]
+    if len(hops) < max(settings.TRUSTED_PROXY_COUNT, 1):
+        return peer
+    return hops[-max(settings.TRUSTED_PROXY_COUNT, 1)]
+
+
+class WorkGate:
+    """
+    Caps how many expensive operations (bcrypt) run at once. Callers that
+    can't get a slot quickly are rejected instead of queueing behind an
+    attack burst and starving the worker threads.
+    """
+
+    def __init__(self, max_concurrent: int, max_wait_seconds: float):
+        self.max_wait_seconds = max_wait_seconds
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    @contextmanager
+    def slot(self):
+        if not self._semaphore.acquire(timeout=self.max_wait_seconds):
+            raise ServiceUnavailableError("Too many sign-in attempts in progress. Please try again shortly.")
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+rate_limit_backend: RateLimitBackend = InMemoryTokenBucketBackend()
+
+login_ip_limiter = TokenBucketLimiter(
+    "login_ip", settings.LOGIN_RATE_LIMIT_IP_BURST, settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE, rate_limit_backend
+)
+login_email_ip_limiter = TokenBucketLimiter(
+    "login_email_ip", settings.LOGIN_RATE_LIMIT_EMAIL_IP_BURST, settings.LOGIN_RATE_LIMIT_EMAIL_IP_PER_MINUTE,
+    rate_limit_backend,
+)
+login_email_limiter = TokenBucketLimiter(
+    "login_email", settings.LOGIN_RATE_LIMIT_EMAIL_BURST, settings.LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE, rate_limit_backend
+)
+bcrypt_gate = WorkGate(settings.BCRYPT_MAX_CONCURRENT, settings.BCRYPT_MAX_WAIT_MS / 1000)
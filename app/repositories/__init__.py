@@ -4,6 +4,14 @@ from app.repositories.budget_repository import BudgetRepository
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.card_repository import CardRepository
 from app.repositories.wallet_repository import WalletRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.password_reset_token_repository import PasswordResetTokenRepository
+from app.repositories.vendor_sales_repository import VendorSalesRepository
+from app.repositories.heatmap_repository import HeatmapRepository
+from app.repositories.budget_alert_repository import BudgetAlertRepository
+from app.repositories.transaction_watermark_repository import TransactionWatermarkRepository
 
 __all__ = [
     "UserRepository",
@@ -11,6 +19,14 @@ __all__ = [
     "BudgetRepository",
     "PaymentRepository",
     "CardRepository",
-    "WalletRepository"
+    "WalletRepository",
+    "IdempotencyRepository",
+    "ArchiveRepository",
+    "RefreshTokenRepository",
+    "PasswordResetTokenRepository",
+    "VendorSalesRepository",
+    "HeatmapRepository",
+    "BudgetAlertRepository",
+    "TransactionWatermarkRepository"
 ]
 
@@ -0,0 +1,168 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, text
+from typing import Optional, List
+from datetime import datetime
+from app.models.archive import TransactionArchive, PaymentArchive, ArchiveState
+from app.models.transaction import TransactionCategory
+from app.models.payment import PaymentStatus, PaymentType
+
+# Columns needed to serialize an archived transaction in list responses
+TRANSACTION_LIST_COLUMNS = (
+    TransactionArchive.id,
+    TransactionArchive.user_id,
+    TransactionArchive.amount,
+    TransactionArchive.category,
+    TransactionArchive.merchant,
+    TransactionArchive.location,
+    TransactionArchive.payment_method,
+    TransactionArchive.date,
+    TransactionArchive.description,
+    TransactionArchive.created_at,
+)
+
+# Columns needed to serialize an archived payment in list responses
+PAYMENT_LIST_COLUMNS = (
+    PaymentArchive.id,
+    PaymentArchive.user_id,
+    PaymentArchive.payment_type,
+    PaymentArchive.amount,
+    PaymentArchive.description,
+    PaymentArchive.status,
+    PaymentArchive.created_at,
+    PaymentArchive.updated_at,
+)
+
+_MOVE_TRANSACTIONS_SQL = text("""
+    WITH batch AS (
+        SELECT id, date FROM transactions
+        WHERE date < :cutoff
+        ORDER BY date
+        LIMIT :batch_size
+    ), moved AS (
+        DELETE FROM transactions t
+        USING batch b
+        WHERE t.id = b.id AND t.date = b.date
+        RETURNING t.id, t.user_id, t.amount, t.category, t.merchant, t.location,
+                  t.payment_method, t.date, t.description, t.source, t.created_at
+    )
+    INSERT INTO transactions_archive
+        (id, user_id, amount, category, merchant, location,
+         payment_method, date, description, source, created_at)
+    SELECT * FROM moved
+""")
+
+_MOVE_PAYMENTS_SQL = text("""
+    WITH batch AS (
+        SELECT id FROM payments
+        WHERE created_at < :cutoff
+        ORDER BY id
+        LIMIT :batch_size
+    ), moved AS (
+        DELETE FROM payments p
+        USING batch b
+        WHERE p.id = b.id
+        RETURNING p.id, p.user_id, p.vendor_id, p.payment_type, p.amount,
+                  p.description, p.status, p.created_at, p.updated_at
+    )
+    INSERT INTO payments_archive
+        (id, user_id, vendor_id, payment_type, amount,
+         description, status, created_at, updated_at)
+    SELECT * FROM moved
+""")
+
+
+class ArchiveRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_archived_before(self, table_name: str) -> Optional[datetime]:
+        """Get the archive watermark for a hot table, if it was ever archived."""
+        return self.db.query(ArchiveState.archived_before).filter(
+            ArchiveState.table_name == table_name
+        ).scalar()
+
+    def set_archived_before(self, table_name: str, cutoff: datetime) -> bool:
+        """Raise the archive watermark for a hot table (never lowers it). Returns whether it moved."""
+        state = self.db.query(ArchiveState).filter(
+            ArchiveState.table_name == table_name
+        ).with_for_update().first()
+        raised = True
+        if state is None:
+            self.db.add(ArchiveState(table_name=table_name, archived_before=cutoff))
+        elif state.archived_before < cutoff:
+            state.archived_before = cutoff
+        else:
+            raised = False
+        self.db.commit()
+        return raised
+
+    def move_transactions_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """Move one chunk of transactions older than cutoff into the archive. Returns rows moved."""
+        result = self.db.execute(
+            _MOVE_TRANSACTIONS_SQL, {"cutoff": cutoff, "batch_size": batch_size}
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def move_payments_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """Move one chunk of payments older than cutoff into the archive. Returns rows moved."""
+        result = self.db.execute(
+            _MOVE_PAYMENTS_SQL, {"cutoff": cutoff, "batch_size": batch_size}
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def get_transaction_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[TransactionCategory] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List:
+        """Get archived transactions for a user as read-only column rows."""
+        query = select(*TRANSACTION_LIST_COLUMNS).where(TransactionArchive.user_id == user_id)
+
+        if category:
+            query = query.where(TransactionArchive.category == category)
+        if start_date:
+            query = query.where(TransactionArchive.date >= start_date)
+        if end_date:
+            query = query.where(TransactionArchive.date <= end_date)
+
+        query = query.order_by(TransactionArchive.date.desc()).offset(skip).limit(limit)
+        return self.db.execute(query).all()
+
+    def get_transaction_by_id(self, transaction_id: int, user_id: int) -> Optional[TransactionArchive]:
+        """Get an archived transaction by ID for a specific user."""
+        return self.db.query(TransactionArchive).filter(
+            TransactionArchive.id == transaction_id,
+            TransactionArchive.user_id == user_id,
+        ).first()
+
+    def get_payment_by_id(self, payment_id: int, user_id: int) -> Optional[PaymentArchive]:
+        """Get an archived payment by ID for a specific user."""
+        return self.db.query(PaymentArchive).filter(
+            PaymentArchive.id == payment_id,
+            PaymentArchive.user_id == user_id,
+        ).first()
+
+    def get_payment_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[PaymentStatus] = None,
+        payment_type: Optional[PaymentType] = None,
+    ) -> List:
+        """Get archived payments for a user as read-only column rows."""
+        query = select(*PAYMENT_LIST_COLUMNS).where(PaymentArchive.user_id == user_id)
+
+        if status:
+            query = query.where(PaymentArchive.status == status)
+        if payment_type:
+            query = query.where(PaymentArchive.payment_type == payment_type)
+
+        query = query.order_by(PaymentArchive.created_at.desc()).offset(skip).limit(limit)
+        return self.db.execute(query).all()
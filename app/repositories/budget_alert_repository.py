@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import List
+from app.models.budget_alert import BudgetAlert
+
+
+class BudgetAlertRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_many(self, alerts: List[dict]) -> None:
+        """Stage alerts in the outbox (committed by the caller, with the spend that triggered them)."""
+        self.db.add_all([BudgetAlert(**alert) for alert in alerts])
+
+    def get_for_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[BudgetAlert]:
+        """Get a user's alerts, newest first."""
+        return self.db.query(BudgetAlert).filter(
+            BudgetAlert.user_id == user_id
+        ).order_by(BudgetAlert.id.desc()).offset(skip).limit(limit).all()
+
+    def claim_undelivered(self, batch_size: int) -> List[BudgetAlert]:
+        """
+        Lock up to batch_size undelivered alerts, oldest first. Rows locked by
+        another consumer are skipped, so several processes can drain the outbox.
+        """
+        return self.db.query(BudgetAlert).filter(
+            BudgetAlert.delivered_at.is_(None)
+        ).order_by(BudgetAlert.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+    def mark_delivered(self, alerts: List[BudgetAlert]) -> None:
+        """Mark claimed alerts as delivered (committed by the caller)."""
+        for alert in alerts:
+            alert.delivered_at = func.now()
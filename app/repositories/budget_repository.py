@@ -1,10 +1,73 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import Optional, List
+from sqlalchemy import and_, or_, text
+from typing import Optional, List, Tuple, Dict
 from datetime import date
 from app.models.budget import Budget
+from app.models.transaction import TransactionCategory
 from app.schemas.budget import BudgetCreate, BudgetUpdate
 
+# Adds one chunk of (user_id, category, amount, day) spends to the running
+# spend of every budget they fall in: same user, day within the budget's
+# dates, and the budget's category (or any category if it matches none).
+# Returns the updated budgets so thresholds can be checked.
+_APPLY_SPENDS_SQL = """
+    WITH spends AS (
+        SELECT user_id::integer AS user_id, category::text AS category,
+               amount::double precision AS amount, day::date AS day
+        FROM (VALUES {values}) AS v (user_id, category, amount, day)
+    ), per_budget AS (
+        SELECT b.id, sum(s.amount) AS amount
+        FROM spends s
+        JOIN budgets b ON b.user_id = s.user_id
+            AND b.start_date <= s.day AND b.end_date >= s.day
+            AND (lower(b.category) = s.category OR lower(b.category) <> ALL(:categories))
+        GROUP BY b.id
+    )
+    UPDATE budgets b SET spent_amount = b.spent_amount + p.amount
+    FROM per_budget p
+    WHERE b.id = p.id
+    RETURNING b.id, b.user_id, b.limit_amount, b.spent_amount, b.alerted_percent
+"""
+
+
+# Creates the next period of every recurring budget ending on or before :as_of
+# that hasn't been rolled over yet, in one statement. The new period starts the
+# day after the old one ends and lasts a week or a calendar month; category,
+# limit and recurrence carry forward. Spending already dated in the new period
+# (when the job runs late) is counted, and thresholds it passed are treated as
+# alerted. The unique previous_budget_id makes concurrent runs harmless.
+_ROLL_OVER_SQL = text("""
+    INSERT INTO budgets
+        (user_id, category, limit_amount, period, start_date, end_date,
+         is_recurring, previous_budget_id, spent_amount, alerted_percent)
+    SELECT b.user_id, b.category, b.limit_amount, b.period, n.start_date, n.end_date,
+           true, b.id, s.spent,
+           coalesce((
+               SELECT max(threshold) FROM unnest(CAST(:thresholds AS integer[])) AS threshold
+               WHERE s.spent * 100 >= b.limit_amount * threshold
+           ), 0)
+    FROM budgets b
+    CROSS JOIN LATERAL (
+        SELECT b.end_date + 1 AS start_date,
+               CASE WHEN b.period = 'WEEKLY' THEN b.end_date + 7
+                    ELSE CAST(b.end_date + 1 + interval '1 month' AS date) - 1
+               END AS end_date
+    ) n
+    CROSS JOIN LATERAL (
+        SELECT coalesce(sum(t.amount), 0) AS spent
+        FROM transactions t
+        WHERE t.user_id = b.user_id
+          AND t.date >= n.start_date AND t.date < n.end_date + 1
+          AND (lower(CAST(t.category AS text)) = lower(b.category)
+               OR lower(b.category) <> ALL(:categories))
+    ) s
+    WHERE b.is_recurring
+      AND b.end_date <= :as_of
+      AND NOT EXISTS (SELECT 1 FROM budgets r WHERE r.previous_budget_id = b.id)
+    ON CONFLICT (previous_budget_id) DO NOTHING
+    RETURNING user_id
+""")
+
 
 class BudgetRepository:
     def __init__(self, db: Session):
@@ -27,6 +90,20 @@ class BudgetRepository:
             .all()
         )
 
+    def get_all_for_user(self, user_id: int, for_update: bool = False) -> List[Budget]:
+        """
+        Get every budget of a user, oldest first. With for_update, the rows
+        are locked (in ID order) and reloaded until the caller commits.
+        """
+        query = self.db.query(Budget).filter(Budget.user_id == user_id).order_by(Budget.id)
+        if for_update:
+            query = query.with_for_update().populate_existing()
+        return query.all()
+
+    def lock(self, budget: Budget) -> None:
+        """Lock a budget row until the caller commits, reloading it."""
+        self.db.refresh(budget, with_for_update=True)
+
     def get_active_budgets(self, user_id: int, current_date: date = None) -> List[Budget]:
         """Get all active budgets (where current date is between start and end date)."""
         if current_date is None:
@@ -44,6 +121,43 @@ class BudgetRepository:
             .all()
         )
 
+    def apply_spends(
+        self, spends: List[Tuple[int, TransactionCategory, float, date]]
+    ) -> List[Tuple[int, int, float, float, int]]:
+        """
+        Add spends to the running spend of the active budgets they fall in
+        with one statement (committed by the caller).
+        
+        spends are (user_id, category, amount, day) tuples. Returns
+        (id, user_id, limit_amount, spent_amount, alerted_percent) for each
+        updated budget; the rows stay locked until the caller commits.
+        """
+        params = {"categories": [category.value for category in TransactionCategory]}
+        placeholders = []
+        for i, (user_id, category, amount, day) in enumerate(spends):
+            placeholders.append(f"(:u{i}, :c{i}, :a{i}, :d{i})")
+            params.update({f"u{i}": user_id, f"c{i}": category.value, f"a{i}": amount, f"d{i}": day})
+        statement = text(_APPLY_SPENDS_SQL.format(values=", ".join(placeholders)))
+        return self.db.execute(statement, params).all()
+
+    def set_alerted_percents(self, alerted: Dict[int, int]) -> None:
+        """Record the highest alerted threshold for each budget ID (committed by the caller)."""
+        self.db.bulk_update_mappings(Budget, [
+            {"id": budget_id, "alerted_percent": percent} for budget_id, percent in alerted.items()
+        ])
+
+    def roll_over(self, as_of: date, thresholds: List[int]) -> List[int]:
+        """
+        Create the next period of each recurring budget ending on or before
+        as_of (committed by the caller). Returns the user_id of each budget
+        created.
+        """
+        return list(self.db.execute(_ROLL_OVER_SQL, {
+            "as_of": as_of,
+            "thresholds": thresholds,
+            "categories": [category.value for category in TransactionCategory],
+        }).scalars())
+
     def create(self, user_id: int, budget_data: BudgetCreate) -> Budget:
         """Create a new budget."""
         db_budget = Budget(
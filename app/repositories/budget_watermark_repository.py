@@ -0,0 +1,34 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from typing import Iterable
+from app.models.budget_watermark import BudgetWatermark
+from app.repositories.transaction_watermark_repository import BUMP_CHUNK_SIZE
+
+
+class BudgetWatermarkRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: int) -> int:
+        """Current watermark of a user's budgets (0 if they never changed)."""
+        version = self.db.query(BudgetWatermark.version).filter(
+            BudgetWatermark.user_id == user_id
+        ).scalar()
+        return version or 0
+
+    def bump(self, user_ids: Iterable[int]) -> None:
+        """
+        Advance the watermark of each user whose budgets changed (committed
+        by the caller, with the change). Users are bumped in ID order so
+        concurrent rollovers lock their rows in the same order.
+        """
+        user_ids = sorted(set(user_ids))
+        for start in range(0, len(user_ids), BUMP_CHUNK_SIZE):
+            statement = insert(BudgetWatermark).values([
+                {"user_id": user_id, "version": 1}
+                for user_id in user_ids[start:start + BUMP_CHUNK_SIZE]
+            ])
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=[BudgetWatermark.user_id],
+                set_={"version": BudgetWatermark.version + 1},
+            ))
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import or_, update
 from typing import List, Optional
 from app.models.card import Card
 from app.schemas.card import CardCreate, CardUpdate
@@ -21,6 +22,12 @@ class CardRepository:
             Card.user_id == user_id
         ).offset(skip).limit(limit).all()
 
+    def get_all_for_user(self, user_id: int) -> List[Card]:
+        """Get every card of a user, oldest first."""
+        return self.db.query(Card).filter(
+            Card.user_id == user_id
+        ).order_by(Card.id).all()
+
     def get_default(self, user_id: int) -> Optional[Card]:
         """Get the default card for a user."""
         return self.db.query(Card).filter(
@@ -30,10 +37,6 @@ class CardRepository:
 
     def create(self, user_id: int, card_data: CardCreate) -> Card:
         """Create a new card."""
-        # If this is set as default, unset other default cards
-        if card_data.is_default:
-            self._unset_default_cards(user_id)
-        
         db_card = Card(
             user_id=user_id,
             card_number=card_data.card_number,
@@ -41,9 +44,15 @@ class CardRepository:
             expiry_date=card_data.expiry_date,
             card_type=card_data.card_type,
             bank_name=card_data.bank_name,
-            is_default=card_data.is_default
+            is_default=False
         )
         self.db.add(db_card)
+        
+        # If this is set as default, switch the user's default to it
+        if card_data.is_default:
+            self.db.flush()
+            self._set_default_card(user_id, db_card.id)
+        
         self.db.commit()
         self.db.refresh(db_card)
         return db_card
@@ -51,13 +60,17 @@ class CardRepository:
     def update(self, card: Card, card_data: CardUpdate) -> Card:
         """Update a card."""
         update_data = card_data.model_dump(exclude_unset=True)
-        
-        # If setting as default, unset other default cards
-        if update_data.get('is_default') is True:
-            self._unset_default_cards(card.user_id, exclude_card_id=card.id)
+        is_default = update_data.pop('is_default', None)
         
         for field, value in update_data.items():
             setattr(card, field, value)
+        if is_default is False:
+            card.is_default = False
+        
+        # If setting as default, switch the user's default to this card
+        if is_default:
+            self.db.flush()
+            self._set_default_card(card.user_id, card.id)
         
         self.db.commit()
         self.db.refresh(card)
@@ -68,17 +81,19 @@ class CardRepository:
         self.db.delete(card)
         self.db.commit()
 
-    def _unset_default_cards(self, user_id: int, exclude_card_id: Optional[int] = None) -> None:
-        """Unset all default cards for a user, optionally excluding a specific card."""
-        query = self.db.query(Card).filter(
-            Card.user_id == user_id,
-            Card.is_default == True
-        )
-        if exclude_card_id:
-            query = query.filter(Card.id != exclude_card_id)
+    def _set_default_card(self, user_id: int, card_id: int) -> None:
+        """
+        Make card_id the user's only default card in one statement (committed by the caller).
         
-        default_cards = query.all()
-        for card in default_cards:
-            card.is_default = False
-        self.db.commit()
+        Only the current default and the new one are touched, so other cards
+        keep their updated_at. A concurrent switch to a card this statement
+        can't see fails the one-default constraint with an IntegrityError;
+        CardService retries it.
+        """
+        self.db.execute(
+            update(Card)
+            .where(Card.user_id == user_id, or_(Card.is_default, Card.id == card_id))
+            .values(is_default=(Card.id == card_id)),
+            execution_options={"synchronize_session": False},
+        )
 
@@ -0,0 +1,87 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text, update
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
+from app.models.archive import PaymentArchive
+from app.models.payment import Payment
+from app.models.vendor_heatmap import VendorHeatmap
+
+# Vendor payments as (vendor_id, seconds since 1970-01-01 in campus local time),
+# including payments archive_records.py has moved to payments_archive
+_PAYMENT_TIMES_SQL = text("""
+    SELECT vendor_id,
+           extract(epoch FROM created_at AT TIME ZONE :timezone)::bigint AS local_epoch
+    FROM payments
+    WHERE vendor_id IS NOT NULL AND id > :after_id AND id <= :through_id
+    UNION ALL
+    SELECT vendor_id,
+           extract(epoch FROM created_at AT TIME ZONE :timezone)::bigint AS local_epoch
+    FROM payments_archive
+    WHERE vendor_id IS NOT NULL AND id > :after_id AND id <= :through_id
+""")
+
+
+class HeatmapRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, vendor_id: int) -> Optional[VendorHeatmap]:
+        """Get a vendor's heatmap row."""
+        return self.db.query(VendorHeatmap).filter(VendorHeatmap.vendor_id == vendor_id).first()
+
+    def lock(self) -> None:
+        """Serialize heatmap builds for the rest of the transaction."""
+        self.db.execute(text("SELECT pg_advisory_xact_lock(hashtext('vendor_heatmaps'))"))
+
+    def get_watermark(self) -> int:
+        """Highest payment ID already counted into the heatmaps (0 if never built)."""
+        return self.db.query(func.coalesce(func.max(VendorHeatmap.through_payment_id), 0)).scalar()
+
+    def get_settled_payment_id(self, created_before: datetime) -> int:
+        """Highest payment ID, hot or archived, created before the cutoff (0 if none)."""
+        hot = self.db.query(func.coalesce(func.max(Payment.id), 0)).filter(
+            Payment.created_at < created_before
+        ).scalar()
+        archived = self.db.query(func.coalesce(func.max(PaymentArchive.id), 0)).filter(
+            PaymentArchive.created_at < created_before
+        ).scalar()
+        return max(hot, archived)
+
+    def iter_payment_times(
+        self, after_id: int, through_id: int, timezone: str, chunk_size: int
+    ) -> Iterator[List]:
+        """
+        Stream (vendor_id, local_epoch) rows for payments in (after_id, through_id],
+        hot or archived, through a server-side cursor, chunk_size rows at a time.
+        """
+        result = self.db.execute(
+            _PAYMENT_TIMES_SQL,
+            {"after_id": after_id, "through_id": through_id, "timezone": timezone},
+            execution_options={"yield_per": chunk_size},
+        )
+        yield from result.partitions()
+
+    def get_counts_for_update(self, vendor_ids: List[int]) -> Dict[int, List[int]]:
+        """Get and lock existing heatmap counts for the given vendors."""
+        rows = self.db.query(VendorHeatmap.vendor_id, VendorHeatmap.counts).filter(
+            VendorHeatmap.vendor_id.in_(vendor_ids)
+        ).with_for_update().all()
+        return {vendor_id: counts for vendor_id, counts in rows}
+
+    def save(self, counts_by_vendor: Dict[int, List[int]], through_payment_id: int) -> None:
+        """Upsert heatmap counts and advance every heatmap's watermark (committed by the caller)."""
+        if counts_by_vendor:
+            statement = insert(VendorHeatmap).values([
+                {"vendor_id": vendor_id, "counts": counts, "through_payment_id": through_payment_id}
+                for vendor_id, counts in counts_by_vendor.items()
+            ])
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=[VendorHeatmap.vendor_id],
+                set_={"counts": statement.excluded.counts, "updated_at": func.now()},
+            ))
+        self.db.execute(update(VendorHeatmap).values(through_payment_id=through_payment_id))
+
+    def delete_all(self) -> None:
+        """Delete every heatmap (committed by the caller)."""
+        self.db.query(VendorHeatmap).delete(synchronize_session=False)
@@ -0,0 +1,51 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, Tuple
+from datetime import datetime
+from app.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: int, scope: str, key: str) -> Optional[IdempotencyKey]:
+        """Get an idempotency record by user, scope and key."""
+        return self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+        ).first()
+
+    def reserve(
+        self, user_id: int, scope: str, key: str, request_hash: str
+    ) -> Tuple[IdempotencyKey, bool]:
+        """
+        Claim a key by inserting its record (flushed, committed by the caller
+        together with the response). Returns the record and whether it was
+        created by this call; if the unique index rejects the insert, the
+        transaction is rolled back and the existing record is returned.
+        """
+        record = IdempotencyKey(
+            user_id=user_id,
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+        )
+        self.db.add(record)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            return self.get(user_id, scope, key), False
+        return record, True
+
+    def delete_expired(self, created_before: datetime, batch_size: int) -> int:
+        """Delete up to batch_size keys created before the cutoff and commit. Returns the number deleted."""
+        expired = select(IdempotencyKey.id).where(
+            IdempotencyKey.created_at < created_before
+        ).limit(batch_size).scalar_subquery()
+        result = self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired)))
+        self.db.commit()
+        return result.rowcount
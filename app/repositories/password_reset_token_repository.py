@@ -0,0 +1,44 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+from typing import Optional
+from datetime import datetime, timezone
+from app.models.password_reset_token import PasswordResetToken
+
+
+class PasswordResetTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_unexpired(self, token_hash: str) -> Optional[PasswordResetToken]:
+        """Get a reset token by hash if it hasn't expired."""
+        return self.db.query(PasswordResetToken).filter(
+            PasswordResetToken.token_hash == token_hash,
+            PasswordResetToken.expires_at > datetime.now(timezone.utc)
+        ).first()
+
+    def add(self, user_id: int, token_hash: str, expires_at: datetime) -> PasswordResetToken:
+        """Stage a new reset token (committed by the caller)."""
+        db_token = PasswordResetToken(
+            token_hash=token_hash,
+            user_id=user_id,
+            expires_at=expires_at,
+        )
+        self.db.add(db_token)
+        return db_token
+
+    def delete_all_for_user(self, user_id: int) -> None:
+        """Delete every reset token of a user (committed by the caller)."""
+        self.db.query(PasswordResetToken).filter(
+            PasswordResetToken.user_id == user_id
+        ).delete(synchronize_session=False)
+
+    def delete_expired(self, batch_size: int) -> int:
+        """Delete up to batch_size expired tokens and commit. Returns the number deleted."""
+        expired = select(PasswordResetToken.token_hash).where(
+            PasswordResetToken.expires_at <= datetime.now(timezone.utc)
+        ).limit(batch_size).scalar_subquery()
+        result = self.db.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.token_hash.in_(expired))
+        )
+        self.db.commit()
+        return result.rowcount
@@ -1,9 +1,21 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
 from typing import Optional, List
 from app.models.payment import Payment, PaymentStatus, PaymentType
 from app.schemas.payment import PaymentCreate, PaymentUpdate
 
+# Columns needed to serialize a payment in list responses
+LIST_COLUMNS = (
+    Payment.id,
+    Payment.user_id,
+    Payment.payment_type,
+    Payment.amount,
+    Payment.description,
+    Payment.status,
+    Payment.created_at,
+    Payment.updated_at,
+)
+
 
 class PaymentRepository:
     def __init__(self, db: Session):
@@ -33,6 +45,41 @@ class PaymentRepository:
 
         return query.order_by(Payment.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_all_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[PaymentStatus] = None,
+        payment_type: Optional[PaymentType] = None,
+    ) -> List:
+        """Get payments for a user as read-only column rows (no ORM entities)."""
+        query = select(*LIST_COLUMNS).where(Payment.user_id == user_id)
+
+        if status:
+            query = query.where(Payment.status == status)
+        if payment_type:
+            query = query.where(Payment.payment_type == payment_type)
+
+        query = query.order_by(Payment.created_at.desc()).offset(skip).limit(limit)
+        return self.db.execute(query).all()
+
+    def count(
+        self,
+        user_id: int,
+        status: Optional[PaymentStatus] = None,
+        payment_type: Optional[PaymentType] = None,
+    ) -> int:
+        """Count payments for a user with optional filters."""
+        query = self.db.query(func.count(Payment.id)).filter(Payment.user_id == user_id)
+
+        if status:
+            query = query.filter(Payment.status == status)
+        if payment_type:
+            query = query.filter(Payment.payment_type == payment_type)
+
+        return query.scalar()
+
     def create(self, user_id: int, payment_data: PaymentCreate) -> Payment:
         """Create a new payment."""
         db_payment = Payment(
@@ -44,6 +91,16 @@ class PaymentRepository:
         self.db.refresh(db_payment)
         return db_payment
 
+    def add(self, user_id: int, payment_data: PaymentCreate) -> Payment:
+        """Stage a new payment and assign its ID (committed by the caller)."""
+        db_payment = Payment(
+            user_id=user_id,
+            **payment_data.model_dump()
+        )
+        self.db.add(db_payment)
+        self.db.flush()
+        return db_payment
+
     def update(self, payment: Payment, payment_data: PaymentUpdate) -> Payment:
         """Update a payment."""
         update_data = payment_data.model_dump(exclude_unset=True)
@@ -0,0 +1,46 @@
+from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import select, delete
+from datetime import datetime, timezone
+from app.models.refresh_token import RefreshToken
+
+
+class RefreshTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_hash_for_update(self, token_hash: str) -> Optional[RefreshToken]:
+        """Get a refresh token by hash, locking it against concurrent rotation."""
+        return self.db.query(RefreshToken).filter(
+            RefreshToken.token_hash == token_hash
+        ).with_for_update().first()
+
+    def add(self, user_id: int, token_hash: str, expires_at: datetime) -> RefreshToken:
+        """Stage a new refresh token (committed by the caller)."""
+        db_token = RefreshToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            expires_at=expires_at,
+        )
+        self.db.add(db_token)
+        return db_token
+
+    def revoke_all_for_user(self, user_id: int) -> None:
+        """Revoke every active refresh token of a user (committed by the caller)."""
+        self.db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({RefreshToken.revoked_at: datetime.now(timezone.utc)}, synchronize_session=False)
+
+    def delete_expired(self, batch_size: int) -> int:
+        """
+        Delete up to batch_size expired tokens and commit. Returns the number
+        deleted. Revoked tokens are kept until they expire so reuse of a
+        rotated token is still detected.
+        """
+        expired = select(RefreshToken.id).where(
+            RefreshToken.expires_at <= datetime.now(timezone.utc)
+        ).limit(batch_size).scalar_subquery()
+        result = self.db.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired)))
+        self.db.commit()
+        return result.rowcount
@@ -1,10 +1,52 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import Optional, List
-from datetime import datetime, date
-from app.models.transaction import Transaction, TransactionCategory
+from sqlalchemy import func, and_, select, cast, text, Date
+from typing import Optional, List, Iterator
+from datetime import datetime, date, timezone
+from app.models.transaction import Transaction, TransactionCategory, TransactionSource
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
 
+# Columns needed to serialize a transaction in list responses
+LIST_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.amount,
+    Transaction.category,
+    Transaction.merchant,
+    Transaction.location,
+    Transaction.payment_method,
+    Transaction.date,
+    Transaction.description,
+    Transaction.created_at,
+)
+
+# Gap-filled spending series in UTC buckets, as (seconds since 1970-01-01, total);
+# the aggregate is an index-only scan of ix_transactions_user_id_date
+_SPENDING_OVER_TIME_SQL = text("""
+    WITH totals AS (
+        SELECT date_trunc(:granularity, date AT TIME ZONE 'UTC') AS period, sum(amount) AS total
+        FROM transactions
+        WHERE user_id = :user_id
+          AND date >= CAST(:start_date AS timestamp) AT TIME ZONE 'UTC'
+          AND date <= CAST(:end_date AS timestamp) AT TIME ZONE 'UTC'
+        GROUP BY 1
+    )
+    SELECT extract(epoch FROM series.period)::bigint AS period, coalesce(totals.total, 0) AS total
+    FROM generate_series(
+        date_trunc(:granularity, CAST(:start_date AS timestamp)),
+        CAST(:end_date AS timestamp),
+        CAST(:step AS interval)
+    ) AS series(period)
+    LEFT JOIN totals ON totals.period = series.period
+    ORDER BY series.period
+""")
+
+
+def as_utc(value: datetime) -> datetime:
+    """Naive UTC datetime (naive values are taken to be UTC already)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 
 class TransactionRepository:
     def __init__(self, db: Session):
@@ -37,6 +79,47 @@ class TransactionRepository:
 
         return query.order_by(Transaction.date.desc()).offset(skip).limit(limit).all()
 
+    def get_all_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[TransactionCategory] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List:
+        """Get transactions for a user as read-only column rows (no ORM entities)."""
+        query = select(*LIST_COLUMNS).where(Transaction.user_id == user_id)
+
+        if category:
+            query = query.where(Transaction.category == category)
+        if start_date:
+            query = query.where(Transaction.date >= start_date)
+        if end_date:
+            query = query.where(Transaction.date <= end_date)
+
+        query = query.order_by(Transaction.date.desc()).offset(skip).limit(limit)
+        return self.db.execute(query).all()
+
+    def count(
+        self,
+        user_id: int,
+        category: Optional[TransactionCategory] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """Count transactions for a user with optional filters."""
+        query = self.db.query(func.count(Transaction.id)).filter(Transaction.user_id == user_id)
+
+        if category:
+            query = query.filter(Transaction.category == category)
+        if start_date:
+            query = query.filter(Transaction.date >= start_date)
+        if end_date:
+            query = query.filter(Transaction.date <= end_date)
+
+        return query.scalar()
+
     def create(self, user_id: int, transaction_data: TransactionCreate) -> Transaction:
         """Create a new transaction."""
         db_transaction = Transaction(
@@ -48,19 +131,81 @@ class TransactionRepository:
         self.db.refresh(db_transaction)
         return db_transaction
 
+    def add(
+        self,
+        user_id: int,
+        transaction_data: TransactionCreate,
+        source: TransactionSource = TransactionSource.USER,
+    ) -> Transaction:
+        """Stage a new transaction (committed by the caller)."""
+        db_transaction = Transaction(
+            user_id=user_id,
+            source=source,
+            **transaction_data.model_dump()
+        )
+        self.db.add(db_transaction)
+        return db_transaction
+
     def update(self, transaction: Transaction, transaction_data: TransactionUpdate) -> Transaction:
-        """Update a transaction."""
+        """Stage changes to a transaction (committed by the caller)."""
         update_data = transaction_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(transaction, key, value)
-        self.db.commit()
-        self.db.refresh(transaction)
+        self.db.flush()
         return transaction
 
     def delete(self, transaction: Transaction) -> None:
-        """Delete a transaction."""
+        """Stage a transaction's deletion (committed by the caller)."""
         self.db.delete(transaction)
-        self.db.commit()
+        self.db.flush()
+
+    def iter_for_users(
+        self,
+        first_user_id: int,
+        last_user_id: int,
+        since: datetime,
+        sources: List[TransactionSource],
+        chunk_size: int,
+    ) -> Iterator[List]:
+        """
+        Stream (user_id, date, amount, category, source) rows from the given
+        sources dated since `since` for a user_id range, ordered by user and
+        date, through a server-side cursor chunk_size rows at a time.
+        """
+        query = select(
+            Transaction.user_id,
+            Transaction.date,
+            Transaction.amount,
+            Transaction.category,
+            Transaction.source,
+        ).where(
+            Transaction.user_id.between(first_user_id, last_user_id),
+            Transaction.date >= since,
+            Transaction.source.in_(sources),
+        ).order_by(Transaction.user_id, Transaction.date, Transaction.id)
+        result = self.db.execute(query, execution_options={"yield_per": chunk_size})
+        yield from result.partitions()
+
+    def get_total(
+        self,
+        user_id: int,
+        category: Optional[TransactionCategory] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> float:
+        """Get the total amount of a user's transactions with optional filters."""
+        query = self.db.query(func.coalesce(func.sum(Transaction.amount), 0.0)).filter(
+            Transaction.user_id == user_id
+        )
+
+        if category:
+            query = query.filter(Transaction.category == category)
+        if start_date:
+            query = query.filter(Transaction.date >= start_date)
+        if end_date:
+            query = query.filter(Transaction.date <= end_date)
+
+        return query.scalar()
 
     def get_total_by_category(
         self,
@@ -85,28 +230,45 @@ class TransactionRepository:
             for category, total in results
         ]
 
+    def get_daily_totals_by_category(
+        self,
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[tuple]:
+        """Get (day, category, total) for each day and category with spending in [start_date, end_date)."""
+        day = cast(Transaction.date, Date).label("day")
+        return self.db.query(
+            day,
+            Transaction.category,
+            func.sum(Transaction.amount),
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.date >= start_date,
+            Transaction.date < end_date,
+        ).group_by(day, Transaction.category).all()
+
     def get_spending_over_time(
         self,
         user_id: int,
         start_date: datetime,
         end_date: datetime,
-        group_by: str = "day"
+        granularity: str = "day"
     ) -> List[dict]:
-        """Get spending over time grouped by day, week, or month."""
-        query = self.db.query(
-            func.date_trunc(group_by, Transaction.date).label("period"),
-            func.sum(Transaction.amount).label("total")
-        ).filter(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.date >= start_date,
-                Transaction.date <= end_date
-            )
-        ).group_by("period").order_by("period")
-
-        results = query.all()
+        """
+        Get spending over time by day, week (starting Monday) or month, in UTC.
+        Every bucket from start_date through end_date is returned, with 0 for
+        periods without spending; periods are epoch seconds of the bucket start.
+        """
+        results = self.db.execute(_SPENDING_OVER_TIME_SQL, {
+            "user_id": user_id,
+            "start_date": as_utc(start_date),
+            "end_date": as_utc(end_date),
+            "granularity": granularity,
+            "step": f"1 {granularity}",
+        }).all()
         return [
-            {"period": str(period), "total": float(total)}
+            {"period": period, "total": float(total)}
             for period, total in results
         ]
 
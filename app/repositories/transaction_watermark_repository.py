@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from typing import Iterable
+from app.models.transaction_watermark import TransactionWatermark
+
+# Users bumped per statement
+BUMP_CHUNK_SIZE = 1000
+
+
+class TransactionWatermarkRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: int) -> int:
+        """Current watermark of a user's transactions (0 if they never changed)."""
+        version = self.db.query(TransactionWatermark.version).filter(
+            TransactionWatermark.user_id == user_id
+        ).scalar()
+        return version or 0
+
+    def bump(self, user_ids: Iterable[int]) -> None:
+        """
+        Advance the watermark of each user whose transactions changed
+        (committed by the caller, with the change). Users are bumped in ID
+        order so concurrent bulk writes lock their rows in the same order.
+        """
+        user_ids = sorted(set(user_ids))
+        for start in range(0, len(user_ids), BUMP_CHUNK_SIZE):
+            statement = insert(TransactionWatermark).values([
+                {"user_id": user_id, "version": 1}
+                for user_id in user_ids[start:start + BUMP_CHUNK_SIZE]
+            ])
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=[TransactionWatermark.user_id],
+                set_={"version": TransactionWatermark.version + 1},
+            ))
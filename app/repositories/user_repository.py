@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List, Tuple
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -20,9 +20,9 @@ class UserRepository:
         """Get user by student ID."""
         return self.db.query(User).filter(User.student_id == student_id).first()
 
-    def get_by_reset_token(self, reset_token: str) -> Optional[User]:
-        """Get user by reset token."""
-        return self.db.query(User).filter(User.reset_token == reset_token).first()
+    def get_token_versions(self) -> List[Tuple[int, int]]:
+        """Get (user_id, token_version) for every user who has revoked tokens."""
+        return self.db.query(User.id, User.token_version).filter(User.token_version > 0).all()
 
     def create(self, user_data: UserCreate, hashed_password: str) -> User:
         """Create a new user."""
@@ -39,6 +39,20 @@ class UserRepository:
         self.db.refresh(db_user)
         return db_user
 
+    def add(self, user_data: UserCreate, hashed_password: str) -> User:
+        """Stage a new user and assign its ID (committed by the caller)."""
+        db_user = User(
+            email=user_data.email,
+            hashed_password=hashed_password,
+            full_name=user_data.full_name,
+            student_id=user_data.student_id,
+            major=user_data.major,
+            class_year=user_data.class_year,
+        )
+        self.db.add(db_user)
+        self.db.flush()
+        return db_user
+
     def update(self, user: User, **kwargs) -> User:
         """Update user fields."""
         for key, value in kwargs.items():
@@ -1,8 +1,26 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import Optional, List
 from app.models.vendor import Vendor
 from app.schemas.vendor import VendorCreate, VendorUpdate
 
+# Columns needed to serialize a vendor in list responses
+LIST_COLUMNS = (
+    Vendor.id,
+    Vendor.name,
+    Vendor.category,
+    Vendor.description,
+    Vendor.location,
+    Vendor.latitude,
+    Vendor.longitude,
+    Vendor.logo_url,
+    Vendor.hours,
+    Vendor.accepts_raider_card,
+    Vendor.is_active,
+    Vendor.created_at,
+    Vendor.updated_at,
+)
+
 
 class VendorRepository:
     def __init__(self, db: Session):
@@ -12,6 +30,19 @@ class VendorRepository:
         """Get vendor by ID."""
         return self.db.query(Vendor).filter(Vendor.id == vendor_id).first()
 
+    def get_payment_info(self, vendor_id: int):
+        """Get the columns a payment needs (name, category, location, flags) for a vendor."""
+        return self.db.execute(
+            select(
+                Vendor.id,
+                Vendor.name,
+                Vendor.category,
+                Vendor.location,
+                Vendor.accepts_raider_card,
+                Vendor.is_active,
+            ).where(Vendor.id == vendor_id)
+        ).first()
+
     def get_by_name(self, name: str) -> Optional[Vendor]:
         """Get vendor by name."""
         return self.db.query(Vendor).filter(Vendor.name == name).first()
@@ -25,6 +56,23 @@ class VendorRepository:
 
         return query.offset(skip).limit(limit).all()
 
+    def get_all_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        active_only: bool = False,
+        category: Optional[str] = None,
+    ) -> List:
+        """Get vendors as read-only column rows (no ORM entities)."""
+        query = select(*LIST_COLUMNS)
+
+        if category:
+            query = query.where(Vendor.category == category, Vendor.is_active == True)
+        elif active_only:
+            query = query.where(Vendor.is_active == True)
+
+        return self.db.execute(query.offset(skip).limit(limit)).all()
+
     def get_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[Vendor]:
         """Get vendors by category."""
         return self.db.query(Vendor).filter(
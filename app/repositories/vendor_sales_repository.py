@@ -0,0 +1,61 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from typing import List
+from datetime import datetime, timedelta
+from app.models.vendor_sales import VendorSalesCounter
+
+GRANULARITIES = ("hour", "day", "week")
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    """Start of the hour, day or (Monday-based) week containing value."""
+    start = value.replace(minute=0, second=0, microsecond=0)
+    if granularity in ("day", "week"):
+        start = start.replace(hour=0)
+    if granularity == "week":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+class VendorSalesRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def increment(self, vendor_id: int, amount: float, paid_at: datetime) -> None:
+        """
+        Add one payment to the vendor's hour, day and week counters in a single
+        upsert (committed by the caller, inside the payment transaction).
+        """
+        statement = insert(VendorSalesCounter).values([
+            {
+                "vendor_id": vendor_id,
+                "granularity": granularity,
+                "bucket_start": bucket_start(paid_at, granularity),
+                "revenue": amount,
+                "payment_count": 1,
+            }
+            for granularity in GRANULARITIES
+        ])
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[
+                VendorSalesCounter.vendor_id,
+                VendorSalesCounter.granularity,
+                VendorSalesCounter.bucket_start,
+            ],
+            set_={
+                "revenue": VendorSalesCounter.revenue + statement.excluded.revenue,
+                "payment_count": VendorSalesCounter.payment_count + 1,
+            },
+        ))
+
+    def get_buckets(self, vendor_id: int, granularity: str, since: datetime) -> List:
+        """Get (bucket_start, revenue, payment_count) rows from since onward, oldest first."""
+        return self.db.query(
+            VendorSalesCounter.bucket_start,
+            VendorSalesCounter.revenue,
+            VendorSalesCounter.payment_count,
+        ).filter(
+            VendorSalesCounter.vendor_id == vendor_id,
+            VendorSalesCounter.granularity == granularity,
+            VendorSalesCounter.bucket_start >= since,
+        ).order_by(VendorSalesCounter.bucket_start).all()
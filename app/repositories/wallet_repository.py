@@ -1,6 +1,80 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional, Iterator, List, Tuple
+from datetime import datetime
 from app.models.wallet import Wallet
+from app.models.user import User
+from app.models.transaction import TransactionCategory, PaymentMethod, TransactionSource
+
+# Balance (NULLs without a wallet) for each of a sorted list of user IDs, in order
+_BALANCES_SQL = text("""
+    SELECT ids.user_id, w.balance, w.updated_at
+    FROM unnest(CAST(:user_ids AS integer[])) AS ids(user_id)
+    LEFT JOIN wallets w ON w.user_id = ids.user_id
+    ORDER BY ids.user_id
+""")
+
+# Card ownership check, balance increment and ledger insert in one statement.
+# Returns exactly one row: card_found, plus the updated wallet when the card
+# belongs to the user and the wallet exists (NULLs otherwise).
+_LOAD_FROM_CARD_SQL = text("""
+    WITH card AS (
+        SELECT card_type, card_number FROM cards
+        WHERE id = :card_id AND user_id = :user_id
+    ), wallet AS (
+        UPDATE wallets w
+        SET balance = round((w.balance + :amount)::numeric, 2)::double precision,
+            updated_at = now()
+        FROM card
+        WHERE w.user_id = :user_id
+        RETURNING w.id, w.user_id, w.balance, w.created_at, w.updated_at,
+                  card.card_type, card.card_number
+    ), ledger AS (
+        INSERT INTO transactions
+            (user_id, amount, category, merchant, payment_method, date, description, source)
+        SELECT user_id, :amount, CAST(:category AS transactioncategory), :merchant,
+               CAST(:payment_method AS paymentmethod), :date,
+               format('Loaded $%s from %s card ending in %s',
+                      to_char(CAST(:amount AS numeric), 'FM999999990.00'),
+                      lower(card_type::text), card_number),
+               CAST(:source AS transactionsource)
+        FROM wallet
+    )
+    SELECT EXISTS (SELECT 1 FROM card) AS card_found,
+           wallet.id, wallet.user_id, wallet.balance, wallet.created_at, wallet.updated_at
+    FROM (SELECT 1) AS one LEFT JOIN wallet ON true
+""")
+
+
+# Credits one chunk of (row_num, user_id, amount, memo) rows: amounts are summed
+# per user for the balance update, and each row gets its own ledger transaction.
+# Returns the row_nums that weren't applied because the user has no wallet.
+_BULK_CREDIT_SQL = """
+    WITH credits AS (
+        SELECT row_num::integer AS row_num, user_id::integer AS user_id,
+               amount::numeric AS amount, memo::text AS memo
+        FROM (VALUES {values}) AS v (row_num, user_id, amount, memo)
+    ), totals AS (
+        SELECT user_id, sum(amount) AS amount FROM credits GROUP BY user_id
+    ), credited AS (
+        UPDATE wallets w
+        SET balance = round((w.balance + t.amount)::numeric, 2)::double precision,
+            updated_at = now()
+        FROM totals t
+        WHERE w.user_id = t.user_id
+        RETURNING w.user_id
+    ), ledger AS (
+        INSERT INTO transactions
+            (user_id, amount, category, merchant, payment_method, date, description, source)
+        SELECT c.user_id, c.amount, CAST(:category AS transactioncategory), :merchant,
+               CAST(:payment_method AS paymentmethod), :date, c.memo,
+               CAST(:source AS transactionsource)
+        FROM credits c JOIN credited USING (user_id)
+    )
+    SELECT row_num FROM credits
+    WHERE user_id NOT IN (SELECT user_id FROM credited)
+"""
 
 
 class WalletRepository:
@@ -13,16 +87,103 @@ class WalletRepository:
             Wallet.user_id == user_id
         ).first()
 
-    def create(self, user_id: int) -> Wallet:
-        """Create a new wallet for a user."""
-        db_wallet = Wallet(
-            user_id=user_id,
-            balance=0.0
+    def iter_balances(self, user_ids: List[int], chunk_size: int = 1000) -> Iterator[Tuple[int, float, datetime]]:
+        """
+        Stream (user_id, balance, updated_at) for the given users, ordered by
+        user_id, chunk_size rows at a time from a server-side cursor; balance
+        and updated_at are None for users without a wallet. The IDs are sent
+        as one array parameter.
+        """
+        result = self.db.execute(
+            _BALANCES_SQL, {"user_ids": user_ids}, execution_options={"yield_per": chunk_size}
         )
-        self.db.add(db_wallet)
-        self.db.commit()
-        self.db.refresh(db_wallet)
-        return db_wallet
+        for partition in result.partitions():
+            yield from partition
+
+    def get_float_snapshot(self) -> Tuple[float, int, datetime]:
+        """Get (total balance, wallet count, snapshot time) across all wallets in one statement."""
+        return self.db.query(
+            func.coalesce(func.sum(Wallet.balance), 0.0),
+            func.count(Wallet.id),
+            func.now(),
+        ).one()
+
+    def get_user_id_buckets(self, bucket_size: int) -> List[int]:
+        """Get the distinct user_id // bucket_size values that have at least one wallet, ascending."""
+        bucket = (Wallet.user_id // bucket_size).label("bucket")
+        return list(self.db.scalars(select(bucket).distinct().order_by(bucket)))
+
+    def get_accounts(self, first_user_id: int, last_user_id: int) -> List[Tuple[int, str, str, float]]:
+        """Get (user_id, full_name, email, balance) for wallets in a user_id range, ordered by user_id."""
+        return self.db.query(User.id, User.full_name, User.email, Wallet.balance).join(
+            Wallet, Wallet.user_id == User.id
+        ).filter(
+            Wallet.user_id.between(first_user_id, last_user_id)
+        ).order_by(Wallet.user_id).all()
+
+    def get_or_create(self, user_id: int) -> Wallet:
+        """
+        Get a user's wallet, creating an empty one if missing (committed by the caller).
+        
+        Uses INSERT ... ON CONFLICT DO NOTHING RETURNING, so concurrent callers
+        never fail on the unique user_id; the one that loses the race reads the
+        winner's row.
+        """
+        wallet = self.db.scalars(
+            insert(Wallet)
+            .values(user_id=user_id, balance=0.0)
+            .on_conflict_do_nothing(index_elements=[Wallet.user_id])
+            .returning(Wallet)
+        ).first()
+        if wallet is None:
+            wallet = self.get_by_user_id(user_id)
+        return wallet
+
+    def load_from_card(
+        self, user_id: int, card_id: int, amount: float, date: datetime, merchant: str
+    ):
+        """
+        Credit a wallet from one of the user's cards and record the ledger
+        transaction in a single statement (committed by the caller).
+        
+        Returns a row with card_found and the updated wallet columns; the
+        wallet columns are None if the card isn't the user's or the user has
+        no wallet, in which case nothing was written.
+        """
+        return self.db.execute(_LOAD_FROM_CARD_SQL, {
+            "user_id": user_id,
+            "card_id": card_id,
+            "amount": amount,
+            "date": date,
+            "merchant": merchant,
+            "category": TransactionCategory.SERVICES.name,
+            "payment_method": PaymentMethod.CARD.name,
+            "source": TransactionSource.WALLET_LOAD.name,
+        }).one()
+
+    def bulk_credit(
+        self, credits: List[Tuple[int, int, float, str]], date: datetime, merchant: str
+    ) -> List[int]:
+        """
+        Credit many wallets and insert their ledger transactions in one
+        statement (committed by the caller).
+        
+        credits are (row_num, user_id, amount, memo) tuples. Returns the
+        row_nums that were skipped because the user has no wallet.
+        """
+        params = {
+            "date": date,
+            "merchant": merchant,
+            "category": TransactionCategory.SERVICES.name,
+            "payment_method": PaymentMethod.CAMPUS_CARD.name,
+            "source": TransactionSource.DISBURSEMENT.name,
+        }
+        placeholders = []
+        for i, (row_num, user_id, amount, memo) in enumerate(credits):
+            placeholders.append(f"(:r{i}, :u{i}, :a{i}, :m{i})")
+            params.update({f"r{i}": row_num, f"u{i}": user_id, f"a{i}": amount, f"m{i}": memo})
+        statement = text(_BULK_CREDIT_SQL.format(values=", ".join(placeholders)))
+        return list(self.db.execute(statement, params).scalars())
 
     def update_balance(self, wallet: Wallet, amount: float) -> Wallet:
         """Add amount to wallet balance (atomic operation)."""
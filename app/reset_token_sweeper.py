@@ -0,0 +1,103 @@
+import logging
+import threading
+from app.config import settings
+from app.database import SessionLocal
+from datetime import datetime, timedelta, timezone
+from app.repositories.password_reset_token_repository import PasswordResetTokenRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ResetTokenSweeper:
+    """
+    Background thread that deletes expired password reset tokens, so the
+    table and its indexes only hold tokens that can still be redeemed,
+    expired refresh tokens (revoked or not), and idempotency keys older
+    than IDEMPOTENCY_KEY_TTL_HOURS.
+    Deletes in small batches to keep each transaction short.
+    """
+
+    def __init__(self, interval_seconds: int, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sweep(self) -> int:
+        """Delete all expired tokens. Returns the number deleted."""
+        db = SessionLocal()
+        try:
+            repo = PasswordResetTokenRepository(db)
+            return self._delete_in_batches(lambda: repo.delete_expired(self.batch_size))
+        finally:
+            db.close()
+
+    def sweep_refresh_tokens(self) -> int:
+        """Delete expired refresh tokens. Returns the number deleted."""
+        db = SessionLocal()
+        try:
+            repo = RefreshTokenRepository(db)
+            return self._delete_in_batches(lambda: repo.delete_expired(self.batch_size))
+        finally:
+            db.close()
+
+    def sweep_idempotency_keys(self) -> int:
+        """Delete idempotency keys past their TTL. Returns the number deleted."""
+        created_before = datetime.now(timezone.utc) - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        db = SessionLocal()
+        try:
+            repo = IdempotencyRepository(db)
+            return self._delete_in_batches(lambda: repo.delete_expired(created_before, self.batch_size))
+        finally:
+            db.close()
+
+    def _delete_in_batches(self, delete_batch) -> int:
+        """Run delete_batch until it deletes less than a full batch."""
+        total = 0
+        while not self._stop.is_set():
+            deleted = delete_batch()
+            total += deleted
+            if deleted < self.batch_size:
+                break
+        return total
+
+    def start(self) -> None:
+        """Start the background sweep thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reset-token-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background sweep thread."""
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                deleted = self.sweep()
+                if deleted:
+                    logger.info("Deleted %d expired password reset tokens", deleted)
+            except Exception:
+                logger.warning("Password reset token sweep failed", exc_info=True)
+            try:
+                deleted = self.sweep_refresh_tokens()
+                if deleted:
+                    logger.info("Deleted %d expired refresh tokens", deleted)
+            except Exception:
+                logger.warning("Refresh token sweep failed", exc_info=True)
+            try:
+                deleted = self.sweep_idempotency_keys()
+                if deleted:
+                    logger.info("Deleted %d expired idempotency keys", deleted)
+            except Exception:
+                logger.warning("Idempotency key sweep failed", exc_info=True)
+
+
+reset_token_sweeper = ResetTokenSweeper(
+    settings.PASSWORD_RESET_SWEEP_SECONDS, settings.PASSWORD_RESET_SWEEP_BATCH_SIZE
+)
@@ -2,15 +2,19 @@ from app.schemas.user import User, UserCreate, UserResponse
 from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionResponse
 from app.schemas.budget import Budget, BudgetCreate, BudgetUpdate, BudgetResponse, BudgetTracking
 from app.schemas.payment import Payment, PaymentCreate, PaymentResponse, PaymentUpdate
-from app.schemas.auth import Token, TokenData, LoginRequest
-from app.schemas.wallet import WalletResponse, WalletLoadRequest
+from app.schemas.auth import Token, TokenData, LoginRequest, RefreshRequest
+from app.schemas.wallet import (
+    WalletResponse, WalletLoadRequest, WalletBalancesRequest, WalletFloatResponse,
+    BulkCreditError, BulkCreditResponse,
+)
 
 __all__ = [
     "User", "UserCreate", "UserResponse",
     "Transaction", "TransactionCreate", "TransactionUpdate", "TransactionResponse",
     "Budget", "BudgetCreate", "BudgetUpdate", "BudgetResponse", "BudgetTracking",
     "Payment", "PaymentCreate", "PaymentResponse", "PaymentUpdate",
-    "Token", "TokenData", "LoginRequest",
-    "WalletResponse", "WalletLoadRequest"
+    "Token", "TokenData", "LoginRequest", "RefreshRequest",
+    "WalletResponse", "WalletLoadRequest", "WalletBalancesRequest", "WalletFloatResponse",
+    "BulkCreditError", "BulkCreditResponse"
 ]
 
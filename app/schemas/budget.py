@@ -10,6 +10,7 @@ class BudgetBase(BaseModel):
     period: BudgetPeriod
     start_date: date
     end_date: date
+    is_recurring: bool = Field(default=False, description="Start the next period automatically when this one ends")
 
 
 class BudgetCreate(BudgetBase):
@@ -22,11 +23,13 @@ class BudgetUpdate(BaseModel):
     period: Optional[BudgetPeriod] = None
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    is_recurring: Optional[bool] = None
 
 
 class BudgetResponse(BudgetBase):
     id: int
     user_id: int
+    previous_budget_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -44,3 +47,35 @@ class BudgetTracking(BudgetResponse):
     percentage_used: float
     status: str  # "under", "over", "at_limit"
 
+
+
+class BudgetForecast(BaseModel):
+    budget_id: int
+    category: str
+    limit_amount: float
+    period: BudgetPeriod
+    start_date: date
+    end_date: date
+    as_of: date
+    method: str = Field(..., description="linear (average daily spend) or ewma (recent days weigh more)")
+    days_elapsed: int
+    days_remaining: int
+    current_spending: float
+    daily_rate: float = Field(..., description="Projected spending per remaining day")
+    projected_spending: float = Field(..., description="Projected spending by end_date")
+    projected_remaining: float
+    projected_percentage: float
+    projected_status: str  # "under", "over", "at_limit"
+    projected_overrun_date: Optional[date] = Field(
+        None, description="Day spending passed (or is projected to pass) the limit"
+    )
+
+
+class BudgetAlertResponse(BaseModel):
+    id: int
+    budget_id: int
+    threshold_percent: int = Field(..., description="Percent of the limit that was reached")
+    spent_amount: float = Field(..., description="Budget spending when the threshold was reached")
+    limit_amount: float
+    created_at: datetime
+    delivered_at: Optional[datetime] = None
@@ -1,9 +1,21 @@
-from pydantic import BaseModel, Field
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+from app.config import settings
 from app.models.transaction import TransactionCategory, PaymentMethod
 
 
+def validate_transaction_date(value: datetime) -> datetime:
+    """Reject dates outside the accepted window around now (naive dates are UTC)."""
+    now = datetime.now(timezone.utc)
+    aware = value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    if aware < now - timedelta(days=settings.TRANSACTION_MAX_AGE_DAYS):
+        raise ValueError(f'Date must be within the last {settings.TRANSACTION_MAX_AGE_DAYS} days')
+    if aware > now + timedelta(days=settings.TRANSACTION_MAX_FUTURE_DAYS):
+        raise ValueError(f'Date must be at most {settings.TRANSACTION_MAX_FUTURE_DAYS} days in the future')
+    return value
+
+
 class TransactionBase(BaseModel):
     amount: float = Field(..., gt=0)
     category: TransactionCategory
@@ -15,7 +27,11 @@ class TransactionBase(BaseModel):
 
 
 class TransactionCreate(TransactionBase):
-    pass
+    @field_validator('date')
+    @classmethod
+    def validate_date(cls, v: datetime) -> datetime:
+        """Validate that the date is within the accepted window."""
+        return validate_transaction_date(v)
 
 
 class TransactionUpdate(BaseModel):
@@ -27,6 +43,12 @@ class TransactionUpdate(BaseModel):
     date: Optional[datetime] = None
     description: Optional[str] = Field(None, max_length=500)
 
+    @field_validator('date')
+    @classmethod
+    def validate_date(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Validate that a new date is within the accepted window."""
+        return v if v is None else validate_transaction_date(v)
+
 
 class TransactionResponse(TransactionBase):
     id: int
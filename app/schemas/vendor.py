@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class VendorBase(BaseModel):
@@ -44,3 +44,29 @@ class VendorResponse(VendorBase):
 
 class Vendor(VendorResponse):
     pass
+
+
+class VendorStatsBucket(BaseModel):
+    bucket_start: datetime
+    revenue: float
+    payment_count: int
+
+
+class VendorStatsResponse(BaseModel):
+    """Payment totals for a vendor over the most recent periods."""
+    vendor_id: int
+    granularity: str
+    buckets: List[VendorStatsBucket] = Field(..., description="One entry per period, oldest first")
+    total_revenue: float
+    total_payments: int
+
+
+class VendorHeatmapResponse(BaseModel):
+    """Payment counts per day of week and hour, in campus local time."""
+    vendor_id: int
+    timezone: str
+    days: List[str]
+    counts: List[List[int]] = Field(..., description="7 rows (Monday first) of 24 hourly counts")
+    total_payments: int
+    through_payment_id: int = Field(..., description="Payments up to this ID are counted")
+    updated_at: Optional[datetime] = None
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
+
+# Largest number of users accepted by one batched balance lookup
+MAX_BALANCE_LOOKUP_IDS = 10000
 
 
 class WalletResponse(BaseModel):
@@ -27,3 +30,34 @@ class WalletLoadRequest(BaseModel):
         # Round to 2 decimal places
         return round(v, 2)
 
+
+
+class WalletBalancesRequest(BaseModel):
+    """Request schema for looking up many wallet balances at once (admin)."""
+    user_ids: List[int] = Field(
+        ..., min_length=1, max_length=MAX_BALANCE_LOOKUP_IDS,
+        description=f"User IDs to look up (at most {MAX_BALANCE_LOOKUP_IDS})"
+    )
+
+
+class WalletFloatResponse(BaseModel):
+    """Response schema for the total float held across all wallets."""
+    total_balance: float = Field(..., description="Sum of all wallet balances")
+    wallet_count: int
+    as_of: datetime = Field(..., description="Database time the snapshot was taken")
+
+
+class BulkCreditError(BaseModel):
+    """A CSV row that could not be credited."""
+    line: int = Field(..., description="Line number in the CSV file (header is line 1)")
+    user_id: Optional[int] = None
+    error: str
+
+
+class BulkCreditResponse(BaseModel):
+    """Response schema for a bulk wallet credit."""
+    credited_rows: int
+    credited_users: int
+    total_amount: float = Field(..., description="Sum of all credited amounts")
+    failed_rows: int
+    errors: List[BulkCreditError]
@@ -4,6 +4,8 @@ from app.services.budget_service import BudgetService
 from app.services.payment_service import PaymentService
 from app.services.card_service import CardService
 from app.services.wallet_service import WalletService
+from app.services.idempotency_service import IdempotencyService
+from app.services.archive_service import ArchiveService
 
 __all__ = [
     "AuthService",
@@ -11,6 +13,8 @@ __all__ = [
     "BudgetService",
     "PaymentService",
     "CardService",
-    "WalletService"
+    "WalletService",
+    "IdempotencyService",
+    "ArchiveService"
 ]
 
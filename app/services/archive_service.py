@@ -0,0 +1,82 @@
+import time
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from app.config import settings
+from app.repositories.archive_repository import ArchiveRepository
+
+# table_name -> (archived_before, monotonic time it was read); lets the read
+# path decide whether to consult the archive without a query per request
+_watermark_cache: dict = {}
+WATERMARK_TTL_SECONDS = 60
+
+
+class ArchiveService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.archive_repo = ArchiveRepository(db)
+
+    @staticmethod
+    def default_cutoff() -> datetime:
+        """Rows older than this are considered cold."""
+        return datetime.now(timezone.utc) - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+
+    def raise_watermark(self, table_name: str, cutoff: datetime) -> bool:
+        """
+        Raise a hot table's archive watermark to cutoff. Returns whether it
+        moved; if so, wait WATERMARK_TTL_SECONDS before calling move_rows so
+        API processes' cached watermarks expire and readers consult the
+        archive before any row disappears from the hot table.
+        """
+        raised = self.archive_repo.set_archived_before(table_name, cutoff)
+        if raised:
+            _watermark_cache.pop(table_name, None)
+        return raised
+
+    def move_rows(
+        self,
+        table_name: str,
+        cutoff: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Move rows older than cutoff from a hot table into its archive table
+        (the watermark must already be at or past cutoff). Each chunk is moved
+        and committed in one statement, so an interrupted run can simply be
+        restarted.
+        """
+        move_batch = {
+            "transactions": self.archive_repo.move_transactions_batch,
+            "payments": self.archive_repo.move_payments_batch,
+        }[table_name]
+        if cutoff is None:
+            cutoff = self.default_cutoff()
+        if batch_size is None:
+            batch_size = settings.ARCHIVE_BATCH_SIZE
+
+        total = 0
+        while True:
+            moved = move_batch(cutoff, batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+
+    def get_archived_before(self, table_name: str) -> Optional[datetime]:
+        """Get the archive watermark for a hot table, cached for a short time."""
+        cached = _watermark_cache.get(table_name)
+        if cached is not None and time.monotonic() - cached[1] < WATERMARK_TTL_SECONDS:
+            return cached[0]
+        archived_before = self.archive_repo.get_archived_before(table_name)
+        _watermark_cache[table_name] = (archived_before, time.monotonic())
+        return archived_before
+
+    def may_contain(self, table_name: str, start_date: Optional[datetime]) -> bool:
+        """Whether rows from start_date onward may have been moved to the archive."""
+        archived_before = self.get_archived_before(table_name)
+        if archived_before is None:
+            return False
+        if start_date is None:
+            return True
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        return start_date < archived_before
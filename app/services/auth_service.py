@@ -1,20 +1,34 @@
+import math
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import jwt
 import bcrypt
+import hashlib
 import secrets
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.repositories.user_repository import UserRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.password_reset_token_repository import PasswordResetTokenRepository
+from app.repositories.wallet_repository import WalletRepository
 from app.schemas.user import UserCreate
 from app.schemas.auth import Token
-from app.exceptions import UnauthorizedError, ValidationError, NotFoundError
+from app.exceptions import UnauthorizedError, ValidationError, NotFoundError, TooManyRequestsError
+from app.rate_limit import login_ip_limiter, login_email_ip_limiter, login_email_limiter, bcrypt_gate
+from app.token_revocation import revocations
+
+# Version of the claim set embedded in access tokens; bump when it changes shape
+TOKEN_CLAIMS_VERSION = 1
 
 
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.user_repo = UserRepository(db)
+        self.refresh_repo = RefreshTokenRepository(db)
+        self.reset_repo = PasswordResetTokenRepository(db)
+        self.wallet_repo = WalletRepository(db)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -47,10 +61,37 @@ class AuthService:
                 password = password_bytes.decode('utf-8', errors='ignore')
         
         # Generate salt and hash using bcrypt directly
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
 
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Check whether a stored hash uses a different cost than BCRYPT_ROUNDS."""
+        # Hashes look like $2b$12$<salt+hash>; the third field is the cost
+        try:
+            return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return False
+
+    @staticmethod
+    def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> list[tuple[int, float]]:
+        """
+        Time a bcrypt verify at each cost from min_rounds upward on this machine.
+        Stops after the first cost slower than target_ms; returns (rounds, ms) pairs.
+        """
+        password_bytes = b"calibration-password"
+        timings = []
+        for rounds in range(min_rounds, max_rounds + 1):
+            hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds))
+            started = time.perf_counter()
+            bcrypt.checkpw(password_bytes, hashed)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            timings.append((rounds, elapsed_ms))
+            if elapsed_ms > target_ms:
+                break
+        return timings
+
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token."""
@@ -64,6 +105,28 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
+    @staticmethod
+    def token_claims(user) -> dict:
+        """Claims that let a request be authorized without loading the user."""
+        return {
+            "sub": str(user.id),
+            "role": user.role.value,
+            "tv": user.token_version,
+            "v": TOKEN_CLAIMS_VERSION,
+        }
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Hash a refresh or reset token for storage and lookup (tokens are random, so SHA-256 suffices)."""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def _issue_refresh_token(self, user_id: int) -> str:
+        """Stage a new refresh token for a user and return its raw value."""
+        refresh_token = secrets.token_urlsafe(32)
+        expires_at = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        self.refresh_repo.add(user_id, self.hash_token(refresh_token), expires_at)
+        return refresh_token
+
     def register(self, user_data: UserCreate) -> tuple[dict, str]:
         """Register a new user."""
         # Check if user already exists
@@ -76,32 +139,112 @@ class AuthService:
         # Hash password
         hashed_password = self.get_password_hash(user_data.password)
 
-        # Create user
-        user = self.user_repo.create(user_data, hashed_password)
+        # Create user and their wallet (committed with the refresh token below,
+        # so a user never exists without a wallet)
+        user = self.user_repo.add(user_data, hashed_password)
+        self.wallet_repo.get_or_create(user.id)
 
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = self.create_access_token(
-            data={"sub": str(user.id)}, expires_delta=access_token_expires
+            data=self.token_claims(user), expires_delta=access_token_expires
         )
+        refresh_token = self._issue_refresh_token(user.id)
+        self.db.commit()
+
+        return {
+            "user": user,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer"
+        }, access_token
 
-        return {"user": user, "access_token": access_token, "token_type": "bearer"}, access_token
+    @staticmethod
+    def check_login_rate(email: str, client_ip: Optional[str]) -> None:
+        """
+        Reject a login attempt over the per-IP, per-(email, IP) or per-email
+        limit before any DB or bcrypt work. Narrower buckets are checked
+        first, so one IP running out its own buckets doesn't also drain the
+        email's shared one.
+        """
+        email = email.strip().lower()
+        checks = [(login_ip_limiter, client_ip)] if client_ip else []
+        checks += [(login_email_ip_limiter, (email, client_ip)), (login_email_limiter, email)]
+        for limiter, key in checks:
+            allowed, retry_after = limiter.hit(key)
+            if not allowed:
+                raise TooManyRequestsError(
+                    "Too many login attempts. Please try again later.",
+                    retry_after=math.ceil(retry_after),
+                )
 
-    def login(self, email: str, password: str) -> Token:
+    def login(self, email: str, password: str, client_ip: Optional[str] = None) -> Token:
         """Authenticate user and return access token."""
+        self.check_login_rate(email, client_ip)
+
         user = self.user_repo.get_by_email(email)
         if not user:
             raise UnauthorizedError("Incorrect email or password")
 
-        if not self.verify_password(password, user.hashed_password):
+        # Shed the attempt with a fast 503 if bcrypt workers are saturated
+        with bcrypt_gate.slot():
+            password_ok = self.verify_password(password, user.hashed_password)
+        if not password_ok:
             raise UnauthorizedError("Incorrect email or password")
 
+        # Move the stored hash to the configured cost while we have the password
+        # (persisted by the commit below)
+        if self.needs_rehash(user.hashed_password):
+            user.hashed_password = self.get_password_hash(password)
+
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = self.create_access_token(
-            data={"sub": str(user.id)}, expires_delta=access_token_expires
+            data=self.token_claims(user), expires_delta=access_token_expires
         )
+        refresh_token = self._issue_refresh_token(user.id)
+        self.db.commit()
+
+        return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+    def refresh(self, refresh_token: str) -> Token:
+        """
+        Exchange a refresh token for a new access token and a new refresh token.
+
+        Costs an indexed hash lookup and a JWT signature instead of a bcrypt
+        verify. The presented token is rotated out; presenting a rotated
+        token again revokes all of the user's refresh tokens.
+        """
+        record = self.refresh_repo.get_by_hash_for_update(self.hash_token(refresh_token))
+        if not record:
+            raise UnauthorizedError("Invalid refresh token")
+
+        now = datetime.now(timezone.utc)
+        if record.revoked_at is not None:
+            # Reuse of a rotated token: assume it leaked and end every session
+            self.refresh_repo.revoke_all_for_user(record.user_id)
+            self.db.commit()
+            raise UnauthorizedError("Invalid refresh token")
+
+        if record.expires_at < now:
+            self.db.rollback()
+            raise UnauthorizedError("Refresh token has expired. Please log in again.")
+
+        user = self.user_repo.get_by_id(record.user_id)
+        if not user:
+            self.db.rollback()
+            raise UnauthorizedError("Invalid refresh token")
 
-        return Token(access_token=access_token, token_type="bearer")
+        # Rotate: retire the presented token and issue its replacement
+        record.revoked_at = now
+        new_refresh_token = self._issue_refresh_token(user.id)
+        self.db.commit()
+
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_token = self.create_access_token(
+            data=self.token_claims(user), expires_delta=access_token_expires
+        )
+
+        return Token(access_token=access_token, token_type="bearer", refresh_token=new_refresh_token)
 
     def forgot_password(self, email: str) -> dict:
         """Generate a password reset token for a user."""
@@ -110,12 +253,12 @@ class AuthService:
             # Don't reveal if email exists for security
             return {"message": "If the email exists, a password reset link has been sent."}
         
-        # Generate a secure random token
+        # Generate a secure random token; only its hash is stored
         reset_token = secrets.token_urlsafe(32)
-        reset_token_expires = datetime.now(timezone.utc) + timedelta(hours=1)  # Token expires in 1 hour
+        reset_token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
         
-        # Update user with reset token
-        self.user_repo.update(user, reset_token=reset_token, reset_token_expires=reset_token_expires)
+        self.reset_repo.add(user.id, self.hash_token(reset_token), reset_token_expires)
+        self.db.commit()
         
         # In production, you would send an email with the reset token
         # For now, we'll return it in the response (remove this in production!)
@@ -127,26 +270,27 @@ class AuthService:
 
     def reset_password(self, token: str, new_password: str) -> dict:
         """Reset user password using a reset token."""
-        user = self.user_repo.get_by_reset_token(token)
-        if not user:
+        # Expired tokens are rejected here and deleted by the background sweeper
+        reset = self.reset_repo.get_unexpired(self.hash_token(token))
+        if not reset:
             raise ValidationError("Invalid or expired reset token")
         
-        # Check if token has expired
-        if user.reset_token_expires and user.reset_token_expires < datetime.now(timezone.utc):
-            # Clear the expired token
-            self.user_repo.update(user, reset_token=None, reset_token_expires=None)
-            raise ValidationError("Reset token has expired. Please request a new one.")
+        user = self.user_repo.get_by_id(reset.user_id)
+        if not user:
+            raise ValidationError("Invalid or expired reset token")
         
         # Hash the new password
         hashed_password = self.get_password_hash(new_password)
         
-        # Update password and clear reset token
+        # Update password, use up every reset token and revoke previously issued tokens
+        self.reset_repo.delete_all_for_user(user.id)
+        self.refresh_repo.revoke_all_for_user(user.id)
         self.user_repo.update(
             user,
             hashed_password=hashed_password,
-            reset_token=None,
-            reset_token_expires=None
+            token_version=user.token_version + 1
         )
+        revocations.revoke(user.id, user.token_version)
         
         return {"message": "Password has been reset successfully"}
 
@@ -0,0 +1,112 @@
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timezone
+from app.config import settings
+from app.models.transaction import TransactionCategory
+from app.repositories.budget_repository import BudgetRepository
+from app.repositories.budget_alert_repository import BudgetAlertRepository
+from app.repositories.transaction_repository import TransactionRepository
+
+# Percent-of-limit thresholds that produce an alert when first reached
+ALERT_THRESHOLDS = settings.budget_alert_thresholds
+
+# Spends applied per statement
+SPEND_CHUNK_SIZE = 1000
+
+
+def alert_level(spent: float, limit: float) -> int:
+    """Highest alert threshold that spent has reached, or 0."""
+    level = 0
+    for threshold in ALERT_THRESHOLDS:
+        if spent * 100 >= limit * threshold:
+            level = threshold
+    return level
+
+
+def spend_day(value: datetime) -> date:
+    """The day a transaction counts towards budgets (UTC, as the budget date filters compare)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+class BudgetAlertService:
+    """
+    Keeps budgets' running spend current as money is spent and writes an
+    alert to the budget_alerts outbox when a budget first reaches one of
+    the ALERT_THRESHOLDS. Only the budgets a spend falls in are touched.
+    Nothing is committed here: the spend, the running totals and the
+    alerts commit together in the caller's transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.budget_repo = BudgetRepository(db)
+        self.alert_repo = BudgetAlertRepository(db)
+        self.transaction_repo = TransactionRepository(db)
+
+    def record_spend(self, user_id: int, category: TransactionCategory, amount: float, spent_at: datetime) -> int:
+        """Count one transaction towards the user's budgets. Returns the number of alerts written."""
+        return self.record_spends([(user_id, category, amount, spent_at)])
+
+    def record_spends(self, spends: List[Tuple[int, TransactionCategory, float, datetime]]) -> int:
+        """
+        Count many (user_id, category, amount, spent_at) transactions towards
+        their users' budgets, SPEND_CHUNK_SIZE per statement. Returns the
+        number of alerts written.
+        """
+        alerts = []
+        alerted = {}
+        for start in range(0, len(spends), SPEND_CHUNK_SIZE):
+            chunk = [
+                (user_id, category, amount, spend_day(spent_at))
+                for user_id, category, amount, spent_at in spends[start:start + SPEND_CHUNK_SIZE]
+            ]
+            for budget_id, user_id, limit_amount, spent_amount, alerted_percent in self.budget_repo.apply_spends(chunk):
+                level = alert_level(spent_amount, limit_amount)
+                if level > max(alerted_percent, alerted.get(budget_id, 0)):
+                    alerted[budget_id] = level
+                    alerts.append(self._alert(budget_id, user_id, level, spent_amount, limit_amount))
+        if alerts:
+            self.budget_repo.set_alerted_percents(alerted)
+            self.alert_repo.add_many(alerts)
+        return len(alerts)
+
+    def refresh_budget(self, budget, category: Optional[TransactionCategory]) -> int:
+        """
+        Recompute a budget's running spend from its transactions, e.g. after
+        its category, dates or limit changed. Writes an alert if it now sits
+        past a threshold it hadn't alerted on; a lower level re-arms the
+        thresholds above it. Returns the number of alerts written.
+
+        The caller must lock the budget first (BudgetRepository.lock or
+        get_all_for_user(for_update=True)): a spend committing between the
+        sum and the write would otherwise be overwritten. Under the lock the
+        sum sees every spend already added to the running total, and spends
+        not yet added wait and add on top.
+        """
+        spent = self.transaction_repo.get_total(
+            user_id=budget.user_id,
+            category=category,
+            start_date=datetime.combine(budget.start_date, datetime.min.time()),
+            end_date=datetime.combine(budget.end_date, datetime.max.time()),
+        )
+        level = alert_level(spent, budget.limit_amount)
+        written = 0
+        if level > budget.alerted_percent:
+            self.alert_repo.add_many([self._alert(budget.id, budget.user_id, level, spent, budget.limit_amount)])
+            written = 1
+        budget.spent_amount = spent
+        budget.alerted_percent = level
+        return written
+
+    @staticmethod
+    def _alert(budget_id: int, user_id: int, level: int, spent: float, limit: float) -> dict:
+        """Outbox row for a budget reaching a threshold."""
+        return {
+            "budget_id": budget_id,
+            "user_id": user_id,
+            "threshold_percent": level,
+            "spent_amount": round(spent, 2),
+            "limit_amount": limit,
+        }
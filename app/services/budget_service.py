@@ -1,18 +1,61 @@
+import math
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date, datetime
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.cache import CacheBackend, LRUCache
+from app.config import settings
 from app.repositories.budget_repository import BudgetRepository
 from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.budget_alert_repository import BudgetAlertRepository
+from app.repositories.budget_watermark_repository import BudgetWatermarkRepository
+from app.repositories.transaction_watermark_repository import TransactionWatermarkRepository
+from app.services.budget_alert_service import BudgetAlertService, ALERT_THRESHOLDS
+from app.budget_alerts import budget_alert_consumer
 from app.models.transaction import TransactionCategory
-from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetTracking
+from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetTracking, BudgetForecast
 from app.exceptions import NotFoundError
 
+FORECAST_METHODS = ("linear", "ewma")
+
+# Column of the daily spending matrix used by budgets that match no category
+_ALL_CATEGORIES = len(TransactionCategory)
+
+# user_id -> ((transaction watermark, budget watermark, as_of), {method: {budget_id: forecast}});
+# an entry is current while neither watermark has moved, whichever process wrote
+forecast_cache: CacheBackend = LRUCache(maxsize=settings.FORECAST_CACHE_SIZE)
+
+
+def project_daily_rates(
+    series: np.ndarray, elapsed: np.ndarray, half_life_days: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate each budget's daily spending rate from a (budgets x days) matrix
+    of daily spending whose first elapsed[i] days are observed (zeros after).
+
+    Returns (linear, ewma): the plain average over the observed days, and an
+    exponentially weighted average in which a day's weight halves every
+    half_life_days going back from the latest observed day.
+    """
+    days = np.arange(series.shape[1])
+    observed = days < elapsed[:, None]
+    age = np.where(observed, elapsed[:, None] - 1 - days, 0)
+    weights = np.where(observed, 0.5 ** (age / half_life_days), 0.0)
+    weight_sums = weights.sum(axis=1)
+    linear = series.sum(axis=1) / np.maximum(elapsed, 1)
+    ewma = (weights * series).sum(axis=1) / np.where(weight_sums > 0, weight_sums, 1.0)
+    return linear, ewma
+
 
 class BudgetService:
     def __init__(self, db: Session):
         self.db = db
         self.budget_repo = BudgetRepository(db)
         self.transaction_repo = TransactionRepository(db)
+        self.alert_repo = BudgetAlertRepository(db)
+        self.budget_alerts = BudgetAlertService(db)
+        self.transaction_watermarks = TransactionWatermarkRepository(db)
+        self.budget_watermarks = BudgetWatermarkRepository(db)
 
     def get_budgets(self, user_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
         """Get all budgets for a user."""
@@ -35,9 +78,40 @@ class BudgetService:
         tracking = self._calculate_budget_tracking(budget, user_id)
         return tracking
 
+    def get_budget_forecast(self, budget_id: int, user_id: int, method: str = "linear") -> dict:
+        """
+        Project a budget's spending at the end of its period.
+
+        Forecasts for all of the user's budgets are computed together and
+        cached until the user's transaction or budget watermark moves (or the
+        next day).
+        """
+        # Read the watermarks before forecasting: a write landing in between
+        # leaves the entry under older watermarks, so it is recomputed next time
+        version = (
+            self.transaction_watermarks.get(user_id), self.budget_watermarks.get(user_id), date.today()
+        )
+        cached = forecast_cache.get(user_id)
+        if cached is not None and cached[0] == version:
+            forecast = cached[1][method].get(budget_id)
+            if forecast is not None:
+                return forecast
+        
+        # Not cached, stale, or missing the budget (e.g. created after the
+        # entry was cached and not yet visible in the watermark we read)
+        forecasts = self._forecast_budgets(user_id, version[2])
+        forecast_cache.set(user_id, (version, forecasts))
+        forecast = forecasts[method].get(budget_id)
+        if forecast is None:
+            raise NotFoundError("Budget", str(budget_id))
+        return forecast
+
     def create_budget(self, user_id: int, budget_data: BudgetCreate) -> dict:
         """Create a new budget."""
+        # The watermark bump commits with the new budget
+        self.budget_watermarks.bump([user_id])
         budget = self.budget_repo.create(user_id, budget_data)
+        self._refresh_spend(budget)
         return self._budget_to_dict(budget)
 
     def update_budget(
@@ -48,7 +122,9 @@ class BudgetService:
         if not budget:
             raise NotFoundError("Budget", str(budget_id))
         
+        self.budget_watermarks.bump([user_id])
         updated_budget = self.budget_repo.update(budget, budget_data)
+        self._refresh_spend(updated_budget)
         return self._budget_to_dict(updated_budget)
 
     def delete_budget(self, budget_id: int, user_id: int) -> None:
@@ -56,36 +132,143 @@ class BudgetService:
         budget = self.budget_repo.get_by_id(budget_id, user_id)
         if not budget:
             raise NotFoundError("Budget", str(budget_id))
+        self.budget_watermarks.bump([user_id])
         self.budget_repo.delete(budget)
 
+    def roll_over_budgets(self, as_of: Optional[date] = None) -> dict:
+        """
+        Start the next period of every recurring budget that ends on or before
+        as_of (default today), campus-wide.
+        
+        - Each pass is a single INSERT ... SELECT over all budgets, committed
+          on its own, so a re-run after a failure picks up where it stopped
+        - Budgets more than one period behind (the job didn't run) catch up
+          one period per pass
+        """
+        as_of = as_of or date.today()
+        created = passes = 0
+        users = set()
+        while True:
+            rolled = self.budget_repo.roll_over(as_of, ALERT_THRESHOLDS)
+            self.budget_watermarks.bump(rolled)
+            self.db.commit()
+            if not rolled:
+                break
+            passes += 1
+            created += len(rolled)
+            users.update(rolled)
+        return {"created": created, "users": len(users), "passes": passes, "as_of": as_of.isoformat()}
+
+    def get_alerts(self, user_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Get a user's budget alerts, newest first."""
+        alerts = self.alert_repo.get_for_user(user_id, skip, limit)
+        return [self._alert_to_dict(a) for a in alerts]
+
+    def refresh_user_budgets(self, user_id: int) -> None:
+        """
+        Recompute the running spend of all of a user's budgets (after a
+        transaction is edited or removed) and commit, together with the
+        change the caller staged.
+        """
+        alerts = 0
+        for budget in self.budget_repo.get_all_for_user(user_id, for_update=True):
+            alerts += self.budget_alerts.refresh_budget(budget, self._category_filter(budget))
+        self.db.commit()
+        if alerts:
+            budget_alert_consumer.notify()
+
+    def _refresh_spend(self, budget) -> None:
+        """Recompute a created or changed budget's running spend and alert level."""
+        self.budget_repo.lock(budget)
+        alerts = self.budget_alerts.refresh_budget(budget, self._category_filter(budget))
+        self.db.commit()
+        self.db.refresh(budget)
+        if alerts:
+            budget_alert_consumer.notify()
+
     def get_all_budgets_tracking(self, user_id: int) -> List[BudgetTracking]:
         """Get all budgets with tracking information."""
         budgets = self.budget_repo.get_active_budgets(user_id)
         return [self._calculate_budget_tracking(budget, user_id) for budget in budgets]
 
-    def _calculate_budget_tracking(self, budget, user_id: int) -> BudgetTracking:
-        """Calculate budget tracking information."""
-        # Try to match budget category to TransactionCategory enum
-        category_filter = None
+    def _forecast_budgets(self, user_id: int, today: date) -> dict:
+        """
+        Forecast every budget of a user in one pass.
+
+        One query fetches daily spending per category from the earliest budget
+        start through today; the per-budget daily series are then gathered
+        into a (budgets x days) matrix and projected with NumPy, so the cost
+        doesn't grow with a Python loop over days.
+        """
+        budgets = self.budget_repo.get_all_for_user(user_id)
+        forecasts = {method: {} for method in FORECAST_METHODS}
+        if not budgets:
+            return forecasts
+        
+        # Daily spending matrix: one row per day from the earliest start, one
+        # column per category plus a last column for all categories together
+        origin = min(budget.start_date for budget in budgets)
+        observed_days = max((today - origin).days + 1, 1)
+        daily = np.zeros((observed_days, _ALL_CATEGORIES + 1))
+        totals = self.transaction_repo.get_daily_totals_by_category(
+            user_id,
+            start_date=datetime.combine(origin, datetime.min.time()),
+            end_date=datetime.combine(today + timedelta(days=1), datetime.min.time()),
+        )
+        if totals:
+            categories = list(TransactionCategory)
+            day_index = np.array([(day - origin).days for day, _, _ in totals])
+            category_index = np.array([categories.index(category) for _, category, _ in totals])
+            amounts = np.array([total for _, _, total in totals], dtype=float)
+            np.add.at(daily, (day_index, category_index), amounts)
+            np.add.at(daily, (day_index, _ALL_CATEGORIES), amounts)
+        
+        # Per-budget series aligned on each budget's start date
+        offsets = np.array([(budget.start_date - origin).days for budget in budgets])
+        lengths = np.array([max((budget.end_date - budget.start_date).days + 1, 1) for budget in budgets])
+        columns = np.array([
+            _ALL_CATEGORIES if category is None else list(TransactionCategory).index(category)
+            for category in (self._category_filter(budget) for budget in budgets)
+        ])
+        elapsed = np.clip((today - origin).days - offsets + 1, 0, lengths)
+        days = np.arange(lengths.max())
+        rows = np.minimum(offsets[:, None] + days, observed_days - 1)
+        series = np.where(days < elapsed[:, None], daily[rows, columns[:, None]], 0.0)
+        
+        spent = series.sum(axis=1)
+        remaining_days = lengths - elapsed
+        limits = np.array([budget.limit_amount for budget in budgets])
+        # First day cumulative spending passed the limit (for budgets already over)
+        crossed = np.cumsum(series, axis=1) > limits[:, None]
+        first_over = np.where(crossed.any(axis=1), crossed.argmax(axis=1), -1)
+        
+        for method, rates in zip(FORECAST_METHODS, project_daily_rates(
+            series, elapsed, settings.FORECAST_EWMA_HALF_LIFE_DAYS
+        )):
+            projected = spent + rates * remaining_days
+            for i, budget in enumerate(budgets):
+                forecasts[method][budget.id] = self._forecast_to_dict(
+                    budget, method, today, int(elapsed[i]), int(remaining_days[i]),
+                    float(spent[i]), float(rates[i]), float(projected[i]), int(first_over[i]),
+                )
+        return forecasts
+
+    @staticmethod
+    def _category_filter(budget) -> Optional[TransactionCategory]:
+        """The TransactionCategory a budget tracks, or None to track all spending."""
         try:
             # Try to find matching TransactionCategory enum value
             for cat in TransactionCategory:
                 if cat.value.lower() == budget.category.lower():
-                    category_filter = cat
-                    break
+                    return cat
         except (ValueError, AttributeError):
             pass
-        
-        # Get transactions for this budget's category and date range
-        transactions = self.transaction_repo.get_all(
-            user_id=user_id,
-            category=category_filter,
-            start_date=datetime.combine(budget.start_date, datetime.min.time()),
-            end_date=datetime.combine(budget.end_date, datetime.max.time()),
-        )
-        
-        # Calculate current spending
-        current_spending = sum(t.amount for t in transactions)
+        return None
+
+    def _calculate_budget_tracking(self, budget, user_id: int) -> BudgetTracking:
+        """Calculate budget tracking information."""
+        # Running spend, kept current by every payment and load
+        current_spending = budget.spent_amount
         
         # Calculate remaining amount
         remaining_amount = budget.limit_amount - current_spending
@@ -109,6 +292,8 @@ class BudgetService:
             period=budget.period,
             start_date=budget.start_date,
             end_date=budget.end_date,
+            is_recurring=budget.is_recurring,
+            previous_budget_id=budget.previous_budget_id,
             created_at=budget.created_at,
             updated_at=budget.updated_at,
             current_spending=current_spending,
@@ -117,6 +302,67 @@ class BudgetService:
             status=status
         )
 
+    @staticmethod
+    def _forecast_to_dict(
+        budget,
+        method: str,
+        today: date,
+        days_elapsed: int,
+        days_remaining: int,
+        spent: float,
+        rate: float,
+        projected: float,
+        first_over_day: int,
+    ) -> dict:
+        """Build a forecast response for one budget."""
+        projected_cents = round(projected, 2)
+        if projected_cents > budget.limit_amount:
+            projected_status = "over"
+        elif projected_cents == budget.limit_amount:
+            projected_status = "at_limit"
+        else:
+            projected_status = "under"
+        
+        overrun_date = None
+        if first_over_day >= 0:
+            overrun_date = budget.start_date + timedelta(days=first_over_day)
+        elif projected_status == "over" and rate > 0:
+            overrun_date = today + timedelta(days=math.ceil((budget.limit_amount - spent) / rate))
+            overrun_date = min(overrun_date, budget.end_date)
+        
+        return BudgetForecast(
+            budget_id=budget.id,
+            category=budget.category,
+            limit_amount=budget.limit_amount,
+            period=budget.period,
+            start_date=budget.start_date,
+            end_date=budget.end_date,
+            as_of=today,
+            method=method,
+            days_elapsed=days_elapsed,
+            days_remaining=days_remaining,
+            current_spending=round(spent, 2),
+            daily_rate=round(rate, 2),
+            projected_spending=projected_cents,
+            projected_remaining=round(budget.limit_amount - projected, 2),
+            projected_percentage=round(projected / budget.limit_amount * 100, 2) if budget.limit_amount > 0 else 0,
+            projected_status=projected_status,
+            projected_overrun_date=overrun_date,
+        ).model_dump(mode="json")
+
+    @staticmethod
+    def _alert_to_dict(alert) -> dict:
+        """Convert budget alert model to dictionary."""
+        return {
+            "id": alert.id,
+            "budget_id": alert.budget_id,
+            "threshold_percent": alert.threshold_percent,
+            "spent_amount": alert.spent_amount,
+            "limit_amount": alert.limit_amount,
+            "created_at": alert.created_at.isoformat(),
+            "delivered_at": alert.delivered_at.isoformat() if alert.delivered_at else None,
+        }
+
     @staticmethod
     def _budget_to_dict(budget) -> dict:
         """Convert budget model to dictionary."""
@@ -128,6 +374,8 @@ class BudgetService:
             "period": budget.period.value,
             "start_date": budget.start_date.isoformat(),
             "end_date": budget.end_date.isoformat(),
+            "is_recurring": budget.is_recurring,
+            "previous_budget_id": budget.previous_budget_id,
             "created_at": budget.created_at.isoformat(),
             "updated_at": budget.updated_at.isoformat(),
         }
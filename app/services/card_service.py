@@ -1,8 +1,23 @@
+import time
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import Callable, List
+from app.cache import CacheBackend, LRUCache
+from app.config import settings
 from app.repositories.card_repository import CardRepository
 from app.schemas.card import CardCreate, CardUpdate
-from app.exceptions import NotFoundError
+from app.exceptions import NotFoundError, ConflictError
+
+
+# Constraint that allows one default card per user
+ONE_DEFAULT_CONSTRAINT = "uq_cards_one_default_per_user"
+
+# Attempts at a card write that loses a race to switch the default card
+DEFAULT_SWITCH_ATTEMPTS = 2
+
+# user_id -> (expires_at, serialized cards); every card write invalidates the
+# user's entry, the TTL bounds staleness in other processes
+card_cache: CacheBackend = LRUCache(maxsize=settings.CARD_CACHE_SIZE)
 
 
 class CardService:
@@ -11,9 +26,14 @@ class CardService:
         self.card_repo = CardRepository(db)
 
     def get_cards(self, user_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all cards for a user."""
-        cards = self.card_repo.get_all(user_id, skip, limit)
-        return [self._card_to_dict(c) for c in cards]
+        """Get all cards for a user (served from the per-user card cache when possible)."""
+        cached = card_cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            cards = cached[1]
+        else:
+            cards = [self._card_to_dict(c) for c in self.card_repo.get_all_for_user(user_id)]
+            card_cache.set(user_id, (time.monotonic() + settings.CARD_CACHE_TTL_SECONDS, cards))
+        return cards[skip:skip + limit]
 
     def get_card(self, card_id: int, user_id: int) -> dict:
         """Get a single card by ID."""
@@ -24,7 +44,8 @@ class CardService:
 
     def create_card(self, user_id: int, card_data: CardCreate) -> dict:
         """Create a new card."""
-        card = self.card_repo.create(user_id, card_data)
+        card = self._write_card(lambda: self.card_repo.create(user_id, card_data))
+        card_cache.delete(user_id)
         return self._card_to_dict(card)
 
     def update_card(self, card_id: int, user_id: int, card_data: CardUpdate) -> dict:
@@ -33,7 +54,8 @@ class CardService:
         if not card:
             raise NotFoundError("Card", str(card_id))
         
-        updated_card = self.card_repo.update(card, card_data)
+        updated_card = self._write_card(lambda: self.card_repo.update(card, card_data))
+        card_cache.delete(user_id)
         return self._card_to_dict(updated_card)
 
     def delete_card(self, card_id: int, user_id: int) -> None:
@@ -42,6 +64,22 @@ class CardService:
         if not card:
             raise NotFoundError("Card", str(card_id))
         self.card_repo.delete(card)
+        card_cache.delete(user_id)
+
+    def _write_card(self, write: Callable):
+        """
+        Run a card write, retrying it if a concurrent default switch won the
+        one-default constraint (the retry switches from the winner's card).
+        Raises ConflictError if it keeps losing.
+        """
+        for _ in range(DEFAULT_SWITCH_ATTEMPTS):
+            try:
+                return write()
+            except IntegrityError as e:
+                self.db.rollback()
+                if getattr(getattr(e.orig, "diag", None), "constraint_name", None) != ONE_DEFAULT_CONSTRAINT:
+                    raise
+        raise ConflictError("The default card was changed by another request; please retry")
 
     @staticmethod
     def _card_to_dict(card) -> dict:
@@ -0,0 +1,123 @@
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+import numpy as np
+from sqlalchemy.orm import Session
+from app.cache import CacheBackend, LRUCache
+from app.config import settings
+from app.repositories.heatmap_repository import HeatmapRepository
+from app.services.vendor_service import VendorService
+from app.exceptions import NotFoundError
+
+DAYS_OF_WEEK = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HEATMAP_CELLS = 7 * 24
+
+# vendor_id -> (expires_at, serialized heatmap); refresh() invalidates vendors it touches
+heatmap_cache: CacheBackend = LRUCache(maxsize=settings.HEATMAP_CACHE_SIZE)
+
+
+def bin_payment_times(rows: List) -> Dict[int, np.ndarray]:
+    """
+    Bin (vendor_id, local_epoch) rows into a 168-cell (day of week x hour)
+    count array per vendor, without a Python loop over rows.
+    """
+    # fromiter over the flattened rows; np.asarray on a list of result rows
+    # falls back to a generic per-element path that is orders of magnitude slower
+    data = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=np.int64, count=2 * len(rows)
+    ).reshape(-1, 2)
+    vendor_ids, local_epoch = data[:, 0], data[:, 1]
+    # 1970-01-01 was a Thursday; shift so Monday is day 0
+    day_of_week = (local_epoch // 86400 + 3) % 7
+    hour = (local_epoch % 86400) // 3600
+    keys, counts = np.unique(vendor_ids * HEATMAP_CELLS + day_of_week * 24 + hour, return_counts=True)
+
+    key_vendors = keys // HEATMAP_CELLS
+    grids = {}
+    for vendor_id in np.unique(key_vendors):
+        in_vendor = key_vendors == vendor_id
+        grid = np.zeros(HEATMAP_CELLS, dtype=np.int64)
+        grid[keys[in_vendor] % HEATMAP_CELLS] = counts[in_vendor]
+        grids[int(vendor_id)] = grid
+    return grids
+
+
+class HeatmapService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.heatmap_repo = HeatmapRepository(db)
+        self.vendor_service = VendorService(db)
+
+    def refresh(self, rebuild: bool = False, chunk_size: int = None) -> dict:
+        """
+        Add payments made since the last run to the vendor heatmaps.
+        
+        - Payments are streamed through a server-side cursor in chunks and
+          binned with NumPy, so memory stays flat however many there are
+        - Only payments older than HEATMAP_SETTLE_SECONDS are counted, so
+          in-flight payments with lower IDs aren't skipped
+        - rebuild=True discards the heatmaps and recounts every payment
+        - Runs in one transaction; concurrent runs wait for each other
+        """
+        chunk_size = chunk_size or settings.HEATMAP_CHUNK_SIZE
+        self.heatmap_repo.lock()
+        if rebuild:
+            self.heatmap_repo.delete_all()
+            watermark = 0
+        else:
+            watermark = self.heatmap_repo.get_watermark()
+        settled_before = datetime.now(timezone.utc) - timedelta(seconds=settings.HEATMAP_SETTLE_SECONDS)
+        through_id = self.heatmap_repo.get_settled_payment_id(settled_before)
+
+        payments = 0
+        totals: Dict[int, np.ndarray] = {}
+        if through_id > watermark:
+            for rows in self.heatmap_repo.iter_payment_times(
+                watermark, through_id, settings.CAMPUS_TIMEZONE, chunk_size
+            ):
+                payments += len(rows)
+                for vendor_id, grid in bin_payment_times(rows).items():
+                    if vendor_id in totals:
+                        totals[vendor_id] += grid
+                    else:
+                        totals[vendor_id] = grid
+
+        existing = self.heatmap_repo.get_counts_for_update(list(totals))
+        merged = {
+            vendor_id: (grid + np.asarray(existing.get(vendor_id, 0), dtype=np.int64)).tolist()
+            for vendor_id, grid in totals.items()
+        }
+        self.heatmap_repo.save(merged, max(through_id, watermark))
+        self.db.commit()
+
+        for vendor_id in merged:
+            heatmap_cache.delete(vendor_id)
+        return {
+            "payments": payments,
+            "vendors": len(merged),
+            "through_payment_id": max(through_id, watermark),
+        }
+
+    def get_vendor_heatmap(self, vendor_id: int) -> dict:
+        """Get a vendor's day-of-week x hour payment counts (served from the heatmap cache)."""
+        cached = heatmap_cache.get(vendor_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        if not self.vendor_service.get_payment_vendor(vendor_id):
+            raise NotFoundError(f"Vendor with ID {vendor_id} not found")
+
+        row = self.heatmap_repo.get(vendor_id)
+        counts = np.asarray(row.counts if row else np.zeros(HEATMAP_CELLS), dtype=np.int64)
+        heatmap = {
+            "vendor_id": vendor_id,
+            "timezone": settings.CAMPUS_TIMEZONE,
+            "days": DAYS_OF_WEEK,
+            "counts": counts.reshape(7, 24).tolist(),
+            "total_payments": int(counts.sum()),
+            "through_payment_id": row.through_payment_id if row else 0,
+            "updated_at": row.updated_at if row else None,
+        }
+        heatmap_cache.set(vendor_id, (time.monotonic() + settings.HEATMAP_CACHE_TTL_SECONDS, heatmap))
+        return heatmap
@@ -0,0 +1,89 @@
+import hashlib
+import json
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.cache import LRUCache
+from app.config import settings
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.exceptions import ValidationError
+
+# Completed responses keyed by (user_id, scope, key); replays are served from
+# here without touching the database
+_response_cache = LRUCache(maxsize=settings.IDEMPOTENCY_CACHE_SIZE)
+
+
+class IdempotencyService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.idempotency_repo = IdempotencyRepository(db)
+        self._record = None
+
+    @staticmethod
+    def hash_request(payload: dict) -> str:
+        """Fingerprint a request body so a key can't be reused for a different request."""
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def run(
+        self,
+        user_id: int,
+        scope: str,
+        key: Optional[str],
+        payload: dict,
+        operation: Callable[[], dict],
+    ) -> dict:
+        """
+        Execute an operation at most once per Idempotency-Key.
+
+        - Without a key the operation simply runs
+        - With a key, the key's record is inserted (not committed) before the
+          operation runs; the operation calls stage_response() before its
+          commit, so the key, its response and the operation's writes commit
+          together, and a failed or interrupted operation leaves no key behind
+        - A replay returns the stored response without running the operation;
+          a replay while the first request is in flight waits on the key's
+          unique index and then returns the first request's response
+        """
+        if not key:
+            return operation()
+
+        request_hash = self.hash_request(payload)
+        cache_key = (user_id, scope, key)
+
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            cached_hash, response = cached
+            self._check_request_hash(cached_hash, request_hash)
+            return response
+
+        record, created = self.idempotency_repo.reserve(user_id, scope, key, request_hash)
+        if not created:
+            self._check_request_hash(record.request_hash, request_hash)
+            _response_cache.set(cache_key, (record.request_hash, record.response))
+            return record.response
+
+        self._record = record
+        try:
+            response = operation()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self._record = None
+
+        _response_cache.set(cache_key, (request_hash, response))
+        return response
+
+    def stage_response(self, response: dict) -> None:
+        """
+        Store the response for the key being run (committed by the
+        operation, with its own writes). No-op for requests without a key.
+        """
+        if self._record is not None:
+            self._record.response = response
+
+    @staticmethod
+    def _check_request_hash(stored_hash: str, request_hash: str) -> None:
+        """Reject reuse of a key with a different request body."""
+        if stored_hash != request_hash:
+            raise ValidationError("Idempotency-Key was already used with a different request")
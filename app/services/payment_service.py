@@ -1,21 +1,63 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.vendor_sales_repository import VendorSalesRepository
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.transaction_watermark_repository import TransactionWatermarkRepository
+from app.services.idempotency_service import IdempotencyService
+from app.services.vendor_service import VendorService
+from app.services.archive_service import ArchiveService
+from app.services.budget_alert_service import BudgetAlertService
+from app.budget_alerts import budget_alert_consumer
 from app.models.payment import PaymentStatus, PaymentType
-from app.models.transaction import TransactionCategory, PaymentMethod
+from app.models.transaction import TransactionCategory, PaymentMethod, TransactionSource
 from app.models.wallet import Wallet
 from app.schemas.payment import PaymentCreate
 from app.schemas.transaction import TransactionCreate
 from app.exceptions import NotFoundError, ValidationError
 
 
+# Vendor categories and non-enum payment_type strings -> PaymentType
+PAYMENT_TYPE_BY_NAME = {
+    "DINING": PaymentType.DINING,
+    "RETAIL": PaymentType.RETAIL,
+    "SERVICE": PaymentType.SERVICE,
+    "SERVICES": PaymentType.SERVICES,
+    "ENTERTAINMENT": PaymentType.ENTERTAINMENT,
+    "EVENT": PaymentType.EVENT,
+    "CLUB": PaymentType.CLUB,
+    "PRINTING": PaymentType.PRINTING,
+    "OTHER": PaymentType.OTHER,
+}
+
+# Transaction category recorded for each payment type
+TRANSACTION_CATEGORY_BY_PAYMENT_TYPE = {
+    PaymentType.DINING: TransactionCategory.DINING,
+    PaymentType.EVENT: TransactionCategory.ENTERTAINMENT,
+    PaymentType.CLUB: TransactionCategory.ENTERTAINMENT,
+    PaymentType.PRINTING: TransactionCategory.SERVICES,
+    PaymentType.SERVICE: TransactionCategory.SERVICES,
+    PaymentType.SERVICES: TransactionCategory.SERVICES,
+    PaymentType.RETAIL: TransactionCategory.OTHER,
+    PaymentType.ENTERTAINMENT: TransactionCategory.ENTERTAINMENT,
+    PaymentType.OTHER: TransactionCategory.OTHER,
+}
+
+
 class PaymentService:
     def __init__(self, db: Session):
         self.db = db
         self.payment_repo = PaymentRepository(db)
         self.transaction_repo = TransactionRepository(db)
+        self.vendor_sales_repo = VendorSalesRepository(db)
+        self.archive_repo = ArchiveRepository(db)
+        self.archive_service = ArchiveService(db)
+        self.idempotency = IdempotencyService(db)
+        self.vendor_service = VendorService(db)
+        self.budget_alerts = BudgetAlertService(db)
+        self.watermark_repo = TransactionWatermarkRepository(db)
 
     def get_payments(
         self,
@@ -25,24 +67,48 @@ class PaymentService:
         status: Optional[PaymentStatus] = None,
         payment_type: Optional[PaymentType] = None,
     ) -> List[dict]:
-        """Get all payments for a user."""
-        payments = self.payment_repo.get_all(
+        """Get all payments for a user, newest first.
+
+        Archived rows are always older than hot rows, so the archive is only
+        read when the hot table can't fill the page and payments were archived.
+        """
+        payments = self.payment_repo.get_all_rows(
             user_id=user_id,
             skip=skip,
             limit=limit,
             status=status,
             payment_type=payment_type,
         )
+        if len(payments) < limit and self.archive_service.may_contain("payments", None):
+            if payments:
+                hot_total = skip + len(payments)
+            else:
+                hot_total = self.payment_repo.count(
+                    user_id=user_id,
+                    status=status,
+                    payment_type=payment_type,
+                )
+            payments = list(payments) + list(self.archive_repo.get_payment_rows(
+                user_id=user_id,
+                skip=max(0, skip - hot_total),
+                limit=limit - len(payments),
+                status=status,
+                payment_type=payment_type,
+            ))
         return [self._payment_to_dict(p) for p in payments]
 
     def get_payment(self, payment_id: int, user_id: int) -> dict:
-        """Get a single payment by ID."""
+        """Get a single payment by ID, from the archive if it was moved there."""
         payment = self.payment_repo.get_by_id(payment_id, user_id)
+        if not payment and self.archive_service.may_contain("payments", None):
+            payment = self.archive_repo.get_payment_by_id(payment_id, user_id)
         if not payment:
             raise NotFoundError("Payment", str(payment_id))
         return self._payment_to_dict(payment)
 
-    def create_payment(self, user_id: int, payment_data: PaymentCreate) -> dict:
+    def create_payment(
+        self, user_id: int, payment_data: PaymentCreate, idempotency_key: Optional[str] = None
+    ) -> dict:
         """Create a new payment (simulation).
         
         Business Rules:
@@ -52,14 +118,43 @@ class PaymentService:
         - Creates a payment record
         - Immediately creates a transaction and logs it
         - Deducts the amount from user's wallet balance
+        - Adds the amount to the running spend of the user's matching active
+          budgets, writing an alert for each newly reached threshold
+        - Advances the user's transaction watermark, so cached analytics
+          are recomputed
+        - All of the above (and vendor sales counters) commit together
+        - A retry with the same idempotency key returns the original response
+        
+        With a vendor_id, the vendor must exist, be active and accept Raider
+        card payments; the transaction records the vendor's name, location
+        and category. Vendors are resolved from an in-memory cache.
         
         Automatically maps vendor category to valid PaymentType if needed.
         """
+        return self.idempotency.run(
+            user_id,
+            "payments.create",
+            idempotency_key,
+            payment_data.model_dump(mode="json"),
+            lambda: self._create_payment(user_id, payment_data),
+        )
+
+    def _create_payment(self, user_id: int, payment_data: PaymentCreate) -> dict:
+        """Run the payment: lock the wallet, record payment and transaction, deduct balance, in one commit."""
         # 1. Validate amount is positive
         if payment_data.amount <= 0:
             raise ValidationError("Payment amount must be greater than zero")
         
-        # 2. Check wallet exists and has sufficient balance
+        # 2. Resolve the vendor (cached) before taking the wallet lock
+        vendor = None
+        if payment_data.vendor_id is not None:
+            vendor = self.vendor_service.get_payment_vendor(payment_data.vendor_id)
+            if not vendor or not vendor["is_active"]:
+                raise ValidationError(f"Vendor {payment_data.vendor_id} not found or inactive")
+            if not vendor["accepts_raider_card"]:
+                raise ValidationError(f"{vendor['name']} does not accept Raider card payments")
+        
+        # 3. Check wallet exists and has sufficient balance
         wallet = self.db.query(Wallet).filter(Wallet.user_id == user_id).with_for_update().first()
         if not wallet:
             raise ValidationError("User wallet not found. Please initialize wallet first.")
@@ -70,65 +165,67 @@ class PaymentService:
                 f"Available: ${wallet.balance:.2f}"
             )
         
-        # 3. Normalize payment_type
+        # 4. Normalize payment_type
         try:
             if isinstance(payment_data.payment_type, PaymentType):
-                payment = self.payment_repo.create(user_id, payment_data)
+                payment = self.payment_repo.add(user_id, payment_data)
             else:
                 payment_type_str = str(payment_data.payment_type).upper()
-                category_to_payment_type = {
-                    "DINING": PaymentType.DINING,
-                    "RETAIL": PaymentType.RETAIL,
-                    "SERVICE": PaymentType.SERVICE,
-                    "SERVICES": PaymentType.SERVICES,
-                    "ENTERTAINMENT": PaymentType.ENTERTAINMENT,
-                    "EVENT": PaymentType.EVENT,
-                    "CLUB": PaymentType.CLUB,
-                    "PRINTING": PaymentType.PRINTING,
-                    "OTHER": PaymentType.OTHER,
-                }
-                
-                if payment_type_str in category_to_payment_type:
-                    payment_data.payment_type = category_to_payment_type[payment_type_str]
+                if payment_type_str in PAYMENT_TYPE_BY_NAME:
+                    payment_data.payment_type = PAYMENT_TYPE_BY_NAME[payment_type_str]
                 else:
                     payment_data.payment_type = PaymentType[payment_type_str]
                 
-                payment = self.payment_repo.create(user_id, payment_data)
+                payment = self.payment_repo.add(user_id, payment_data)
         except Exception as e:
             raise ValidationError(f"Invalid payment type: {payment_data.payment_type}")
         
-        # 4. Immediately create a transaction for the payment
-        category_map = {
-            PaymentType.DINING: TransactionCategory.DINING,
-            PaymentType.EVENT: TransactionCategory.ENTERTAINMENT,
-            PaymentType.CLUB: TransactionCategory.ENTERTAINMENT,
-            PaymentType.PRINTING: TransactionCategory.SERVICES,
-            PaymentType.SERVICE: TransactionCategory.SERVICES,
-            PaymentType.SERVICES: TransactionCategory.SERVICES,
-            PaymentType.RETAIL: TransactionCategory.OTHER,
-            PaymentType.ENTERTAINMENT: TransactionCategory.ENTERTAINMENT,
-            PaymentType.OTHER: TransactionCategory.OTHER,
-        }
+        # 5. Immediately create a transaction for the payment
+        if vendor:
+            # Record vendor payments under the vendor's own name and category
+            merchant = vendor["name"][:255]
+            location = vendor["location"]
+            category = TRANSACTION_CATEGORY_BY_PAYMENT_TYPE.get(
+                PAYMENT_TYPE_BY_NAME.get(vendor["category"].upper(), payment.payment_type),
+                TransactionCategory.OTHER
+            )
+        else:
+            merchant = payment.description[:255] if len(payment.description) <= 255 else payment.description[:252] + "..."
+            location = None
+            category = TRANSACTION_CATEGORY_BY_PAYMENT_TYPE.get(payment.payment_type, TransactionCategory.OTHER)
         
         transaction_data = TransactionCreate(
             amount=payment.amount,
-            category=category_map.get(payment.payment_type, TransactionCategory.OTHER),
-            merchant=payment.description[:255] if len(payment.description) <= 255 else payment.description[:252] + "...",
-            location=None,
+            category=category,
+            merchant=merchant,
+            location=location,
             payment_method=PaymentMethod.CAMPUS_CARD,
             date=datetime.utcnow(),
             description=f"Payment: {payment.description}"
         )
         
-        # 5. Create the transaction
-        self.transaction_repo.create(user_id, transaction_data)
+        # 6. Create the transaction, count it towards the user's budgets and
+        # advance their transaction watermark
+        self.transaction_repo.add(user_id, transaction_data, source=TransactionSource.PAYMENT)
+        alerts = self.budget_alerts.record_spend(
+            user_id, transaction_data.category, transaction_data.amount, transaction_data.date
+        )
+        self.watermark_repo.bump([user_id])
 
-        # 6. Deduct amount from user's wallet balance
-        # (wallet is already locked from step 2)
+        # 7. Count the sale towards the vendor's hourly/daily/weekly stats
+        if vendor:
+            self.vendor_sales_repo.increment(vendor["id"], payment.amount, datetime.now(timezone.utc))
+
+        # 8. Deduct amount from user's wallet balance
+        # (wallet is already locked from step 3)
         wallet.balance -= payment.amount
+        response = self._payment_to_dict(payment)
+        self.idempotency.stage_response(response)
         self.db.commit()
+        if alerts:
+            budget_alert_consumer.notify()
 
-        return self._payment_to_dict(payment)
+        return response
 
     def complete_payment(self, payment_id: int, user_id: int) -> dict:
         """Mark a payment as completed.
@@ -0,0 +1,188 @@
+import csv
+import itertools
+import json
+import os
+from datetime import date, datetime, timezone
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.transaction import TransactionCategory, TransactionSource
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.wallet_repository import WalletRepository
+from app.services.archive_service import ArchiveService
+from app.exceptions import ValidationError
+
+STATEMENT_FORMATS = ("json", "csv")
+
+# Ledger rows the server writes when money enters or leaves a wallet; the
+# source can't be set by users, so their own transactions never count
+WALLET_SOURCES = [TransactionSource.WALLET_LOAD, TransactionSource.DISBURSEMENT, TransactionSource.PAYMENT]
+CREDIT_SOURCES = (TransactionSource.WALLET_LOAD, TransactionSource.DISBURSEMENT)
+
+# One row per statement; payments get a column per category
+CSV_COLUMNS = (
+    ["user_id", "full_name", "email", "month", "opening_balance", "loads", "credits"]
+    + [f"payments_{category.value}" for category in TransactionCategory]
+    + ["payments_total", "closing_balance", "transaction_count"]
+)
+
+
+def month_bounds(month: date) -> Tuple[datetime, datetime]:
+    """Start of a calendar month and of the next one, in campus local time."""
+    tz = ZoneInfo(settings.CAMPUS_TIMEZONE)
+    start = datetime(month.year, month.month, 1, tzinfo=tz)
+    end = datetime(month.year + month.month // 12, month.month % 12 + 1, 1, tzinfo=tz)
+    return start, end
+
+
+def statement_path(output_dir: str, month: date, first_user_id: int, last_user_id: int, fmt: str) -> str:
+    """Artifact path for one user_id range, e.g. statements/2026-09/statements-0000002000-0000003999.jsonl."""
+    extension = "jsonl" if fmt == "json" else "csv"
+    return os.path.join(
+        output_dir, f"{month:%Y-%m}", f"statements-{first_user_id:010d}-{last_user_id:010d}.{extension}"
+    )
+
+
+class StatementService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.wallet_repo = WalletRepository(db)
+        self.transaction_repo = TransactionRepository(db)
+        self.archive_service = ArchiveService(db)
+
+    def validate_month(self, month: date) -> None:
+        """Statements need a month that has ended and whose transactions are still in the hot table."""
+        start, end = month_bounds(month)
+        if end > datetime.now(timezone.utc):
+            raise ValidationError(f"{month:%Y-%m} has not ended yet")
+        if self.archive_service.may_contain("transactions", start):
+            raise ValidationError(f"Transactions for {month:%Y-%m} have been archived")
+
+    def get_partitions(self, partition_size: int) -> List[Tuple[int, int]]:
+        """
+        Split the users with wallets into (first, last) user_id ranges.
+        Ranges are aligned to multiples of partition_size, so a re-run with the
+        same size produces the same ranges (and artifact names); ranges with
+        no wallets are left out.
+        """
+        return [
+            (bucket * partition_size, (bucket + 1) * partition_size - 1)
+            for bucket in self.wallet_repo.get_user_id_buckets(partition_size)
+        ]
+
+    def iter_statements(
+        self, month: date, first_user_id: int, last_user_id: int, chunk_size: int = None
+    ) -> Iterator[dict]:
+        """
+        Build the month's statement for every user with a wallet in a user_id range.
+
+        - Reads the wallets and streams every wallet transaction from the start
+          of the month onward with one query ordered by user and date
+        - Closing balance is the current balance less activity after the month;
+          opening balance is closing balance less activity in the month
+        - Both reads share one REPEATABLE READ snapshot, so a payment landing
+          mid-run can't make the balances and transactions disagree
+        """
+        chunk_size = chunk_size or settings.STATEMENT_CHUNK_SIZE
+        start, end = month_bounds(month)
+        self.db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        accounts = self.wallet_repo.get_accounts(first_user_id, last_user_id)
+        rows = itertools.chain.from_iterable(self.transaction_repo.iter_for_users(
+            first_user_id, last_user_id, start,
+            WALLET_SOURCES, chunk_size,
+        ))
+
+        # Merge the ordered accounts with the ordered per-user transaction groups
+        activity = itertools.groupby(rows, key=itemgetter(0))
+        group = next(activity, None)
+        for user_id, full_name, email, balance in accounts:
+            while group is not None and group[0] < user_id:
+                group = next(activity, None)
+            if group is not None and group[0] == user_id:
+                yield self._build_statement(month, end, user_id, full_name, email, balance, group[1])
+                group = next(activity, None)
+            else:
+                yield self._build_statement(month, end, user_id, full_name, email, balance, ())
+
+    def write_statements(
+        self, month: date, first_user_id: int, last_user_id: int, path: str, fmt: str = "json"
+    ) -> int:
+        """
+        Write the statements for a user_id range to path as compact JSON lines or CSV.
+
+        The file is written under a temporary name and renamed when complete,
+        so an existing artifact is always a finished one. Returns the number
+        of statements written.
+        """
+        if fmt not in STATEMENT_FORMATS:
+            raise ValidationError(f"Unknown statement format: {fmt}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        written = 0
+        try:
+            with open(tmp_path, "w", newline="", encoding="utf-8") as artifact:
+                writer = csv.writer(artifact) if fmt == "csv" else None
+                if writer:
+                    writer.writerow(CSV_COLUMNS)
+                for statement in self.iter_statements(month, first_user_id, last_user_id):
+                    if writer:
+                        writer.writerow(self._statement_to_row(statement))
+                    else:
+                        artifact.write(json.dumps(statement, separators=(",", ":")))
+                        artifact.write("\n")
+                    written += 1
+            os.replace(tmp_path, path)
+        finally:
+            # End the read snapshot
+            self.db.rollback()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return written
+
+    @staticmethod
+    def _build_statement(
+        month: date, end: datetime, user_id: int, full_name: str, email: str, balance: float, rows: Iterable
+    ) -> dict:
+        """Summarize one user's transactions (dated from the start of the month) into a statement."""
+        loads = credits = net_after_month = 0.0
+        payments = {}
+        transaction_count = 0
+        for _, transaction_date, amount, category, source in rows:
+            if transaction_date >= end:
+                net_after_month += amount if source in CREDIT_SOURCES else -amount
+                continue
+            transaction_count += 1
+            if source == TransactionSource.WALLET_LOAD:
+                loads += amount
+            elif source == TransactionSource.DISBURSEMENT:
+                credits += amount
+            else:
+                payments[category.value] = payments.get(category.value, 0.0) + amount
+
+        payments_total = sum(payments.values(), 0.0)
+        closing_balance = balance - net_after_month
+        opening_balance = closing_balance - loads - credits + payments_total
+        return {
+            "user_id": user_id,
+            "full_name": full_name,
+            "email": email,
+            "month": f"{month:%Y-%m}",
+            "opening_balance": round(opening_balance, 2),
+            "loads": round(loads, 2),
+            "credits": round(credits, 2),
+            "payments": {category: round(total, 2) for category, total in sorted(payments.items())},
+            "payments_total": round(payments_total, 2),
+            "closing_balance": round(closing_balance, 2),
+            "transaction_count": transaction_count,
+        }
+
+    @staticmethod
+    def _statement_to_row(statement: dict) -> list:
+        """Flatten a statement into a CSV row matching CSV_COLUMNS."""
+        return (
+            [statement[column] for column in CSV_COLUMNS[:7]]
+            + [statement["payments"].get(category.value, 0.0) for category in TransactionCategory]
+            + [statement["payments_total"], statement["closing_balance"], statement["transaction_count"]]
+        )
@@ -1,16 +1,37 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timedelta
-from app.repositories.transaction_repository import TransactionRepository
+from datetime import datetime, time, timedelta
+from app.repositories.transaction_repository import TransactionRepository, as_utc
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.transaction_watermark_repository import TransactionWatermarkRepository
+from app.services.archive_service import ArchiveService
+from app.services.budget_service import BudgetService
+from app.services.budget_alert_service import BudgetAlertService
+from app.budget_alerts import budget_alert_consumer
 from app.models.transaction import TransactionCategory
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
-from app.exceptions import NotFoundError
+from app.cache import CacheBackend, CacheStats, LRUCache
+from app.config import settings
+from app.exceptions import NotFoundError, ValidationError
+
+# Analytics bucket sizes and the most buckets one series may have
+ANALYTICS_GRANULARITIES = ("day", "week", "month")
+ANALYTICS_MAX_BUCKETS = settings.ANALYTICS_MAX_BUCKETS
+
+# Analytics responses by (user_id, start_date, end_date, granularity) in UTC, stored
+# with the transaction watermark and resolved range they were computed for
+analytics_cache: CacheBackend = LRUCache(maxsize=settings.ANALYTICS_CACHE_SIZE)
+analytics_cache_stats = CacheStats()
 
 
 class TransactionService:
     def __init__(self, db: Session):
         self.db = db
         self.transaction_repo = TransactionRepository(db)
+        self.archive_repo = ArchiveRepository(db)
+        self.archive_service = ArchiveService(db)
+        self.budget_alerts = BudgetAlertService(db)
+        self.watermark_repo = TransactionWatermarkRepository(db)
 
     def get_transactions(
         self,
@@ -21,8 +42,14 @@ class TransactionService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> List[dict]:
-        """Get all transactions for a user."""
-        transactions = self.transaction_repo.get_all(
+        """Get all transactions for a user.
+
+        Archived rows are always older than hot rows (transactions can't be
+        created or moved before the archive watermark), so the archive is only
+        read when the hot table can't fill the page and the date range
+        reaches back past the archive watermark.
+        """
+        transactions = self.transaction_repo.get_all_rows(
             user_id=user_id,
             skip=skip,
             limit=limit,
@@ -30,18 +57,48 @@ class TransactionService:
             start_date=start_date,
             end_date=end_date,
         )
+        if len(transactions) < limit and self.archive_service.may_contain("transactions", start_date):
+            if transactions:
+                hot_total = skip + len(transactions)
+            else:
+                hot_total = self.transaction_repo.count(
+                    user_id=user_id,
+                    category=category,
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+            transactions = list(transactions) + list(self.archive_repo.get_transaction_rows(
+                user_id=user_id,
+                skip=max(0, skip - hot_total),
+                limit=limit - len(transactions),
+                category=category,
+                start_date=start_date,
+                end_date=end_date,
+            ))
         return [self._transaction_to_dict(t) for t in transactions]
 
     def get_transaction(self, transaction_id: int, user_id: int) -> dict:
-        """Get a single transaction by ID."""
+        """Get a single transaction by ID, from the archive if it was moved there."""
         transaction = self.transaction_repo.get_by_id(transaction_id, user_id)
+        if not transaction and self.archive_service.may_contain("transactions", None):
+            transaction = self.archive_repo.get_transaction_by_id(transaction_id, user_id)
         if not transaction:
             raise NotFoundError("Transaction", str(transaction_id))
         return self._transaction_to_dict(transaction)
 
     def create_transaction(self, user_id: int, transaction_data: TransactionCreate) -> dict:
         """Create a new transaction."""
-        transaction = self.transaction_repo.create(user_id, transaction_data)
+        self._check_not_archived(transaction_data.date)
+        # The transaction, its budget spend and the watermark bump commit together
+        transaction = self.transaction_repo.add(user_id, transaction_data)
+        alerts = self.budget_alerts.record_spend(
+            user_id, transaction.category, transaction.amount, transaction.date
+        )
+        self.watermark_repo.bump([user_id])
+        self.db.commit()
+        self.db.refresh(transaction)
+        if alerts:
+            budget_alert_consumer.notify()
         return self._transaction_to_dict(transaction)
 
     def update_transaction(
@@ -51,8 +108,15 @@ class TransactionService:
         transaction = self.transaction_repo.get_by_id(transaction_id, user_id)
         if not transaction:
             raise NotFoundError("Transaction", str(transaction_id))
+        if transaction_data.date:
+            self._check_not_archived(transaction_data.date)
         
+        # The old amount/category/date may be counted anywhere, so recount;
+        # the change, the watermark bump and the recount commit together
         updated_transaction = self.transaction_repo.update(transaction, transaction_data)
+        self.watermark_repo.bump([user_id])
+        BudgetService(self.db).refresh_user_budgets(user_id)
+        self.db.refresh(updated_transaction)
         return self._transaction_to_dict(updated_transaction)
 
     def delete_transaction(self, transaction_id: int, user_id: int) -> None:
@@ -60,15 +124,57 @@ class TransactionService:
         transaction = self.transaction_repo.get_by_id(transaction_id, user_id)
         if not transaction:
             raise NotFoundError("Transaction", str(transaction_id))
+        # The deletion, the watermark bump and the recount commit together
         self.transaction_repo.delete(transaction)
+        self.watermark_repo.bump([user_id])
+        BudgetService(self.db).refresh_user_budgets(user_id)
 
     def get_analytics(
         self,
         user_id: int,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        granularity: str = "day",
     ) -> dict:
-        """Get spending analytics for a user."""
+        """
+        Get spending analytics for a user.
+
+        The spending-over-time series has one bucket per day, week or month
+        from start_date through end_date (the last 30 days through the end of
+        today, UTC, by default), zeros included, so clients can chart it as-is.
+
+        Responses are cached per user and range. A cached response is served
+        without aggregating while the user's transaction watermark is
+        unchanged, i.e. no transaction of theirs was written since.
+        """
+        if granularity not in ANALYTICS_GRANULARITIES:
+            raise ValidationError(f"Unknown granularity: {granularity}")
+
+        # Spending over time covers the last 30 days if no dates are provided;
+        # bounds are naive UTC, so dates with and without offsets compare
+        start_utc = as_utc(start_date) if start_date else None
+        end_utc = as_utc(end_date) if end_date else None
+        series_end = end_utc or datetime.combine(datetime.utcnow().date(), time.max)
+        series_start = start_utc or datetime.combine(series_end.date() - timedelta(days=30), time.min)
+        if series_start > series_end:
+            raise ValidationError("start_date must be before end_date")
+        buckets = self._bucket_count(series_start, series_end, granularity)
+        if buckets > ANALYTICS_MAX_BUCKETS:
+            raise ValidationError(
+                f"Range spans {buckets} {granularity} buckets (max {ANALYTICS_MAX_BUCKETS}); "
+                f"use a coarser granularity or a shorter range"
+            )
+
+        # Read the watermark before aggregating: a write landing in between
+        # leaves the entry under an older watermark, so it is recomputed next time
+        key = (user_id, start_utc, end_utc, granularity)
+        watermark = self.watermark_repo.get(user_id)
+        cached = analytics_cache.get(key)
+        if cached and cached[:3] == (watermark, series_start, series_end):
+            analytics_cache_stats.hit()
+            return cached[3]
+        analytics_cache_stats.miss()
+
         # Get total spending by category
         spending_by_category = self.transaction_repo.get_total_by_category(
             user_id=user_id,
@@ -76,32 +182,42 @@ class TransactionService:
             end_date=end_date,
         )
 
-        # Get spending over time (last 30 days if no dates provided)
-        if not start_date or not end_date:
-            if not end_date:
-                end_date = datetime.utcnow()
-            if not start_date:
-                start_date = end_date - timedelta(days=30)
-
         spending_over_time = self.transaction_repo.get_spending_over_time(
             user_id=user_id,
-            start_date=start_date,
-            end_date=end_date,
-            group_by="day"
+            start_date=series_start,
+            end_date=series_end,
+            granularity=granularity,
         )
 
         # Calculate total spending
         total_spending = sum(item["total"] for item in spending_by_category)
 
-        return {
+        analytics = {
             "total_spending": total_spending,
             "spending_by_category": spending_by_category,
             "spending_over_time": spending_over_time,
+            "granularity": granularity,
             "period": {
-                "start_date": start_date.isoformat() if start_date else None,
-                "end_date": end_date.isoformat() if end_date else None,
+                "start_date": series_start.isoformat(),
+                "end_date": series_end.isoformat(),
             }
         }
+        analytics_cache.set(key, (watermark, series_start, series_end, analytics))
+        return analytics
+
+    def _check_not_archived(self, transaction_date: datetime) -> None:
+        """Reject a date the archive covers, which would list out of order with archived rows."""
+        if self.archive_service.may_contain("transactions", transaction_date):
+            archived_before = self.archive_service.get_archived_before("transactions")
+            raise ValidationError(f"Transactions before {archived_before.isoformat()} are archived")
+
+    @staticmethod
+    def _bucket_count(start_date: datetime, end_date: datetime, granularity: str) -> int:
+        """Upper bound on the buckets a series from start_date through end_date has."""
+        if granularity == "month":
+            return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+        days = (end_date - start_date).days + 1
+        return days if granularity == "day" else days // 7 + 2
 
     @staticmethod
     def _transaction_to_dict(transaction) -> dict:
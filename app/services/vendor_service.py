@@ -1,14 +1,26 @@
+import time
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from app.cache import CacheBackend, LRUCache
+from app.config import settings
 from app.repositories.vendor_repository import VendorRepository
+from app.repositories.vendor_sales_repository import VendorSalesRepository, bucket_start
 from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse
 from app.exceptions import NotFoundError, ValidationError
 
 
+# vendor_id -> (expires_at, payment info dict) for existing vendors only, so a
+# newly created vendor is found at once in every process; vendor writes in
+# this process invalidate, the TTL bounds staleness in other processes
+vendor_cache: CacheBackend = LRUCache(maxsize=settings.VENDOR_CACHE_SIZE)
+
+
 class VendorService:
     def __init__(self, db: Session):
         self.db = db
         self.vendor_repo = VendorRepository(db)
+        self.vendor_sales_repo = VendorSalesRepository(db)
 
     def get_vendors(
         self,
@@ -18,10 +30,7 @@ class VendorService:
         category: str = None
     ) -> List[dict]:
         """Get all vendors with optional filtering."""
-        if category:
-            vendors = self.vendor_repo.get_by_category(category, skip, limit)
-        else:
-            vendors = self.vendor_repo.get_all(skip, limit, active_only)
+        vendors = self.vendor_repo.get_all_rows(skip, limit, active_only, category)
 
         return [VendorResponse.model_validate(vendor).model_dump() for vendor in vendors]
 
@@ -33,6 +42,60 @@ class VendorService:
 
         return VendorResponse.model_validate(vendor).model_dump()
 
+    def get_payment_vendor(self, vendor_id: int) -> Optional[dict]:
+        """
+        Get the vendor fields a payment needs (id, name, category, location,
+        accepts_raider_card, is_active) from the vendor cache, or None if the
+        vendor doesn't exist. Only queries the database on a cache miss;
+        missing vendors aren't cached, since they may be created any moment.
+        """
+        cached = vendor_cache.get(vendor_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        row = self.vendor_repo.get_payment_info(vendor_id)
+        if row is None:
+            return None
+        vendor = dict(row._mapping)
+        vendor_cache.set(vendor_id, (time.monotonic() + settings.VENDOR_CACHE_TTL_SECONDS, vendor))
+        return vendor
+
+    def get_vendor_stats(self, vendor_id: int, granularity: str, periods: int) -> dict:
+        """
+        Get revenue and payment counts for the last `periods` hours, days or weeks
+        (including the current one), read from the vendor's sales counters.
+        Costs one index range scan of at most `periods` rows, however many
+        payments the vendor has.
+        """
+        if not self.get_payment_vendor(vendor_id):
+            raise NotFoundError(f"Vendor with ID {vendor_id} not found")
+        
+        step = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[granularity]
+        current = bucket_start(datetime.now(timezone.utc), granularity)
+        since = current - step * (periods - 1)
+        counters = {
+            row.bucket_start: row
+            for row in self.vendor_sales_repo.get_buckets(vendor_id, granularity, since)
+        }
+        
+        buckets = []
+        for i in range(periods):
+            start = since + step * i
+            row = counters.get(start)
+            buckets.append({
+                "bucket_start": start,
+                "revenue": round(row.revenue, 2) if row else 0.0,
+                "payment_count": row.payment_count if row else 0,
+            })
+        
+        return {
+            "vendor_id": vendor_id,
+            "granularity": granularity,
+            "buckets": buckets,
+            "total_revenue": round(sum(b["revenue"] for b in buckets), 2),
+            "total_payments": sum(b["payment_count"] for b in buckets),
+        }
+
     def create_vendor(self, vendor_data: VendorCreate) -> dict:
         """Create a new vendor."""
         # Check if vendor with same name already exists
@@ -56,6 +119,7 @@ class VendorService:
                 raise ValidationError(f"Vendor with name '{vendor_data.name}' already exists")
 
         updated_vendor = self.vendor_repo.update(vendor, vendor_data)
+        vendor_cache.delete(vendor_id)
         return VendorResponse.model_validate(updated_vendor).model_dump()
 
     def delete_vendor(self, vendor_id: int) -> None:
@@ -65,3 +129,4 @@ class VendorService:
             raise NotFoundError(f"Vendor with ID {vendor_id} not found")
 
         self.vendor_repo.delete(vendor)
+        vendor_cache.delete(vendor_id)
@@ -1,72 +1,228 @@
+import csv
+import hashlib
+import math
 from sqlalchemy.orm import Session
+from typing import Optional, Iterator, List, Iterable, Tuple
 from datetime import datetime, timezone
+from app.config import settings
 from app.repositories.wallet_repository import WalletRepository
-from app.repositories.card_repository import CardRepository
-from app.repositories.transaction_repository import TransactionRepository
-from app.models.transaction import TransactionCategory, PaymentMethod
+from app.repositories.transaction_watermark_repository import TransactionWatermarkRepository
+from app.services.idempotency_service import IdempotencyService
+from app.services.budget_alert_service import BudgetAlertService
+from app.budget_alerts import budget_alert_consumer
+from app.models.transaction import TransactionCategory
 from app.schemas.wallet import WalletLoadRequest
-from app.schemas.transaction import TransactionCreate
 from app.exceptions import NotFoundError, ValidationError
 
+# Merchant names on the ledger transactions that credit a wallet
+LOAD_MERCHANT = "Flex Dollars Wallet"
+DISBURSEMENT_MERCHANT = "Flex Dollars Disbursement"
+
 
 class WalletService:
     def __init__(self, db: Session):
         self.db = db
         self.wallet_repo = WalletRepository(db)
-        self.card_repo = CardRepository(db)
-        self.transaction_repo = TransactionRepository(db)
+        self.idempotency = IdempotencyService(db)
+        self.budget_alerts = BudgetAlertService(db)
+        self.watermark_repo = TransactionWatermarkRepository(db)
 
     def get_wallet_balance(self, user_id: int) -> dict:
-        """Get current wallet balance for user. Creates wallet if it doesn't exist (lazy creation)."""
-        wallet = self.wallet_repo.get_by_user_id(user_id)
+        """Get current wallet balance for user.
         
-        # Lazy creation: create wallet if it doesn't exist
+        Wallets are created at registration, so this is a single read. Users
+        who predate that still get one created on first access.
+        """
+        wallet = self.wallet_repo.get_by_user_id(user_id)
         if not wallet:
-            wallet = self.wallet_repo.create(user_id)
+            wallet = self.wallet_repo.get_or_create(user_id)
+            self.db.commit()
         
         return self._wallet_to_dict(wallet)
 
-    def load_money(self, user_id: int, load_request: WalletLoadRequest) -> dict:
+    def iter_wallet_balances(self, user_ids: List[int]) -> Iterator[dict]:
+        """
+        Stream balances for many users from a single query (no wallets are created).
+        
+        Yields one dict per distinct user ID in ascending order as rows arrive;
+        users without a wallet get a balance of None.
+        """
+        for user_id, balance, updated_at in self.wallet_repo.iter_balances(sorted(set(user_ids))):
+            yield {
+                "user_id": user_id,
+                "balance": round(balance, 2) if balance is not None else None,
+                "updated_at": updated_at.isoformat() if updated_at is not None else None,
+            }
+
+    def get_float_snapshot(self) -> dict:
+        """Get the total balance held across all wallets, computed in the database."""
+        total_balance, wallet_count, as_of = self.wallet_repo.get_float_snapshot()
+        return {
+            "total_balance": round(total_balance, 2),
+            "wallet_count": wallet_count,
+            "as_of": as_of,
+        }
+
+    def load_money(
+        self, user_id: int, load_request: WalletLoadRequest, idempotency_key: Optional[str] = None
+    ) -> dict:
         """
         Load money into wallet from a card.
         
         - Validates card exists and belongs to user
         - Validates amount > 0
-        - Updates wallet balance atomically
-        - Creates a transaction record
+        - Updates wallet balance and creates a transaction record in one
+          statement and one commit (with the budget running spend it adds to)
+        - A retry with the same idempotency key returns the original response
         """
-        # Validate card exists and belongs to user
-        card = self.card_repo.get_by_id(load_request.card_id, user_id)
-        if not card:
-            raise NotFoundError("Card", str(load_request.card_id))
-        
+        return self.idempotency.run(
+            user_id,
+            "wallet.load",
+            idempotency_key,
+            load_request.model_dump(mode="json"),
+            lambda: self._load_money(user_id, load_request),
+        )
+
+    def _load_money(self, user_id: int, load_request: WalletLoadRequest) -> dict:
+        """Credit the wallet from a card and record the load transaction."""
         # Validate amount (already validated in schema, but double-check)
         if load_request.amount <= 0:
             raise ValidationError("Amount must be greater than 0")
         
-        # Get or create wallet
-        wallet = self.wallet_repo.get_by_user_id(user_id)
-        if not wallet:
-            wallet = self.wallet_repo.create(user_id)
+        load_date = datetime.now(timezone.utc)
         
-        # Update balance atomically
-        updated_wallet = self.wallet_repo.update_balance(wallet, load_request.amount)
+        # Card check, balance update and ledger insert in one statement
+        loaded = self.wallet_repo.load_from_card(
+            user_id, load_request.card_id, load_request.amount, load_date, LOAD_MERCHANT
+        )
+        if not loaded.card_found:
+            self.db.rollback()
+            raise NotFoundError("Card", str(load_request.card_id))
+        
+        if loaded.id is None:
+            # No wallet yet (user predates wallet-at-registration): create it and retry
+            self.wallet_repo.get_or_create(user_id)
+            loaded = self.wallet_repo.load_from_card(
+                user_id, load_request.card_id, load_request.amount, load_date, LOAD_MERCHANT
+            )
         
-        # Create transaction record for wallet load
-        transaction_data = TransactionCreate(
-            amount=load_request.amount,
-            category=TransactionCategory.SERVICES,
-            merchant="Flex Dollars Wallet",
-            location=None,
-            payment_method=PaymentMethod.CARD,
-            date=datetime.now(timezone.utc),
-            description=f"Loaded ${load_request.amount:.2f} from {card.card_type.value} card ending in {card.card_number}"
+        # Loads are recorded as services transactions and count towards budgets
+        alerts = self.budget_alerts.record_spend(
+            user_id, TransactionCategory.SERVICES, load_request.amount, load_date
         )
+        self.watermark_repo.bump([user_id])
+        response = self._wallet_to_dict(loaded)
+        self.idempotency.stage_response(response)
+        self.db.commit()
+        if alerts:
+            budget_alert_consumer.notify()
+        return response
+
+    @staticmethod
+    def parse_credits_csv(lines: Iterable[str]) -> Tuple[List[Tuple[int, int, float, str]], List[dict]]:
+        """
+        Parse a bulk credit CSV with a user_id,amount,memo header (memo optional).
         
-        # Create the transaction
-        self.transaction_repo.create(user_id, transaction_data)
+        Returns (credits, errors): credits are (line, user_id, amount, memo)
+        tuples for valid rows; errors describe each invalid row by line number.
+        """
+        reader = csv.DictReader(lines)
+        if not reader.fieldnames or not {"user_id", "amount"} <= set(reader.fieldnames):
+            raise ValidationError("CSV must have a header row with user_id and amount columns")
         
-        return self._wallet_to_dict(updated_wallet)
+        credits, errors = [], []
+        for row in reader:
+            line = reader.line_num
+            if len(credits) + len(errors) >= settings.BULK_CREDIT_MAX_ROWS:
+                raise ValidationError(f"CSV has more than {settings.BULK_CREDIT_MAX_ROWS} rows")
+            try:
+                user_id = int(row["user_id"])
+            except (TypeError, ValueError):
+                errors.append({"line": line, "user_id": None, "error": "Invalid user_id"})
+                continue
+            try:
+                amount = round(float(row["amount"]), 2)
+            except (TypeError, ValueError):
+                errors.append({"line": line, "user_id": user_id, "error": "Invalid amount"})
+                continue
+            if not math.isfinite(amount) or amount <= 0 or amount > 10000:
+                errors.append({"line": line, "user_id": user_id, "error": "Amount must be greater than 0 and not exceed $10,000"})
+                continue
+            memo = (row.get("memo") or "").strip() or "Flex Dollars disbursement"
+            if len(memo) > 255:
+                errors.append({"line": line, "user_id": user_id, "error": "Memo must be at most 255 characters"})
+                continue
+            credits.append((line, user_id, amount, memo))
+        return credits, errors
+
+    def bulk_credit(
+        self, credits: List[Tuple[int, int, float, str]], errors: Optional[List[dict]] = None
+    ) -> dict:
+        """
+        Credit many wallets at once (payroll, financial aid).
+        
+        - credits are (line, user_id, amount, memo) tuples, e.g. from parse_credits_csv
+        - Applied in chunks of BULK_CREDIT_CHUNK_SIZE set-based statements, each
+          updating balances and inserting one ledger transaction per row
+        - Rows for users without a wallet are skipped and reported
+        - Credited rows count towards budgets like any other services transaction
+        - Everything is committed together, so a failure credits nobody
+        """
+        errors = list(errors or [])
+        credit_date = datetime.now(timezone.utc)
+        
+        user_ids = {line: user_id for line, user_id, _, _ in credits}
+        skipped = set()
+        chunk_size = settings.BULK_CREDIT_CHUNK_SIZE
+        try:
+            for start in range(0, len(credits), chunk_size):
+                skipped.update(self.wallet_repo.bulk_credit(
+                    credits[start:start + chunk_size], credit_date, DISBURSEMENT_MERCHANT
+                ))
+            applied = [credit for credit in credits if credit[0] not in skipped]
+            alerts = self.budget_alerts.record_spends([
+                (user_id, TransactionCategory.SERVICES, amount, credit_date)
+                for _, user_id, amount, _ in applied
+            ])
+            self.watermark_repo.bump(user_id for _, user_id, _, _ in applied)
+            
+            for line in sorted(skipped):
+                errors.append({"line": line, "user_id": user_ids[line], "error": "User or wallet not found"})
+            errors.sort(key=lambda e: e["line"])
+            response = {
+                "credited_rows": len(applied),
+                "credited_users": len({credit[1] for credit in applied}),
+                "total_amount": round(sum(credit[2] for credit in applied), 2),
+                "failed_rows": len(errors),
+                "errors": errors,
+            }
+            self.idempotency.stage_response(response)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        if alerts:
+            budget_alert_consumer.notify()
+        return response
+
+    def bulk_credit_csv(self, admin_id: int, content: bytes, idempotency_key: Optional[str] = None) -> dict:
+        """
+        Parse an uploaded credit CSV and apply it with bulk_credit.
+        A retry with the same idempotency key and file returns the original result.
+        """
+        try:
+            lines = content.decode("utf-8-sig").splitlines()
+        except UnicodeDecodeError:
+            raise ValidationError("CSV must be UTF-8 encoded")
+        credits, errors = self.parse_credits_csv(lines)
+        return self.idempotency.run(
+            admin_id,
+            "wallet.bulk_credit",
+            idempotency_key,
+            {"csv_sha256": hashlib.sha256(content).hexdigest()},
+            lambda: self.bulk_credit(credits, errors),
+        )
 
     @staticmethod
     def _wallet_to_dict(wallet) -> dict:
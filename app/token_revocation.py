@@ -0,0 +1,78 @@
+import logging
+import threading
+from typing import Dict
+from app.config import settings
+from app.database import SessionLocal
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationCache:
+    """
+    Per-process map of user_id -> lowest token_version still accepted.
+
+    Tokens carry the user's token_version at issue time; bumping the version
+    in the database revokes every older token. The map only holds users who
+    ever revoked, and is refreshed from the database by a background thread,
+    so checking a token costs a dict lookup.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._min_versions: Dict[int, int] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> None:
+        """Reload token versions from the database."""
+        db = SessionLocal()
+        try:
+            rows = UserRepository(db).get_token_versions()
+        finally:
+            db.close()
+        min_versions = {user_id: token_version for user_id, token_version in rows}
+        with self._lock:
+            # Keep local revocations that may not be visible to this read yet
+            for user_id, token_version in self._min_versions.items():
+                if min_versions.get(user_id, 0) < token_version:
+                    min_versions[user_id] = token_version
+            self._min_versions = min_versions
+            self._loaded = True
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        """Check whether a token issued at token_version has been revoked."""
+        if not self._loaded:
+            self.refresh()
+        return token_version < self._min_versions.get(user_id, 0)
+
+    def revoke(self, user_id: int, token_version: int) -> None:
+        """Record a revocation made by this process without waiting for a refresh."""
+        with self._lock:
+            if self._min_versions.get(user_id, 0) < token_version:
+                self._min_versions[user_id] = token_version
+
+    def start(self) -> None:
+        """Start the background refresh thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="token-revocation-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except Exception:
+                logger.warning("Token revocation refresh failed", exc_info=True)
+
+
+revocations = TokenRevocationCache(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
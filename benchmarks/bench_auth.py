@@ -0,0 +1,76 @@
+"""
+Benchmark of per-request authorization overhead: database-backed
+get_current_user versus stateless get_current_principal.
+
+Needs a reachable database with at least one user.
+
+Usage: python benchmarks/bench_auth.py [--iterations 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from starlette.requests import Request
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.dependencies import get_current_user, get_current_principal
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.token_revocation import revocations
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+def bench(label: str, resolve, token: str, iterations: int) -> None:
+    """Time a dependency resolver and count the SQL statements it issues."""
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            db = SessionLocal()
+            try:
+                resolve(_request(), token, db)
+            finally:
+                db.close()
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    print(f"  {label:<28} {elapsed / iterations * 1e6:8.1f} us/request  "
+          f"{statements / iterations:.2f} SQL/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark auth overhead per request")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = db.query(User).first()
+    db.close()
+    if user is None:
+        print("[ERROR] No users found. Register a user first.")
+        sys.exit(1)
+
+    token = AuthService.create_access_token(AuthService.token_claims(user))
+    revocations.refresh()
+
+    print("=" * 60)
+    print(f"Auth overhead per request ({args.iterations} iterations)")
+    print("=" * 60)
+    bench("database (get_current_user)", get_current_user, token, args.iterations)
+    settings.AUTH_STATELESS = True
+    bench("stateless (principal)", get_current_principal, token, args.iterations)
+    print("=" * 60)
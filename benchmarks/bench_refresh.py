@@ -0,0 +1,65 @@
+"""
+Benchmark of the CPU cost of renewing an access token by logging in again
+(bcrypt verify) versus /auth/refresh (SHA-256 lookup hash and JWT signature),
+and the CPU saved per active user per day.
+
+Database round trips are excluded; both paths do one indexed lookup.
+
+Usage: python benchmarks/bench_refresh.py [--iterations 20] [--active-hours 8]
+"""
+import argparse
+import os
+import secrets
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services.auth_service import AuthService
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    """CPU seconds per call of fn."""
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark login vs refresh CPU cost")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--active-hours", type=float, default=8,
+                        help="Hours per day a user keeps the app signed in")
+    args = parser.parse_args()
+
+    password = "correct horse battery"
+    hashed_password = AuthService.get_password_hash(password)
+    claims = {"sub": "1", "role": "student", "tv": 0, "v": 1}
+
+    def login():
+        AuthService.verify_password(password, hashed_password)
+        AuthService.create_access_token(claims)
+
+    presented_token = secrets.token_urlsafe(32)
+
+    def refresh():
+        AuthService.hash_token(presented_token)
+        AuthService.hash_token(secrets.token_urlsafe(32))
+        AuthService.create_access_token(claims)
+
+    login_cpu = cpu_per_call(login, args.iterations)
+    refresh_cpu = cpu_per_call(refresh, args.iterations * 100)
+    renewals_per_day = args.active_hours * 60 / settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+    print("=" * 60)
+    print(f"Token renewal CPU cost (bcrypt cost {hashed_password.split('$')[2]})")
+    print("=" * 60)
+    print(f"  login (bcrypt verify + JWT)   {login_cpu * 1000:9.3f} ms CPU")
+    print(f"  refresh (SHA-256 + JWT)       {refresh_cpu * 1000:9.3f} ms CPU")
+    print(f"  renewals per active user/day  {renewals_per_day:9.1f} "
+          f"({args.active_hours:g}h, {settings.ACCESS_TOKEN_EXPIRE_MINUTES} min tokens)")
+    print(f"  CPU saved per user per day    "
+          f"{(login_cpu - refresh_cpu) * renewals_per_day * 1000:9.1f} ms")
+    print("=" * 60)
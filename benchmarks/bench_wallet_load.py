@@ -0,0 +1,97 @@
+"""
+Benchmark of wallet loads per second: the previous multi-commit path
+(fetch card, fetch wallet, commit balance, commit transaction) versus the
+fused single-statement WalletService load.
+
+Writes real loads of --amount to the owner of the first card in the
+database, so run it against a development database.
+
+Usage: python benchmarks/bench_wallet_load.py [--iterations 500] [--amount 0.01]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app.models.card import Card
+from app.models.transaction import TransactionCategory, PaymentMethod
+from app.repositories.card_repository import CardRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.wallet_repository import WalletRepository
+from app.schemas.transaction import TransactionCreate
+from app.schemas.wallet import WalletLoadRequest
+from app.services.wallet_service import WalletService
+
+
+def multi_commit_load(db, user_id: int, load_request: WalletLoadRequest) -> None:
+    """The load path before it was fused into one statement."""
+    card = CardRepository(db).get_by_id(load_request.card_id, user_id)
+    wallet_repo = WalletRepository(db)
+    wallet = wallet_repo.get_or_create(user_id)
+    wallet_repo.update_balance(wallet, load_request.amount)
+    TransactionRepository(db).create(user_id, TransactionCreate(
+        amount=load_request.amount,
+        category=TransactionCategory.SERVICES,
+        merchant="Flex Dollars Wallet",
+        location=None,
+        payment_method=PaymentMethod.CARD,
+        date=datetime.now(timezone.utc),
+        description=f"Loaded ${load_request.amount:.2f} from {card.card_type.value} card ending in {card.card_number}"
+    ))
+
+
+def fused_load(db, user_id: int, load_request: WalletLoadRequest) -> None:
+    WalletService(db).load_money(user_id, load_request)
+
+
+def bench(label: str, load, user_id: int, load_request: WalletLoadRequest, iterations: int) -> None:
+    """Time sequential loads and count the SQL statements each issues."""
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            db = SessionLocal()
+            try:
+                load(db, user_id, load_request)
+            finally:
+                db.close()
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    print(f"  {label:<28} {iterations / elapsed:8.1f} loads/sec  "
+          f"{statements / iterations:.2f} SQL/load")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark wallet loads per second")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--amount", type=float, default=0.01)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    card = db.query(Card).first()
+    db.close()
+    if card is None:
+        print("[ERROR] No cards found. Add a card first.")
+        sys.exit(1)
+
+    load_request = WalletLoadRequest(amount=args.amount, card_id=card.id)
+
+    print("=" * 60)
+    print(f"Wallet loads ({args.iterations} sequential loads, user {card.user_id})")
+    print("=" * 60)
+    bench("multi-commit (before)", multi_commit_load, card.user_id, load_request, args.iterations)
+    bench("fused statement (after)", fused_load, card.user_id, load_request, args.iterations)
+    print("=" * 60)
@@ -0,0 +1,50 @@
+"""
+Heatmap job that counts vendor payments per day of week and hour (campus local
+time) for GET /vendors/{id}/heatmap. Each run only adds payments made since the
+previous run; payments are streamed in chunks and binned with NumPy. Schedule it
+(e.g. every 15 minutes with cron) to keep heatmaps current.
+
+Usage: python build_heatmaps.py [--rebuild] [--chunk-size 50000]
+"""
+import argparse
+import time
+from app.config import settings
+from app.database import SessionLocal
+from app.services.heatmap_service import HeatmapService
+
+
+def build_heatmaps(rebuild: bool, chunk_size: int):
+    """Refresh vendor heatmaps with new payments."""
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        result = HeatmapService(db).refresh(rebuild=rebuild, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - started
+        print(f"Counted {result['payments']} payments for {result['vendors']} vendors "
+              f"in {elapsed:.2f}s ({result['payments'] / max(elapsed, 1e-9):.0f} payments/sec)")
+        print(f"Heatmaps include payments through ID {result['through_payment_id']}")
+        print("[SUCCESS] Heatmaps refreshed")
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] Error building heatmaps: {e}")
+        print("Nothing was written; re-run to retry.")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build vendor peak-hour heatmaps")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Discard existing heatmaps and recount all payments, including archived ones")
+    parser.add_argument("--chunk-size", type=int, default=settings.HEATMAP_CHUNK_SIZE,
+                        help="Payments fetched per chunk from the server-side cursor")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Building Vendor Heatmaps")
+    print("=" * 60)
+    build_heatmaps(args.rebuild, args.chunk_size)
+    print("=" * 60)
@@ -0,0 +1,64 @@
+"""
+Bulk credit script for payroll and financial aid disbursements.
+Reads a CSV with a user_id,amount,memo header (memo optional) and credits every
+row to the user's wallet, recording one transaction per row. Rows are applied in
+chunked set-based statements and committed together; invalid rows and users
+without a wallet are reported by line number and skipped.
+
+Usage: python bulk_credit.py credits.csv [--dry-run]
+"""
+import argparse
+import time
+from app.database import SessionLocal
+from app.services.wallet_service import WalletService
+
+
+def bulk_credit(path: str, dry_run: bool = False):
+    """Credit wallets from a CSV file."""
+    db = SessionLocal()
+
+    try:
+        service = WalletService(db)
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            credits, errors = service.parse_credits_csv(f)
+        print(f"Parsed {len(credits)} valid rows, {len(errors)} invalid rows")
+
+        if dry_run:
+            result = {"credited_rows": 0, "credited_users": 0, "total_amount": 0.0,
+                      "failed_rows": len(errors), "errors": errors}
+        else:
+            started = time.perf_counter()
+            result = service.bulk_credit(credits, errors)
+            elapsed = time.perf_counter() - started
+            print(f"Applied in {elapsed:.2f}s ({result['credited_rows'] / max(elapsed, 1e-9):.0f} credits/sec)")
+
+        for error in result["errors"]:
+            print(f"  line {error['line']}: user {error['user_id']}: {error['error']}")
+        print(f"Credited {result['credited_rows']} rows to {result['credited_users']} users, "
+              f"total ${result['total_amount']:.2f}")
+        if result["failed_rows"]:
+            print(f"[ERROR] {result['failed_rows']} rows were not credited (see above)")
+        else:
+            print("[SUCCESS] All rows credited" if not dry_run else "[SUCCESS] All rows valid")
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] Error applying credits: {e}")
+        print("No credits were applied.")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Credit wallets in bulk from a CSV file")
+    parser.add_argument("path", help="CSV file with user_id,amount,memo columns")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only validate the file; don't credit anything")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Bulk Wallet Credit")
+    print("=" * 60)
+    bulk_credit(args.path, args.dry_run)
+    print("=" * 60)
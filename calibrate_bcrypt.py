@@ -0,0 +1,42 @@
+"""
+Calibration script that picks the bcrypt work factor for this machine.
+Times a password verify at increasing costs and recommends the highest cost
+whose verify time stays within the target. Existing hashes are moved to the
+new cost transparently on each user's next login.
+
+Usage: python calibrate_bcrypt.py [--target-ms 250]
+"""
+import argparse
+from app.config import settings
+from app.services.auth_service import AuthService
+
+
+def calibrate_bcrypt(target_ms: float):
+    """Print verify timings per cost and the recommended BCRYPT_ROUNDS."""
+    timings = AuthService.calibrate_bcrypt_rounds(target_ms)
+
+    print(f"Target verify time: {target_ms:.0f} ms (current BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS})\n")
+    for rounds, elapsed_ms in timings:
+        marker = "" if elapsed_ms <= target_ms else "  (over target)"
+        print(f"  cost {rounds:2d}: {elapsed_ms:8.1f} ms{marker}")
+
+    within_target = [rounds for rounds, elapsed_ms in timings if elapsed_ms <= target_ms]
+    if not within_target:
+        print(f"\n[WARNING] Even cost {timings[0][0]} exceeds the target; using it anyway.")
+        recommended = timings[0][0]
+    else:
+        recommended = within_target[-1]
+    print(f"\n[SUCCESS] Recommended setting: BCRYPT_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick the bcrypt cost for a target verify time")
+    parser.add_argument("--target-ms", type=float, default=250,
+                        help="Maximum acceptable password verify time in milliseconds")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Calibrating bcrypt Work Factor")
+    print("=" * 60)
+    calibrate_bcrypt(args.target_ms)
+    print("=" * 60)
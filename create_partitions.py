@@ -0,0 +1,40 @@
+"""
+Partition job that creates the monthly transactions partitions from this
+month through TRANSACTION_PARTITION_MONTHS_AHEAD months ahead (plus the
+default partition). Requests never create partitions, since attaching one
+locks the whole transactions table; schedule this daily (e.g. with cron)
+so upcoming months exist before their first transaction.
+
+Usage: python create_partitions.py [--months-ahead 3]
+"""
+import argparse
+import time
+from app.config import settings
+from app.database import engine
+from app.partitions import ensure_transactions_partitions
+
+
+def create_partitions(months_ahead: int) -> bool:
+    """Create upcoming transactions partitions; returns whether all were created."""
+    started = time.perf_counter()
+    failed = ensure_transactions_partitions(engine, months_ahead)
+    elapsed = time.perf_counter() - started
+    if failed:
+        print(f"[ERROR] {failed} of {months_ahead + 1} monthly partitions couldn't be created "
+              f"in {elapsed:.2f}s (see the log); re-run to retry")
+        return False
+    print(f"[SUCCESS] Partitions exist for this month and {months_ahead} months ahead ({elapsed:.2f}s)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming monthly transactions partitions")
+    parser.add_argument("--months-ahead", type=int, default=settings.TRANSACTION_PARTITION_MONTHS_AHEAD,
+                        help="Months after the current one to create partitions for")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Creating Transactions Partitions")
+    print("=" * 60)
+    create_partitions(args.months_ahead)
+    print("=" * 60)
@@ -0,0 +1,113 @@
+"""
+Statement job that writes month-end wallet statements (opening balance, loads,
+credits, payments by category, closing balance) for every user with a wallet.
+Users are split into fixed user_id ranges handled by a pool of worker processes;
+each range streams its transactions with one ordered query and is written to its
+own file under <output-dir>/YYYY-MM/. Ranges whose file already exists are
+skipped, so an interrupted run can simply be started again.
+
+Usage: python generate_statements.py [--month 2026-09] [--format json|csv] [--workers 4]
+                                     [--partition-size 2000] [--output-dir statements] [--force]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.services.statement_service import StatementService, STATEMENT_FORMATS, statement_path
+
+
+def _init_worker():
+    """Drop connections inherited from the parent process; each worker opens its own."""
+    engine.dispose(close=False)
+
+
+def _write_partition(month: date, first_user_id: int, last_user_id: int, path: str, fmt: str) -> int:
+    """Write one user_id range's statements (runs in a worker process)."""
+    db = SessionLocal()
+    try:
+        return StatementService(db).write_statements(month, first_user_id, last_user_id, path, fmt)
+    finally:
+        db.close()
+
+
+def generate_statements(month: date, fmt: str, workers: int, partition_size: int, output_dir: str, force: bool):
+    """Write statements for `month`, skipping user_id ranges that are already written."""
+    db = SessionLocal()
+    try:
+        service = StatementService(db)
+        service.validate_month(month)
+        partitions = service.get_partitions(partition_size)
+    except Exception as e:
+        print(f"[ERROR] Error planning statements: {e}")
+        return
+    finally:
+        db.close()
+
+    pending = []
+    for first_user_id, last_user_id in partitions:
+        path = statement_path(output_dir, month, first_user_id, last_user_id, fmt)
+        if force or not os.path.exists(path):
+            pending.append((first_user_id, last_user_id, path))
+    print(f"Statements for {month:%Y-%m}: {len(partitions)} ranges of {partition_size} user IDs, "
+          f"{len(partitions) - len(pending)} already written")
+
+    started = time.perf_counter()
+    users = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_write_partition, month, first_user_id, last_user_id, path, fmt): (first_user_id, last_user_id)
+            for first_user_id, last_user_id, path in pending
+        }
+        for future in as_completed(futures):
+            first_user_id, last_user_id = futures[future]
+            try:
+                users += future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  [ERROR] Users {first_user_id}-{last_user_id}: {e}")
+    elapsed = time.perf_counter() - started
+
+    print(f"Wrote {users} statements in {len(pending) - failed} files in {elapsed:.1f}s "
+          f"({users / max(elapsed, 1e-9):.0f} users/sec)")
+    if failed:
+        print(f"[ERROR] {failed} ranges failed; re-run to resume.")
+    else:
+        print(f"[SUCCESS] Statements written to {os.path.join(output_dir, f'{month:%Y-%m}')}")
+
+
+def _parse_month(value: str) -> date:
+    """Parse YYYY-MM into the first day of that month."""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid month {value!r}; expected YYYY-MM")
+
+
+if __name__ == "__main__":
+    last_month = (datetime.now(ZoneInfo(settings.CAMPUS_TIMEZONE)).date().replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    parser = argparse.ArgumentParser(description="Generate month-end wallet statements")
+    parser.add_argument("--month", type=_parse_month, default=last_month,
+                        help="Statement month as YYYY-MM (default: last month)")
+    parser.add_argument("--format", choices=STATEMENT_FORMATS, default="json",
+                        help="Write compact JSON lines or CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--partition-size", type=int, default=settings.STATEMENT_PARTITION_SIZE,
+                        help="User IDs per range and output file (keep it unchanged when resuming)")
+    parser.add_argument("--output-dir", default=settings.STATEMENT_OUTPUT_DIR,
+                        help="Directory the YYYY-MM statement folders are written to")
+    parser.add_argument("--force", action="store_true",
+                        help="Rewrite ranges that were already written")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Generating Monthly Statements")
+    print("=" * 60)
+    generate_statements(args.month, args.format, args.workers, args.partition_size, args.output_dir, args.force)
+    print("=" * 60)
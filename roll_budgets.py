@@ -0,0 +1,48 @@
+"""
+Rollover job that starts the next period of every recurring budget. Budgets
+ending on or before the given date (default today) get their next weekly or
+monthly period created in one set-based INSERT ... SELECT per pass; budgets
+that missed several periods catch up one period per pass. Schedule it daily
+(e.g. just before midnight with cron) so next periods exist when they start.
+
+Usage: python roll_budgets.py [--date 2026-10-31]
+"""
+import argparse
+import time
+from datetime import date
+from app.database import SessionLocal
+from app.services.budget_service import BudgetService
+
+
+def roll_budgets(as_of: date):
+    """Create the next period of recurring budgets ending on or before as_of."""
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        result = BudgetService(db).roll_over_budgets(as_of)
+        elapsed = time.perf_counter() - started
+        print(f"Created {result['created']} budget periods for {result['users']} users "
+              f"in {result['passes']} passes ({elapsed:.2f}s)")
+        print("[SUCCESS] Budgets rolled over through " + result["as_of"])
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] Error rolling over budgets: {e}")
+        print("Completed passes were committed; re-run to resume.")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start the next period of recurring budgets")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(),
+                        help="Roll over budgets ending on or before this date (YYYY-MM-DD, default today)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Rolling Over Recurring Budgets")
+    print("=" * 60)
+    roll_budgets(args.date)
+    print("=" * 60)